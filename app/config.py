@@ -0,0 +1,70 @@
+# app/config.py
+# 환경변수 기반 설정 (Render 대시보드 / 로컬 .env 등에서 주입)
+import os
+from dataclasses import dataclass
+
+def _bool(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return v.strip().lower() not in ("0", "false", "no", "off", "")
+
+def _int(name: str, default: int) -> int:
+    # PRAGMA 문에 그대로 들어가는 값: 정수가 아니면 기동 시 바로 실패
+    v = os.getenv(name)
+    try:
+        return default if v is None else int(v.strip())
+    except ValueError:
+        raise ValueError(f"{name} 는 정수여야 합니다: {v!r}") from None
+
+SQLITE_SYNCHRONOUS = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+@dataclass(frozen=True)
+class Settings:
+    database_url: str = os.getenv("DATABASE_URL", "sqlite:///./data.db")
+    db_async: bool = _bool("DB_ASYNC", True)
+    # 통계/리포트 전용 읽기 엔진 (미지정 시 DATABASE_URL 을 읽기 전용으로 연다)
+    read_database_url: str = os.getenv("READ_DATABASE_URL", "")
+    read_pool_size: int = int(os.getenv("READ_POOL_SIZE", "8"))
+
+    # SQLite 동시성 프로파일
+    sqlite_wal: bool = _bool("SQLITE_WAL", True)
+    sqlite_busy_timeout_ms: int = _int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").strip().upper()  # SQLITE_SYNCHRONOUS 중 하나
+    sqlite_mmap_size: int = _int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)
+    sqlite_cache_size: int = _int("SQLITE_CACHE_SIZE", -20000)  # 음수 = KiB 단위
+    sqlite_foreign_keys: bool = _bool("SQLITE_FOREIGN_KEYS", True)
+
+    # 단일 쓰기 레인: 대기 한도(초) 초과 시 503
+    write_lane_timeout: float = float(os.getenv("WRITE_LANE_TIMEOUT", "10"))
+
+    stats_cache_size: int = int(os.getenv("STATS_CACHE_SIZE", "128"))
+    meta_check_interval: float = float(os.getenv("META_CHECK_INTERVAL", "30"))
+
+    # 실시간 일정 스트림(SSE): 구독자별 대기 이벤트 한도(초과 시 연결 끊음), 하트비트 주기(초)
+    sse_queue_size: int = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+    sse_heartbeat: float = float(os.getenv("SSE_HEARTBEAT", "15"))
+
+    # 요청 계측: 쿼리 수 또는 처리 시간(ms)이 기준 이상이면 경고 로그 (/metrics 와 별도)
+    slow_request_queries: int = int(os.getenv("SLOW_REQUEST_QUERIES", "100"))
+    slow_request_ms: float = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+
+    # 쿼리 예산 / N+1 감지 (개발·테스트): off | warn | raise
+    # 기본 예산은 @query_budget 선언이 없는 라우트에 적용. repeats = 같은 모양 쿼리의 서로 다른 파라미터 수 한도
+    query_guard: str = os.getenv("QUERY_GUARD", "off").strip().lower()
+    query_budget_default: int = int(os.getenv("QUERY_BUDGET_DEFAULT", "30"))
+    query_budget_repeats: int = int(os.getenv("QUERY_BUDGET_REPEATS", "5"))
+
+    def __post_init__(self):
+        # 변경 로그 트리거, ON CONFLICT 업서트, strftime 버킷 등 SQL 이 SQLite 전용
+        for name in ("database_url", "read_database_url"):
+            url = getattr(self, name)
+            if url and not url.startswith("sqlite"):
+                raise ValueError(f"{name.upper()} 는 SQLite URL(sqlite:///...)이어야 합니다: {url.split('://')[0]}://... "
+                                 "(트리거·업서트·집계 SQL 이 SQLite 전용)")
+        # PRAGMA 문에 문자열로 들어가므로 허용 값만
+        if self.sqlite_synchronous not in SQLITE_SYNCHRONOUS:
+            raise ValueError(f"SQLITE_SYNCHRONOUS 는 {'/'.join(SQLITE_SYNCHRONOUS)} 중 하나여야 합니다: "
+                             f"{self.sqlite_synchronous!r}")
+
+settings = Settings()
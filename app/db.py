@@ -1,14 +1,175 @@
-from sqlalchemy import create_engine
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Callable
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.services.metrics import instrument_engine
+
+# SQLite 바인드 변수 한도(999) 안에서 IN 목록·일괄 실행을 나눠 보낸다
+BIND_CHUNK = 500
+
+def chunked(seq, size: int = BIND_CHUNK):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+SQLALCHEMY_DATABASE_URL = settings.database_url   # SQLite 전용 (config.Settings 에서 검사)
+
+def _readonly_url(url: str) -> str:
+    # sqlite:///./data.db → sqlite:///file:./data.db?mode=ro&uri=true
+    prefix = "sqlite:///"
+    if not url.startswith(prefix) or ":memory:" in url or "mode=ro" in url:
+        return url
+    return f"{prefix}file:{url[len(prefix):]}?mode=ro&uri=true"
+
+READ_DATABASE_URL = settings.read_database_url or _readonly_url(SQLALCHEMY_DATABASE_URL)
+
+def _sqlite_pragmas(engine: Engine, *, read_only: bool = False):
+    # 연결마다 적용: WAL(읽기/쓰기 비차단), busy_timeout(잠금 대기), FK 강제 등
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        if read_only:
+            cur.execute("PRAGMA query_only=ON")
+        elif settings.sqlite_wal and ":memory:" not in SQLALCHEMY_DATABASE_URL:
+            cur.execute("PRAGMA journal_mode=WAL")
+        # 값은 Settings 에서 검증됨 (정수 / SQLITE_SYNCHRONOUS)
+        cur.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cur.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cur.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+        cur.execute(f"PRAGMA cache_size={settings.sqlite_cache_size}")
+        cur.execute(f"PRAGMA foreign_keys={'ON' if settings.sqlite_foreign_keys else 'OFF'}")
+        cur.close()
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./data.db"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# 비동기 핸들러용 DB 경로 (DB_ASYNC=0 이면 동기 세션을 스레드풀에서 실행)
+DB_ASYNC = settings.db_async
+ASYNC_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+async_engine = create_async_engine(ASYNC_DATABASE_URL) if DB_ASYNC else None
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False) if DB_ASYNC else None
+
+# 읽기 전용 엔진: 장시간 범위 스캔(통계/불일치/내보내기)이 쓰기 경로의 연결·잠금을 점유하지 않도록 분리
+_read_kwargs = {} if ":memory:" in READ_DATABASE_URL else {"pool_size": settings.read_pool_size}
+read_engine = create_engine(READ_DATABASE_URL, connect_args={"check_same_thread": False}, **_read_kwargs)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+ASYNC_READ_DATABASE_URL = READ_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+async_read_engine = create_async_engine(ASYNC_READ_DATABASE_URL, **_read_kwargs) if DB_ASYNC else None
+AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False) if DB_ASYNC else None
+
+_sqlite_pragmas(engine)
+_sqlite_pragmas(read_engine, read_only=True)
+if async_engine is not None:
+    _sqlite_pragmas(async_engine.sync_engine)
+    _sqlite_pragmas(async_read_engine.sync_engine, read_only=True)
+
+# 쿼리 수·시간 계측 (요청별 비용 + /metrics)
+instrument_engine(engine, "write")
+instrument_engine(read_engine, "read")
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine, "write_async")
+    instrument_engine(async_read_engine.sync_engine, "read_async")
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+class WriteLane:
+    """프로세스 내 단일 쓰기 레인.
+
+    SQLite 는 동시에 한 명만 쓸 수 있으므로, 쓰기 트랜잭션을 여기서 줄 세워
+    'database is locked' 대신 잠깐 대기하게 한다. (다른 프로세스와는 busy_timeout 으로 조정)
+    """
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.waiting = 0
+        self._lock = None
+        self._loop = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        return self._lock
+
+    @asynccontextmanager
+    async def slot(self):
+        lock = self._get_lock()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(lock.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(503, "저장 요청이 많아 잠시 후 다시 시도해 주세요.")
+        finally:
+            self.waiting -= 1
+        try:
+            yield
+        finally:
+            lock.release()
+
+write_lane = WriteLane(settings.write_lane_timeout)
+
+class DB:
+    """async 핸들러에서 쓰는 DB 핸들.
+
+    쿼리 로직은 동기 ORM 함수(fn(session, ...))로 두고, 비동기 모드에서는
+    AsyncSession.run_sync 로(aiosqlite, 이벤트 루프에서 대기), 동기 모드에서는
+    스레드풀에서 실행한다. 쓰기는 write() 로 단일 쓰기 레인을 거친다.
+    """
+    def __init__(self, session):
+        self.session = session
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+    async def write(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        async with write_lane.slot():
+            return await self.run(fn, *args, **kwargs)
+
+async def get_async_db():
+    if DB_ASYNC:
+        async with AsyncSessionLocal() as session:
+            yield DB(session)
+    else:
+        session = SessionLocal()
+        try:
+            yield DB(session)
+        finally:
+            await run_in_threadpool(session.close)
+
+async def get_threaded_db():
+    """CPU 비중이 큰 쓰기(대량 적재)용: 비동기 모드에서도 동기 세션을 스레드풀에서 실행해 이벤트 루프를 비운다."""
+    session = SessionLocal()
+    try:
+        yield DB(session)
+    finally:
+        await run_in_threadpool(session.close)
+
+async def get_async_read_db():
+    if DB_ASYNC:
+        async with AsyncReadSessionLocal() as session:
+            yield DB(session)
+    else:
+        session = ReadSessionLocal()
+        try:
+            yield DB(session)
+        finally:
+            await run_in_threadpool(session.close)
@@ -1,14 +1,37 @@
 # app/main.py
+from app.services.startup import boot, FirstResponseTimer, warm_up  # 기동 계측 시작점 (가장 먼저)
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from pathlib import Path
 
-from app.db import Base, engine, SessionLocal
+from app.db import engine, SessionLocal, DB_ASYNC
+from app.migrations import ensure_schema, schema_fingerprint
 from app.models import Subject, Counselor, Branch, Team
-from app.routers import views, subjects, counselors, sessions, daily_db, daily_db_team, meta, stats
+from app.services import metrics
+from app.routers import views, subjects, counselors, sessions, daily_db, daily_db_team, meta, stats, export, availability, calendar, events
 
-app = FastAPI(title="상담 스케줄러")
+log = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    on_startup()
+    # 기동이 끝나야 서빙이 시작되므로, 워밍업은 백그라운드로 넘긴다
+    async def run():
+        await asyncio.sleep(0)
+        await run_in_threadpool(warm_up)
+    app.state.warm_up = asyncio.get_running_loop().create_task(run())
+    yield
+
+app = FastAPI(title="상담 스케줄러", lifespan=lifespan)
+app.add_middleware(metrics.RequestMetrics)
+app.add_middleware(FirstResponseTimer)
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 STATIC_DIR = BASE_DIR / "app" / "static"
@@ -23,44 +46,50 @@ app.include_router(daily_db.router, prefix="/api/daily-db", tags=["daily-db"])
 app.include_router(daily_db_team.router, prefix="/api/daily-db-team", tags=["daily-db-team"])
 app.include_router(meta.router, prefix="/api/meta", tags=["meta"])
 app.include_router(stats.router, prefix="/api/stats", tags=["stats"])
+app.include_router(export.router, prefix="/api/export", tags=["export"])
+app.include_router(availability.router, prefix="/api/availability", tags=["availability"])
+app.include_router(calendar.router, prefix="/api/calendar", tags=["calendar"])
+app.include_router(events.router, prefix="/api/events", tags=["events"])
+
+# 시드: 내용이 바뀌면 스키마 스탬프도 달라져 다음 기동 때 다시 적용됨
+SEED_BRANCHES = [("KH", "KH"), ("ATENZ", "아텐츠"), ("VIDEO", "영상")]
+SEED_TEAMS = [("JONGNO", "종로"), ("DANGSAN", "당산"), ("GANGNAM1", "강남 1팀"), ("GANGNAM2", "강남 2팀")]
+SEED_SUBJECTS = [
+    ("자바", "KH"), ("보안", "KH"), ("클라우드", "KH"), ("빅데이터", "KH"),
+    ("프로그래밍", "ATENZ"), ("기획", "ATENZ"), ("원화", "ATENZ"), ("3D그래픽", "ATENZ"),
+    ("포토/일러", "VIDEO"), ("기본영상편집", "VIDEO"), ("모션그래픽", "VIDEO"),
+    ("maya", "VIDEO"), ("VFX", "VIDEO"), ("유튜브", "VIDEO"),
+]
+SEED_COUNSELORS = [("김상담", "KH", "JONGNO"), ("이코치", "ATENZ", "GANGNAM1"), ("박가이드", "VIDEO", "DANGSAN")]
+SCHEMA_FINGERPRINT = schema_fingerprint(repr((SEED_BRANCHES, SEED_TEAMS, SEED_SUBJECTS, SEED_COUNSELORS)))
 
-@app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
-    seed_data()
+    schema = ensure_schema(engine, SCHEMA_FINGERPRINT, seed_data)
+    boot.timings["schema"] = schema
+    log.info("startup done at %.0fms (schema %s)", boot.mark("startup_ms"), schema)
 
 def seed_data():
+    # 테이블마다 집합 단위로 '없는 것만' 추가
     db: Session = SessionLocal()
     try:
-        # 지점
-        for code, label in [("KH","KH"), ("ATENZ","아텐츠"), ("VIDEO","영상")]:
-            if not db.query(Branch).filter(Branch.code==code).first():
-                db.add(Branch(code=code, label_ko=label, active=True))
-        # 팀
-        for code, label in [("JONGNO","종로"), ("DANGSAN","당산"), ("GANGNAM1","강남 1팀"), ("GANGNAM2","강남 2팀")]:
-            if not db.query(Team).filter(Team.code==code).first():
-                db.add(Team(code=code, label_ko=label, active=True))
-        # 과목 시드
-        seeds = [
-            ("자바","KH"),("보안","KH"),("클라우드","KH"),("빅데이터","KH"),
-            ("프로그래밍","ATENZ"),("기획","ATENZ"),("원화","ATENZ"),("3D그래픽","ATENZ"),
-            ("포토/일러","VIDEO"),("기본영상편집","VIDEO"),("모션그래픽","VIDEO"),
-            ("maya","VIDEO"),("VFX","VIDEO"),("유튜브","VIDEO"),
-        ]
-        for name, branch in seeds:
-            if not db.query(Subject).filter(Subject.name==name, Subject.branch==branch).first():
-                db.add(Subject(name=name, branch=branch, active=True))
-        # 상담사 샘플
-        if db.query(Counselor).count() == 0:
-            db.add_all([
-                Counselor(name="김상담", branch="KH",    team="JONGNO"),
-                Counselor(name="이코치", branch="ATENZ", team="GANGNAM1"),
-                Counselor(name="박가이드", branch="VIDEO", team="DANGSAN"),
-            ])
+        for model, rows in ((Branch, SEED_BRANCHES), (Team, SEED_TEAMS)):
+            db.execute(insert(model).on_conflict_do_nothing(index_elements=[model.code]),
+                       [{"code": code, "label_ko": label, "active": True} for code, label in rows])
+        existing = set(db.query(Subject.name, Subject.branch).all())
+        missing = [{"name": n, "branch": b, "active": True} for n, b in SEED_SUBJECTS if (n, b) not in existing]
+        if missing:
+            db.execute(insert(Subject), missing)
+        # 상담사 샘플: 상담사가 하나도 없을 때만
+        if db.query(Counselor.id).first() is None:
+            db.execute(insert(Counselor), [{"name": n, "branch": b, "team": t} for n, b, t in SEED_COUNSELORS])
         db.commit()
     finally:
         db.close()
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {"status": "ok", "db": "async" if DB_ASYNC else "sync", "boot": boot.stats()}
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
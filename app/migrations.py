@@ -0,0 +1,217 @@
+# app/migrations.py
+# create_all 은 기존 테이블을 변경하지 않으므로, 운영 중인 data.db 에
+# 누락된 컬럼/인덱스를 제자리(in-place)에서 추가한다.
+# 유니크 인덱스를 막는 중복 키가 있으면 데이터를 건드리지 않고 기동을 멈춘다. 정리는 명시적으로:
+#   DATABASE_URL=sqlite:///./data.db python -m app.migrations dedupe [--strategy sum|latest] [--apply]
+import argparse
+import logging
+import sys
+import zlib
+from itertools import groupby
+from typing import Callable, List
+from sqlalchemy import func, inspect, insert, select, text, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.db import Base, chunked
+from app.models import Session as Sess, SessionSlot, SessionDailyAgg, SessionChange, DataVersion, DailyDB, DailyDBTeam
+from app.services import rollup
+from app.services.slot_claims import claim_rows
+
+log = logging.getLogger(__name__)
+
+def _add_missing_columns(conn, table, existing_cols):
+    for col in table.columns:
+        if col.name in existing_cols:
+            continue
+        if not col.nullable and col.server_default is None:
+            log.warning("skip column %s.%s: NOT NULL without server default", table.name, col.name)
+            continue
+        col_type = col.type.compile(dialect=conn.dialect)
+        conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{col.name}" {col_type}'))
+        log.info("added column %s.%s", table.name, col.name)
+
+class DuplicateKeysError(RuntimeError):
+    """유니크 인덱스를 만들 수 없는 중복 키가 있음. 기동을 멈추고 dedupe 명령으로 정리하게 한다."""
+
+def _duplicate_keys(conn, table, cols) -> list:
+    col_list = ", ".join(f'"{c}"' for c in cols)
+    return conn.execute(text(
+        f'SELECT {col_list}, COUNT(*) FROM "{table.name}" GROUP BY {col_list} HAVING COUNT(*) > 1 ORDER BY {col_list}'
+    )).all()
+
+def _check_unique(conn, table, idx, shown: int = 20):
+    cols = [c.name for c in idx.columns]
+    dups = _duplicate_keys(conn, table, cols)
+    if not dups:
+        return
+    lines = [f"  {', '.join(f'{c}={v}' for c, v in zip(cols, d))}: {d[-1]}행" for d in dups[:shown]]
+    if len(dups) > shown:
+        lines.append(f"  ... 외 {len(dups) - shown}개")
+    raise DuplicateKeysError(
+        f"{table.name} 에 중복 키 {len(dups)}개가 있어 유니크 인덱스 {idx.name} 을 만들 수 없습니다.\n"
+        + "\n".join(lines)
+        + "\n검토 후 정리: python -m app.migrations dedupe --strategy sum|latest (--apply 로 반영)")
+
+def _add_missing_indexes(conn, table, existing_indexes):
+    for idx in table.indexes:
+        if idx.name in existing_indexes:
+            continue
+        if idx.unique:
+            _check_unique(conn, table, idx)
+        idx.create(bind=conn, checkfirst=True)
+        log.info("created index %s", idx.name)
+
+def _backfill_slot_claims(conn):
+    # 슬롯 점유 행이 없는 기존 세션 보충. 이미 겹쳐 있던 과거 데이터는 먼저 점유한 쪽을 유지(OR IGNORE)
+    rows = conn.execute(
+        select(Sess.id, Sess.counselor_id, Sess.date, Sess.start_time, Sess.end_time)
+        .where(~Sess.id.in_(select(SessionSlot.session_id)))
+        .order_by(Sess.id)
+    ).all()
+    if not rows:
+        return
+    stmt = insert(SessionSlot).prefix_with("OR IGNORE")
+    values = [v for r in rows for v in claim_rows(*r)]
+    for chunk in chunked(values):
+        conn.execute(stmt, chunk)
+    log.info("backfilled slot claims for %d sessions", len(rows))
+
+def _backfill_rollup(conn):
+    # 롤업 테이블이 새로 생긴 경우 원본에서 한 번 채움 (이후는 쓰기 경로가 증분 유지)
+    if conn.execute(select(SessionDailyAgg.id).limit(1)).first() is not None:
+        return
+    if conn.execute(select(Sess.id).limit(1)).first() is None:
+        return
+    with Session(bind=conn) as db:
+        n = rollup.rebuild(db)
+        db.flush()
+    log.info("built session_daily_agg: %d rows", n)
+
+# 변경 로그 트리거: 모든 쓰기 경로(API·가져오기·일괄·외부 도구)에서 세션마다 최신 변경 1건만 남긴다
+# 트리거는 migrate() 에서만 만든다. 웜 스타트는 스탬프(트리거 본문 포함)가 일치할 때만 건너뛰므로
+# 스탬프가 맞는 DB 에는 트리거가 있다 — 스탬프를 거치지 않고 만든 DB 에 세션을 쓰면 피드·가용성 인덱스가 놓친다
+# (지우고 다시 넣어 새 id 를 받음 → 커서 이후에 다시 보임)
+_LOG = "DELETE FROM session_changes WHERE session_id = {ref}.id; " \
+       "INSERT INTO session_changes (session_id, deleted, changed_at) VALUES ({ref}.id, {deleted}, CURRENT_TIMESTAMP);"
+SESSION_CHANGE_TRIGGERS = {
+    "trg_sessions_change_insert": f"AFTER INSERT ON sessions BEGIN {_LOG.format(ref='NEW', deleted=0)} END",
+    "trg_sessions_change_update": f"AFTER UPDATE ON sessions BEGIN {_LOG.format(ref='NEW', deleted=0)} END",
+    "trg_sessions_change_delete": f"AFTER DELETE ON sessions BEGIN {_LOG.format(ref='OLD', deleted=1)} END",
+}
+
+def _create_triggers(conn):
+    for name, body in SESSION_CHANGE_TRIGGERS.items():
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        conn.execute(text(f"CREATE TRIGGER {name} {body}"))
+
+def migrate(engine: Engine):
+    with engine.begin() as conn:
+        insp = inspect(conn)
+        tables = set(insp.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            _add_missing_columns(conn, table, {c["name"] for c in insp.get_columns(table.name)})
+            _add_missing_indexes(conn, table, {i["name"] for i in insp.get_indexes(table.name)})
+        if SessionSlot.__tablename__ in tables:
+            _backfill_slot_claims(conn)
+        if SessionDailyAgg.__tablename__ in tables:
+            _backfill_rollup(conn)
+        if SessionChange.__tablename__ in tables:
+            _create_triggers(conn)
+
+# --- 중복 키 정리 (명시적 실행) ---
+# 테이블 → (유니크 키 컬럼, 값 컬럼). 통계는 중복 행을 합산해 왔으므로 기본 전략은 sum
+DEDUPE = {DailyDB: (("date", "branch"), "db_count"), DailyDBTeam: (("date", "team"), "db_count")}
+
+def dedupe(engine: Engine, strategy: str = "sum", apply: bool = False) -> List[dict]:
+    """키마다 가장 최근(id 최대) 행만 남긴다. 값은 sum: 그룹 합계(기존 통계와 같은 값), latest: 남는 행의 값.
+    apply=False 면 바꿀 내용만 돌려준다."""
+    changes = []
+    with engine.begin() as conn:
+        tables = set(inspect(conn).get_table_names())
+        for model, (keys, value) in DEDUPE.items():
+            t = model.__table__
+            if t.name not in tables:
+                continue
+            key_cols = [t.c[k] for k in keys]
+            dup = select(*key_cols).group_by(*key_cols).having(func.count() > 1)
+            rows = conn.execute(select(t.c.id, *key_cols, t.c[value]).where(tuple_(*key_cols).in_(dup))
+                                .order_by(*key_cols, t.c.id)).all()
+            for key, group in groupby(rows, key=lambda r: tuple(r[1:-1])):
+                group = list(group)
+                kept = group[-1]
+                merged = sum(r[-1] for r in group) if strategy == "sum" else kept[-1]
+                changes.append({"table": t.name, "key": dict(zip(keys, key)), "ids": [r[0] for r in group],
+                                "values": [r[-1] for r in group], "kept_id": kept[0], "value": merged})
+                if apply:
+                    conn.execute(t.update().where(t.c.id == kept[0]).values({value: merged}))
+                    conn.execute(t.delete().where(t.c.id.in_([r[0] for r in group[:-1]])))
+    return changes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("dedupe", help="유니크 인덱스를 막는 일별 DB 중복 키 정리 (DATABASE_URL 대상)")
+    p.add_argument("--strategy", choices=("sum", "latest"), default="sum",
+                   help="sum: 중복 행 값을 합산(기본, 기존 통계와 동일) / latest: 가장 최근 행 값 유지")
+    p.add_argument("--apply", action="store_true", help="지정하지 않으면 바꿀 내용만 출력")
+    args = parser.parse_args(argv)
+
+    from app.db import engine
+    changes = dedupe(engine, args.strategy, args.apply)
+    for c in changes:
+        key = ", ".join(f"{k}={v}" for k, v in c["key"].items())
+        print(f"{c['table']} [{key}] ids {c['ids']} 값 {c['values']} → #{c['kept_id']} = {c['value']}")
+    if not changes:
+        print("중복 키가 없습니다.")
+    elif args.apply:
+        print(f"{len(changes)}개 키 정리 완료. 다음 기동 때 유니크 인덱스가 생성됩니다.")
+    else:
+        print(f"{len(changes)}개 키. --apply 로 반영합니다.")
+    return 0
+
+# --- 스키마/시드 스탬프: 일치하면 기동 시 create_all·migrate·시드를 통째로 건너뜀 ---
+SCHEMA_STAMP = "schema"
+
+def schema_fingerprint(extra: str = "") -> int:
+    """모델 정의(테이블·컬럼·인덱스·트리거) + 시드 내용의 CRC32. 어느 쪽이든 바뀌면 값이 달라진다."""
+    parts = []
+    for table in Base.metadata.sorted_tables:
+        parts.append(table.name)
+        parts += [f"{c.name}:{c.type}:{c.nullable}" for c in table.columns]
+        parts += sorted(f"{i.name}:{i.unique}:{','.join(c.name for c in i.columns)}" for i in table.indexes)
+    parts += [f"{n}:{b}" for n, b in SESSION_CHANGE_TRIGGERS.items()]
+    parts.append(extra)
+    return zlib.crc32("|".join(parts).encode())
+
+def stamp_matches(engine: Engine, fingerprint: int) -> bool:
+    # 빈 DB(테이블 없음)면 OperationalError → 불일치
+    try:
+        with engine.connect() as conn:
+            v = conn.execute(select(DataVersion.version).where(DataVersion.name == SCHEMA_STAMP)).scalar()
+    except OperationalError:
+        return False
+    return v == fingerprint
+
+def ensure_schema(engine: Engine, fingerprint: int, seed: Callable[[], None] = lambda: None) -> str:
+    """스탬프가 현재 모델·시드와 같으면 스키마 검사/마이그레이션/시드 생략 (쿼리 1회).
+    세션 변경 트리거도 여기(migrate)서만 만들어지므로, 세션을 쓰는 모든 코드는 이 호출을 거친 DB 를 전제로 한다."""
+    if stamp_matches(engine, fingerprint):
+        return "current"
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    seed()
+    write_stamp(engine, fingerprint)
+    return "migrated"
+
+def write_stamp(engine: Engine, fingerprint: int):
+    stmt = sqlite_insert(DataVersion).values(name=SCHEMA_STAMP, version=fingerprint)
+    stmt = stmt.on_conflict_do_update(index_elements=[DataVersion.name], set_={"version": fingerprint})
+    with engine.begin() as conn:
+        conn.execute(stmt)
+
+if __name__ == "__main__":
+    sys.exit(main())
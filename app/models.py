@@ -1,5 +1,5 @@
 # app/models.py
-from sqlalchemy import Column, Integer, String, Date, Time, ForeignKey, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, String, Date, Time, ForeignKey, Boolean, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from app.db import Base
 
@@ -43,6 +43,14 @@ class Subject(Base):
 
 class Session(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        # 중복 시간 검사 / 상담사별 조회
+        Index("ix_sessions_counselor_date_start", "counselor_id", "date", "start_time"),
+        # 통계·목록 필터 (기간 + 지점/팀/상태)
+        Index("ix_sessions_date_branch_team_status", "date", "branch", "team", "status"),
+        # 기본 정렬(date, start_time)
+        Index("ix_sessions_date_start", "date", "start_time"),
+    )
     id = Column(Integer, primary_key=True)
     date = Column(Date, nullable=False)
     start_time = Column(Time, nullable=False)
@@ -51,6 +59,7 @@ class Session(Base):
     counselor_id = Column(Integer, ForeignKey("counselors.id"), nullable=False)
     branch = Column(String, nullable=False)  # Branch.code
     team = Column(String, nullable=False)    # Team.code
+    student_name = Column(String, nullable=True)
 
     requested_subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=True)
     registered_subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=True)
@@ -69,6 +78,9 @@ class Session(Base):
 
 class DailyDB(Base):
     __tablename__ = "daily_db"
+    __table_args__ = (
+        Index("uq_daily_db_date_branch", "date", "branch", unique=True),
+    )
     id = Column(Integer, primary_key=True)
     date = Column(Date, nullable=False)
     branch = Column(String, nullable=False)  # Branch.code
@@ -77,7 +89,53 @@ class DailyDB(Base):
 # 신규: 팀별 일별 DB (팀 필터 시 상담률 분모로 사용)
 class DailyDBTeam(Base):
     __tablename__ = "daily_db_team"
+    __table_args__ = (
+        Index("uq_daily_db_team_date_team", "date", "team", unique=True),
+    )
     id = Column(Integer, primary_key=True)
     date = Column(Date, nullable=False)
     team = Column(String, nullable=False)    # Team.code
     db_count = Column(Integer, nullable=False, default=0)
+
+# 데이터 버전(쓰기 시 증가) — 캐시 무효화용, 워커 프로세스 간 공유
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+    name = Column(String, primary_key=True)   # sessions / daily_db / meta
+    version = Column(Integer, nullable=False, default=0)
+
+# 슬롯 점유(30분 단위): (상담사, 일자, 슬롯) 유니크 → 중복 예약을 DB 가 원자적으로 거부
+class SessionSlot(Base):
+    __tablename__ = "session_slots"
+    counselor_id = Column(Integer, primary_key=True)
+    date = Column(Date, primary_key=True)
+    slot = Column(Integer, primary_key=True)   # 0~47 (slot*30분 부터 30분)
+    session_id = Column(Integer, ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False, index=True)
+
+# 일별 집계(롤업): 세션 쓰기 경로에서 증분 유지, 통계는 원본 대신 여기서 합산
+# 과목 없음은 0 으로 저장 (SQLite 유니크 인덱스는 NULL 을 서로 다른 값으로 취급하므로)
+class SessionDailyAgg(Base):
+    __tablename__ = "session_daily_agg"
+    __table_args__ = (
+        Index("uq_session_daily_agg_dims", "date", "branch", "team", "requested_subject_id",
+              "registered_subject_id", "mode", "status", unique=True),
+    )
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False)
+    branch = Column(String, nullable=False)
+    team = Column(String, nullable=False)
+    requested_subject_id = Column(Integer, nullable=False, default=0)
+    registered_subject_id = Column(Integer, nullable=False, default=0)
+    mode = Column(String, nullable=False, default="")
+    status = Column(String, nullable=False, default="")
+    count = Column(Integer, nullable=False, default=0)
+
+# 세션 변경 로그: sessions 트리거(migrations.SESSION_CHANGE_TRIGGERS)가 세션마다 최신 1건만 유지
+# id = 커밋 순서 시퀀스 — SQLite 는 첫 쓰기부터 커밋까지 쓰기 잠금을 쥐므로 AUTOINCREMENT 값이 커밋 순과 같다
+# AUTOINCREMENT: 정리 후에도 id(피드 커서)가 되돌아가지 않도록
+class SessionChange(Base):
+    __tablename__ = "session_changes"
+    __table_args__ = {"sqlite_autoincrement": True}
+    id = Column(Integer, primary_key=True)
+    session_id = Column(Integer, nullable=False, unique=True)
+    deleted = Column(Boolean, nullable=False, default=False)   # 삭제 툼스톤
+    changed_at = Column(DateTime, server_default=func.now(), index=True)
@@ -0,0 +1,76 @@
+# app/routers/availability.py
+from datetime import date, time, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.db import DB, get_async_read_db
+from app.services.availability import availability, slot_mask, slot_time, free_ranges
+from app.services.registry import registry
+from app.services.validators import is_30min_grid
+
+router = APIRouter()
+MAX_DAYS = 92
+
+def _free(db: Session, from_date: date, to_date: date, branch: Optional[str], team: Optional[str],
+          counselor_id: Optional[int], start_time: Optional[time], end_time: Optional[time],
+          day_start: time, day_end: time):
+    idx = availability.view(db, from_date, to_date)
+    counselors = [c for c in registry.get(db).counselors.values()
+                  if c.status == "ACTIVE"
+                  and (not branch or c.branch == branch)
+                  and (not team or c.team == team)
+                  and (not counselor_id or c.id == counselor_id)]
+    ids = [c.id for c in counselors]
+
+    days = []
+    d = from_date
+    if start_time and end_time:
+        # 특정 시간대에 비어 있는 상담사: 창 마스크 하나로 전원 AND 판정
+        window = slot_mask(start_time, end_time)
+        while d <= to_date:
+            day = idx.day_bits(ids, d)
+            days.append({"date": d.isoformat(), "counselors": [
+                {"id": c.id, "name": c.name, "branch": c.branch, "team": c.team}
+                for c, bits in zip(counselors, day) if not bits & window
+            ]})
+            d += timedelta(days=1)
+        return {"window": {"start": start_time.strftime("%H:%M"), "end": end_time.strftime("%H:%M")}, "days": days}
+
+    window = slot_mask(day_start, day_end)
+    while d <= to_date:
+        day = idx.day_bits(ids, d)
+        days.append({"date": d.isoformat(), "counselors": [
+            {"id": c.id, "name": c.name, "branch": c.branch, "team": c.team,
+             "free": [[slot_time(s), slot_time(e)] for s, e in free_ranges(bits, window)]}
+            for c, bits in zip(counselors, day) if bits & window != window
+        ]})
+        d += timedelta(days=1)
+    return {"days": days}
+
+@router.get("/free")
+async def free_slots(
+    db: DB = Depends(get_async_read_db),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    branch: Optional[str] = Query(None),
+    team: Optional[str] = Query(None),
+    counselor_id: Optional[int] = Query(None),
+    start_time: Optional[time] = Query(None, description="지정 시 이 시간대가 비어 있는 상담사 목록"),
+    end_time: Optional[time] = Query(None),
+    day_start: time = Query(time(9, 0)),
+    day_end: time = Query(time(21, 0))
+):
+    from_date = from_date or date.today()
+    to_date = to_date or from_date + timedelta(days=6)
+    if to_date < from_date or (to_date - from_date).days >= MAX_DAYS:
+        raise HTTPException(400, f"조회 기간은 {MAX_DAYS}일 이내여야 합니다.")
+    if (start_time is None) != (end_time is None):
+        raise HTTPException(400, "시작/종료 시각을 함께 지정해야 합니다.")
+    for a, b in ((start_time, end_time), (day_start, day_end)):
+        if a is None:
+            continue
+        if not is_30min_grid(a) or not is_30min_grid(b):
+            raise HTTPException(400, "시작/종료 시각은 30분 단위여야 합니다.")
+        if b <= a:
+            raise HTTPException(400, "종료 시각은 시작 시각보다 커야 합니다.")
+    return await db.run(_free, from_date, to_date, branch, team, counselor_id, start_time, end_time, day_start, day_end)
@@ -0,0 +1,65 @@
+# app/routers/calendar.py
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db import DB, get_async_read_db
+from app.models import Session as Sess, SessionDailyAgg as Agg
+from app.services.dates import month_end
+from app.services.session_query import filter_sessions
+from app.services.query_guard import query_budget
+
+router = APIRouter()
+MAX_DAYS = 92
+
+def _bucket():
+    return {"total": 0, "status": {}, "mode": {}}
+
+def _add(b: dict, status: str, mode: str, cnt: int):
+    b["total"] += cnt
+    b["status"][status] = b["status"].get(status, 0) + cnt
+    b["mode"][mode] = b["mode"].get(mode, 0) + cnt
+
+def _summary(db: Session, from_date: date, to_date: date, branch: Optional[str], team: Optional[str],
+             counselor_id: Optional[int], status: Optional[str], mode: Optional[str], by_counselor: bool):
+    if counselor_id or by_counselor:
+        # 상담사 차원이 필요하면 원본 세션에서 GROUP BY
+        dims = [Sess.date, Sess.status, Sess.mode, Sess.counselor_id]
+        q = filter_sessions(db.query(func.count(Sess.id), *dims),
+                            from_date, to_date, branch, team, counselor_id, status, mode)
+    else:
+        # 지점/팀/상태/모드만이면 일별 롤업으로 충분
+        dims = [Agg.date, Agg.status, Agg.mode]
+        q = db.query(func.sum(Agg.count), *dims).filter(Agg.date >= from_date, Agg.date <= to_date)
+        if branch: q = q.filter(Agg.branch == branch)
+        if team: q = q.filter(Agg.team == team)
+        if status: q = q.filter(Agg.status == status)
+        if mode: q = q.filter(Agg.mode == mode)
+
+    days = {}
+    for cnt, d, st, md, *cid in q.group_by(*dims):
+        day = days.setdefault(d.isoformat(), _bucket())
+        _add(day, st or "", md or "", cnt)
+        if by_counselor:
+            _add(day.setdefault("counselors", {}).setdefault(str(cid[0]), _bucket()), st or "", md or "", cnt)
+    return {"from": from_date.isoformat(), "to": to_date.isoformat(), "days": days}
+
+@router.get("/summary")
+@query_budget(8)
+async def calendar_summary(
+    db: DB = Depends(get_async_read_db),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    branch: Optional[str] = Query(None),
+    team: Optional[str] = Query(None),
+    counselor_id: Optional[int] = Query(None),
+    status: Optional[str] = Query(None),
+    mode: Optional[str] = Query(None),
+    by_counselor: bool = Query(False, description="true 면 일자별 상담사 건수 포함")
+):
+    from_date = from_date or date.today().replace(day=1)
+    to_date = to_date or month_end(from_date)
+    if to_date < from_date or (to_date - from_date).days >= MAX_DAYS:
+        raise HTTPException(400, f"조회 기간은 {MAX_DAYS}일 이내여야 합니다.")
+    return await db.run(_summary, from_date, to_date, branch, team, counselor_id, status, mode, by_counselor)
@@ -2,10 +2,15 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.db import get_db
 from app.models import Counselor
+from app.services.query_guard import query_budget
+from app.services.json_response import FastJSONResponse
 
 router = APIRouter()
 
-@router.get("/")
+COLUMNS = ("id", "name", "branch", "team", "status")
+
+@router.get("/", response_class=FastJSONResponse)
+@query_budget(2)
 def list_counselors(db: Session = Depends(get_db)):
-    rows = db.query(Counselor).order_by(Counselor.name).all()
-    return [{"id": c.id, "name": c.name, "branch": c.branch, "team": c.team, "status": c.status} for c in rows]
+    rows = db.query(*(getattr(Counselor, c) for c in COLUMNS)).order_by(Counselor.name)
+    return FastJSONResponse([dict(zip(COLUMNS, r)) for r in rows])
@@ -1,11 +1,17 @@
 # app/routers/daily_db_team.py
 from datetime import date
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from app.db import get_db
+from app.db import DB, get_async_db
+from app.services.versions import bump, DAILY_DB
 from app.models import DailyDBTeam
+from app.services.daily_db_bulk import bulk_upsert, parse_body, MAX_ROWS
+from app.services.daily_db_query import list_rows, grid, month_range
+from app.services.registry import registry
+from app.services.query_guard import query_budget
+from app.services.json_response import FastJSONResponse
 
 router = APIRouter()
 
@@ -14,20 +20,79 @@ class DailyDBTeamPayload(BaseModel):
     team: str
     db_count: int
 
-@router.post("/")
-def upsert_daily_db_team(payload: DailyDBTeamPayload, db: Session = Depends(get_db)):
-    row = db.query(DailyDBTeam).filter(
-        and_(DailyDBTeam.date == payload.date, DailyDBTeam.team == payload.team)
-    ).first()
-    if row:
-        row.db_count = payload.db_count
-    else:
-        row = DailyDBTeam(date=payload.date, team=payload.team, db_count=payload.db_count)
-        db.add(row)
-    db.commit()
+def _upsert_daily_db_team(db: Session, payload: DailyDBTeamPayload):
+    result = bulk_upsert(db, DailyDBTeam, "team", [(payload.date, payload.team, payload.db_count)])
+    if result["unchanged"] == 0:
+        bump(db, DAILY_DB)
+        db.commit()
     return {"ok": True}
 
-@router.get("/")
-def list_daily_db_team(db: Session = Depends(get_db)):
-    rows = db.query(DailyDBTeam).order_by(DailyDBTeam.date.desc(), DailyDBTeam.team).all()
-    return [{"id": r.id, "date": r.date.isoformat(), "team": r.team, "db_count": r.db_count} for r in rows]
+@router.post("/")
+async def upsert_daily_db_team(payload: DailyDBTeamPayload, db: DB = Depends(get_async_db)):
+    # 동일 (date, team) 유니크 보장: upsert 형태
+    return await db.write(_upsert_daily_db_team, payload)
+
+def _bulk_upsert(db: Session, rows):
+    meta = registry.resolve(db, "teams", {k for _, k, _ in rows})   # 다른 워커가 방금 추가한 코드도 인식
+    # 그리드를 복사해 붙여넣은 경우 머리글이 라벨일 수 있음 → 코드로 환원
+    by_label = {m.label_ko: m.code for m in meta.teams.values()}
+    rows = [(d, k if meta.find("teams", k) else by_label.get(k, k), n) for d, k, n in rows]
+    unknown = sorted({k for _, k, _ in rows if meta.find("teams", k) is None})
+    if unknown:
+        raise HTTPException(400, f"알 수 없는 팀 코드: {', '.join(unknown)}")
+    result = bulk_upsert(db, DailyDBTeam, "team", rows)
+    if result["inserted"] or result["updated"]:
+        bump(db, DAILY_DB)
+        db.commit()
+    return result
+
+@router.post("/bulk")
+@query_budget(10)
+async def bulk_upsert_daily_db_team(request: Request, db: DB = Depends(get_async_db)):
+    """JSON 배열 [{date, team, db_count}] 또는 CSV/TSV 붙여넣기(세로형·가로형)를 한 트랜잭션으로 저장."""
+    rows, errors = parse_body(await request.body(), request.headers.get("content-type", ""), "team")
+    if errors:
+        raise HTTPException(400, {"message": "형식 오류가 있어 저장하지 않았습니다.", "errors": errors[:50]})
+    if len(rows) > MAX_ROWS:
+        raise HTTPException(400, f"한 번에 {MAX_ROWS}건까지 저장할 수 있습니다.")
+    return await db.write(_bulk_upsert, rows)
+
+def _list_daily_db_team(db: Session, from_date: Optional[date], to_date: Optional[date], team: Optional[str],
+                        limit: Optional[int], cursor: Optional[str]):
+    try:
+        return list_rows(db, DailyDBTeam, "team", from_date, to_date, team, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+@router.get("/", response_class=FastJSONResponse)
+@query_budget(3)
+async def list_daily_db_team(
+    db: DB = Depends(get_async_db),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    team: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="지정 시 커서 기반 페이지 응답"),
+    cursor: Optional[str] = Query(None)
+):
+    return FastJSONResponse(await db.run(_list_daily_db_team, from_date, to_date, team, limit, cursor))
+
+def _grid(db: Session, month: Optional[str], from_date: Optional[date], to_date: Optional[date], team: Optional[str]):
+    try:
+        from_date, to_date = month_range(month, from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    items = registry.get(db).teams.values()
+    return grid(db, DailyDBTeam, "team", from_date, to_date, [m.code for m in items if m.active],
+                {m.code: m.label_ko for m in items}, team)
+
+@router.get("/grid")
+@query_budget(8)
+async def daily_db_team_grid(
+    db: DB = Depends(get_async_db),
+    month: Optional[str] = Query(None, description="YYYY-MM (from/to 대신)"),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    team: Optional[str] = Query(None)
+):
+    """날짜 × 팀 피벗 (단일 쿼리)."""
+    return await db.run(_grid, month, from_date, to_date, team)
@@ -0,0 +1,48 @@
+# app/routers/events.py
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.services.events import hub
+
+router = APIRouter()
+
+def _sse(event: str, data, id_: Optional[int] = None) -> str:
+    head = f"id: {id_}\n" if id_ is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+@router.get("/sessions")
+async def session_events(
+    branch: Optional[str] = Query(None),
+    team: Optional[str] = Query(None),
+    counselor_id: Optional[int] = Query(None)
+):
+    """세션 생성/수정/삭제 이벤트 스트림 (text/event-stream). 필터는 서버에서 적용."""
+    sub = hub.subscribe(branch, team, counselor_id)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    item = await asyncio.wait_for(sub.queue.get(), settings.sse_heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if item is None:
+                    # 처리 지연으로 끊김: 클라이언트는 재접속 후 변경 피드로 따라잡는다
+                    yield _sse("dropped", {})
+                    return
+                seq, type_, rows = item
+                yield _sse(type_, rows, seq)
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/stats")
+def event_stats():
+    return hub.stats()
@@ -0,0 +1,130 @@
+# app/routers/export.py
+# 대용량 내보내기: DB 에서 고정 크기 청크로 읽어 CSV(엑셀용 UTF-8 BOM) / NDJSON 으로 스트리밍
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterator, List, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.db import chunked, get_read_db, ReadSessionLocal
+from app.models import Session as Sess
+from app.services.query_guard import query_budget
+from app.routers.stats import _range, _cached, _overview
+from app.services.labels import MODE_LABELS
+from app.services.registry import registry
+from app.services.session_query import iter_chunks
+
+router = APIRouter()
+
+CHUNK = 1000
+MEDIA = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+SESSION_COLUMNS = [
+    "id", "date", "start_time", "end_time", "counselor_id", "counselor",
+    "branch", "branch_label", "team", "team_label", "student_name",
+    "requested_subject_id", "requested_subject", "registered_subject_id", "registered_subject",
+    "mode", "mode_label", "status", "cancel_reason", "comment",
+]
+
+OVERVIEW_TABLES = {
+    "branch": "branch_stats",
+    "subject_request": "subject_stats_request",
+    "subject_registered": "subject_stats_registered",
+}
+
+def _encode(rows: Iterator[List[dict]], columns: List[str], fmt: str) -> Iterator[bytes]:
+    if fmt == "ndjson":
+        for chunk in rows:
+            yield "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in chunk).encode("utf-8")
+        return
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=columns, extrasaction="ignore")
+    buf.write("\ufeff")  # 엑셀 한글 인코딩 인식용 BOM
+    writer.writeheader()
+    for chunk in rows:
+        writer.writerows(chunk)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0); buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+def _response(body: Iterator[bytes], fmt: str, name: str) -> StreamingResponse:
+    ext = "csv" if fmt == "csv" else "ndjson"
+    return StreamingResponse(body, media_type=MEDIA[fmt],
+                             headers={"Content-Disposition": f'attachment; filename="{name}.{ext}"'})
+
+def _session_rows(filters: dict) -> Iterator[List[dict]]:
+    # 스트리밍 동안 사용할 전용 세션 (요청 의존성 세션은 응답 전에 닫힐 수 있음)
+    db = ReadSessionLocal()
+    try:
+        meta = registry.get(db)
+        cols = (Sess.id, Sess.date, Sess.start_time, Sess.end_time, Sess.counselor_id, Sess.branch, Sess.team,
+                Sess.student_name, Sess.requested_subject_id, Sess.registered_subject_id,
+                Sess.mode, Sess.status, Sess.cancel_reason, Sess.comment)
+        for rows in iter_chunks(db, cols, filters, CHUNK):
+            out = []
+            for r in rows:
+                c = meta.counselors.get(r.counselor_id)
+                b, t = meta.branches.get(r.branch), meta.teams.get(r.team)
+                rs, gs = meta.subjects.get(r.requested_subject_id), meta.subjects.get(r.registered_subject_id)
+                out.append({
+                    "id": r.id,
+                    "date": r.date.isoformat(),
+                    "start_time": r.start_time.strftime("%H:%M"),
+                    "end_time": r.end_time.strftime("%H:%M"),
+                    "counselor_id": r.counselor_id,
+                    "counselor": c.name if c else "",
+                    "branch": r.branch,
+                    "branch_label": b.label_ko if b else r.branch,
+                    "team": r.team,
+                    "team_label": t.label_ko if t else r.team,
+                    "student_name": r.student_name,
+                    "requested_subject_id": r.requested_subject_id,
+                    "requested_subject": rs.name if rs else "",
+                    "registered_subject_id": r.registered_subject_id,
+                    "registered_subject": gs.name if gs else "",
+                    "mode": r.mode,
+                    "mode_label": MODE_LABELS.get(r.mode, r.mode or ""),
+                    "status": r.status,
+                    "cancel_reason": r.cancel_reason,
+                    "comment": r.comment,
+                })
+            yield out
+    finally:
+        db.close()
+
+@router.get("/sessions")
+@query_budget(8)   # 청크는 서버 측 커서 하나로 스트리밍: 건수와 무관
+def export_sessions(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    branch: Optional[str] = Query(None),
+    team: Optional[str] = Query(None),
+    counselor_id: Optional[int] = Query(None),
+    status: Optional[str] = Query(None),
+    mode: Optional[str] = Query(None)
+):
+    filters = dict(from_date=from_date, to_date=to_date, branch=branch, team=team,
+                   counselor_id=counselor_id, status=status, mode=mode)
+    name = "sessions" + (f"_{from_date.isoformat()}" if from_date else "") + (f"_{to_date.isoformat()}" if to_date else "")
+    return _response(_encode(_session_rows(filters), SESSION_COLUMNS, format), format, name)
+
+@router.get("/overview")
+@query_budget(10)  # stats /overview 와 같은 집계
+def export_overview(
+    db: Session = Depends(get_read_db),
+    table: str = Query("branch", pattern="^(branch|subject_request|subject_registered)$"),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    branch: Optional[str] = Query(None),
+    team: Optional[str] = Query(None)
+):
+    from_date, to_date = _range(from_date, to_date)
+    rows = _cached(db, "overview", from_date, to_date, branch, team, _overview)[OVERVIEW_TABLES[table]]
+    columns = list(rows[0].keys()) if rows else []
+    chunks = chunked(rows, CHUNK)
+    return _response(_encode(chunks, columns, format), format, f"overview_{table}_{from_date.isoformat()}_{to_date.isoformat()}")
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from app.db import get_db
+from app.db import DB, get_async_db
 from app.models import Branch, Team
+from app.services.versions import bump, META
+from app.services.registry import registry
 
 router = APIRouter()
 
@@ -13,57 +15,83 @@ class MetaUpsert(BaseModel):
     active: bool = True
 
 # 지점
-@router.get("/branches")
-def list_branches(active: bool | None = Query(None), db: Session = Depends(get_db)):
+def _list_branches(db: Session, active: bool | None):
     q = db.query(Branch)
     if active is not None:
         q = q.filter(Branch.active == active)
     rows = q.order_by(Branch.code).all()
     return [{"code": r.code, "label_ko": r.label_ko, "active": r.active} for r in rows]
 
-@router.post("/branches")
-def upsert_branch(payload: MetaUpsert, db: Session = Depends(get_db)):
+@router.get("/branches")
+async def list_branches(active: bool | None = Query(None), db: DB = Depends(get_async_db)):
+    return await db.run(_list_branches, active)
+
+def _upsert_branch(db: Session, payload: MetaUpsert):
     row = db.query(Branch).filter(Branch.code == payload.code).first()
     if row:
         row.label_ko = payload.label_ko
         row.active = payload.active
     else:
         db.add(Branch(code=payload.code, label_ko=payload.label_ko, active=payload.active))
+    bump(db, META)
     db.commit()
+    registry.refresh(db)
     return {"ok": True}
 
-@router.patch("/branches/{code}/toggle")
-def toggle_branch(code: str, db: Session = Depends(get_db)):
+@router.post("/branches")
+async def upsert_branch(payload: MetaUpsert, db: DB = Depends(get_async_db)):
+    return await db.write(_upsert_branch, payload)
+
+def _toggle_branch(db: Session, code: str):
     row = db.query(Branch).filter(Branch.code == code).first()
     if not row: raise HTTPException(404, "지점을 찾을 수 없습니다.")
     row.active = not row.active
+    bump(db, META)
     db.commit()
+    registry.refresh(db)
     return {"code": row.code, "active": row.active}
 
+@router.patch("/branches/{code}/toggle")
+async def toggle_branch(code: str, db: DB = Depends(get_async_db)):
+    return await db.write(_toggle_branch, code)
+
 # 팀
-@router.get("/teams")
-def list_teams(active: bool | None = Query(None), db: Session = Depends(get_db)):
+def _list_teams(db: Session, active: bool | None):
     q = db.query(Team)
     if active is not None:
         q = q.filter(Team.active == active)
     rows = q.order_by(Team.code).all()
     return [{"code": r.code, "label_ko": r.label_ko, "active": r.active} for r in rows]
 
-@router.post("/teams")
-def upsert_team(payload: MetaUpsert, db: Session = Depends(get_db)):
+@router.get("/teams")
+async def list_teams(active: bool | None = Query(None), db: DB = Depends(get_async_db)):
+    return await db.run(_list_teams, active)
+
+def _upsert_team(db: Session, payload: MetaUpsert):
     row = db.query(Team).filter(Team.code == payload.code).first()
     if row:
         row.label_ko = payload.label_ko
         row.active = payload.active
     else:
         db.add(Team(code=payload.code, label_ko=payload.label_ko, active=payload.active))
+    bump(db, META)
     db.commit()
+    registry.refresh(db)
     return {"ok": True}
 
-@router.patch("/teams/{code}/toggle")
-def toggle_team(code: str, db: Session = Depends(get_db)):
+@router.post("/teams")
+async def upsert_team(payload: MetaUpsert, db: DB = Depends(get_async_db)):
+    return await db.write(_upsert_team, payload)
+
+def _toggle_team(db: Session, code: str):
     row = db.query(Team).filter(Team.code == code).first()
     if not row: raise HTTPException(404, "팀을 찾을 수 없습니다.")
     row.active = not row.active
+    bump(db, META)
     db.commit()
+    registry.refresh(db)
     return {"code": row.code, "active": row.active}
+
+@router.patch("/teams/{code}/toggle")
+async def toggle_team(code: str, db: DB = Depends(get_async_db)):
+    return await db.write(_toggle_team, code)
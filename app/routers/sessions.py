@@ -1,15 +1,27 @@
 # app/routers/sessions.py
 from datetime import date, time
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, UploadFile, File
 from pydantic import BaseModel, Field
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.db import get_db
-from app.models import Session as Sess, Counselor, STATUSES, MODES
+from app.db import DB, chunked, get_async_db, get_async_read_db, get_threaded_db
+from app.models import Session as Sess, STATUSES, MODES
+from app.services.registry import registry
+from app.services.events import hub, session_row
+from app.services import slot_claims, rollup, session_changes
+from app.services.versions import bump, SESSIONS
+from app.services.session_query import (
+    SESSION_FIELDS, filter_sessions, after_key, parse_fields, projection, to_dicts, encode_cursor, decode_cursor
+)
+from app.services.session_import import import_sessions, parse_records, iter_records, detect_format
 from app.services.validators import (
     is_30min_grid, check_overlap, enforce_conditionals,
     branch_subject_guard, validate_branch_team
 )
+from app.services.query_guard import query_budget
+from app.services.json_response import FastJSONResponse
 
 router = APIRouter()
 
@@ -50,67 +62,117 @@ class BatchUpdatePayload(BaseModel):
     comment: Optional[str] = None
     registered_subject_id: Optional[int] = None
 
-@router.get("/")
-def list_sessions(
-    db: Session = Depends(get_db),
+def _list_sessions(db: Session, from_date: Optional[date], to_date: Optional[date], branch: Optional[str],
+                   team: Optional[str], counselor_id: Optional[int], status: Optional[str], mode: Optional[str],
+                   fields: Optional[str], limit: Optional[int], cursor: Optional[str], count: bool):
+    filters = (from_date, to_date, branch, team, counselor_id, status, mode)
+    if count:
+        return {"count": filter_sessions(db.query(func.count(Sess.id)), *filters).scalar()}
+    try:
+        names = parse_fields(fields)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    cols, pos = projection(names)
+    q = filter_sessions(db.query(*cols), *filters)
+    q = after_key(q, after).order_by(Sess.date, Sess.start_time, Sess.id)
+    if limit is None and after is None:
+        # 기존 호환: 페이지 없이 전체 목록
+        return to_dicts(q.all(), names, pos, iso=False)
+
+    page_size = limit or 100
+    rows = q.limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last[pos["date"]], last[pos["start_time"]], last[pos["id"]])
+    return {"items": to_dicts(rows, names, pos, iso=False), "next_cursor": next_cursor}
+
+@router.get("/", response_class=FastJSONResponse)
+@query_budget(8)
+async def list_sessions(
+    db: DB = Depends(get_async_db),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     branch: Optional[str] = Query(None),
     team: Optional[str] = Query(None),
     counselor_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
-    mode: Optional[str] = Query(None)
+    mode: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="쉼표 구분 필드 목록 (예: id,date,start_time,status)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="지정 시 커서 기반 페이지 응답"),
+    cursor: Optional[str] = Query(None),
+    count: bool = Query(False, description="true 면 건수만 반환")
 ):
-    q = db.query(Sess)
-    if from_date: q = q.filter(Sess.date >= from_date)
-    if to_date: q = q.filter(Sess.date <= to_date)
-    if branch: q = q.filter(Sess.branch == branch)
-    if team: q = q.filter(Sess.team == team)
-    if counselor_id: q = q.filter(Sess.counselor_id == counselor_id)
-    if status: q = q.filter(Sess.status == status)
-    if mode: q = q.filter(Sess.mode == mode)
-    items = q.order_by(Sess.date, Sess.start_time).all()
-    return [{
-        "id": s.id,
-        "date": s.date.isoformat(),
-        "start_time": s.start_time.isoformat(),
-        "end_time": s.end_time.isoformat(),
-        "counselor_id": s.counselor_id,
-        "branch": s.branch,
-        "team": s.team,
-        "student_name": s.student_name,
-        "requested_subject_id": s.requested_subject_id,
-        "registered_subject_id": s.registered_subject_id,
-        "mode": s.mode,
-        "status": s.status,
-        "cancel_reason": s.cancel_reason,
-        "comment": s.comment
-    } for s in items]
-
-@router.get("/{session_id}")
-def get_session(session_id: int = Path(...), db: Session = Depends(get_db)):
-    s = db.query(Sess).get(session_id)
-    if not s:
+    return FastJSONResponse(await db.run(_list_sessions, from_date, to_date, branch, team, counselor_id, status,
+                                         mode, fields, limit, cursor, count))
+
+def _import_sessions_file(db: Session, chunks, dry_run: bool):
+    report, inserted = import_sessions(db, chunks, dry_run=dry_run)
+    if inserted:
+        try:
+            slot_claims.claim(db, [r[:5] for r in inserted])
+            rollup.apply(db, rollup.changed(new=[rollup.dims_of(r[2], *r[5:]) for r in inserted]))
+            bump(db, SESSIONS)
+            db.commit()
+        except IntegrityError as e:
+            # 검증 이후 다른 요청이 같은 슬롯을 먼저 차지한 경우: 적재 전체 취소
+            db.rollback()
+            if slot_claims.is_claim_conflict(e):
+                raise HTTPException(409, "적재 중 다른 예약과 시간이 겹쳐 전체를 취소했습니다. 다시 시도해 주세요.")
+            raise
+        hub.publish("created", [
+            {"id": r[0], "date": r[2].isoformat(), "start_time": r[3].isoformat(), "end_time": r[4].isoformat(),
+             "counselor_id": r[1], "branch": r[5], "team": r[6], "status": r[10], "mode": r[9]}
+            for r in inserted
+        ])
+    return report
+
+@router.post("/import", response_class=FastJSONResponse)
+async def import_sessions_file(
+    file: UploadFile = File(...),
+    dry_run: bool = Query(False),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: DB = Depends(get_threaded_db)
+):
+    # 해석·검증·적재 모두 스레드풀에서: 비동기 세션(run_sync)은 이벤트 루프 위에서 돌기 때문
+    # 업로드는 임시 파일에 있으므로 쓰기 레인 안에서 청크 단위로 읽으며 검증·적재
+    fmt = format or detect_format(file.filename, file.content_type)
+    chunks = parse_records(iter_records(file.file, fmt), SessionCreate)
+    return FastJSONResponse(await db.write(_import_sessions_file, chunks, dry_run))   # 오류 목록이 클 수 있음
+
+def _changes(db: Session, cursor: Optional[str], limit: int, fields: Optional[str]):
+    try:
+        return session_changes.feed(db, cursor, limit, parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+@router.get("/changes")
+@query_budget(4)
+async def session_changes_feed(
+    db: DB = Depends(get_async_read_db),
+    cursor: Optional[str] = Query(None, description="없으면 시작 커서만 발급"),
+    limit: int = Query(500, ge=1, le=1000),
+    fields: Optional[str] = Query(None)
+):
+    return await db.run(_changes, cursor, limit, fields)
+
+def _get_session(db: Session, session_id: int):
+    cols, pos = projection(SESSION_FIELDS)
+    row = db.query(*cols).filter(Sess.id == session_id).first()
+    if not row:
         raise HTTPException(404, "세션을 찾을 수 없습니다.")
-    return {
-        "id": s.id,
-        "date": s.date.isoformat(),
-        "start_time": s.start_time.isoformat(),
-        "end_time": s.end_time.isoformat(),
-        "counselor_id": s.counselor_id,
-        "branch": s.branch,
-        "team": s.team,
-        "student_name": s.student_name,
-        "requested_subject_id": s.requested_subject_id,
-        "registered_subject_id": s.registered_subject_id,
-        "mode": s.mode,
-        "status": s.status,
-        "cancel_reason": s.cancel_reason,
-        "comment": s.comment
-    }
+    return to_dicts([row], SESSION_FIELDS, pos, iso=False)[0]
 
-@router.post("/")
-def create_session(payload: SessionCreate, db: Session = Depends(get_db)):
+@router.get("/{session_id}", response_class=FastJSONResponse)
+@query_budget(8)
+async def get_session(session_id: int = Path(...), db: DB = Depends(get_async_db)):
+    return FastJSONResponse(await db.run(_get_session, session_id))
+
+def _create_session(db: Session, payload: SessionCreate):
     if payload.status not in STATUSES:
         raise HTTPException(400, "유효하지 않은 상태입니다.")
     if payload.mode not in MODES:
@@ -120,12 +182,13 @@ def create_session(payload: SessionCreate, db: Session = Depends(get_db)):
     if payload.end_time <= payload.start_time:
         raise HTTPException(400, "종료 시각은 시작 시각보다 커야 합니다.")
 
-    cons = db.query(Counselor).filter(Counselor.id == payload.counselor_id).first()
+    registry.sync(db)
+    cons = registry.counselor(db, payload.counselor_id)
     if not cons:
         raise HTTPException(404, "상담사를 찾을 수 없습니다.")
     if check_overlap(db, counselor_id=payload.counselor_id, date=payload.date,
                      start_time=payload.start_time, end_time=payload.end_time):
-        raise HTTPException(400, "동일 상담사의 시간이 겹칩니다.")
+        raise slot_claims.overlap_error(db, payload.counselor_id, payload.date, payload.start_time, payload.end_time)
     try:
         validate_branch_team(db, branch=payload.branch, team=payload.team)
         enforce_conditionals(status=payload.status,
@@ -146,14 +209,32 @@ def create_session(payload: SessionCreate, db: Session = Depends(get_db)):
         mode=payload.mode, status=payload.status, cancel_reason=payload.cancel_reason,
         comment=payload.comment
     )
-    db.add(s); db.commit(); db.refresh(s)
+    # 슬롯 점유 행을 같은 트랜잭션에 기록: 동시 예약이 사전 검사를 함께 통과해도 여기서 한쪽만 성공
+    try:
+        db.add(s); db.flush()
+        slot_claims.claim(db, [(s.id, s.counselor_id, s.date, s.start_time, s.end_time)])
+        rollup.apply(db, rollup.changed(new=[rollup.session_dims(s)]))
+        bump(db, SESSIONS); db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise slot_claims.conflict_error(db, e, payload.counselor_id, payload.date,
+                                         payload.start_time, payload.end_time)
+    db.refresh(s)
+    hub.publish("created", [session_row(s)])
     return {"id": s.id}
 
-@router.put("/{session_id}")
-def update_session(session_id: int, payload: SessionUpdate, db: Session = Depends(get_db)):
+@router.post("/")
+@query_budget(15)
+async def create_session(payload: SessionCreate, db: DB = Depends(get_async_db)):
+    return await db.write(_create_session, payload)
+
+def _update_session(db: Session, session_id: int, payload: SessionUpdate):
     s = db.query(Sess).get(session_id)
     if not s:
         raise HTTPException(404, "세션을 찾을 수 없습니다.")
+    old_slot = (s.date, s.start_time, s.end_time, s.counselor_id)
+    old_dims = rollup.session_dims(s)
+    prev = {"date": s.date.isoformat(), "counselor_id": s.counselor_id, "branch": s.branch, "team": s.team}
 
     new = {
         "date": payload.date or s.date,
@@ -180,12 +261,14 @@ def update_session(session_id: int, payload: SessionUpdate, db: Session = Depend
     if new["end_time"] <= new["start_time"]:
         raise HTTPException(400, "종료 시각은 시작 시각보다 커야 합니다.")
 
-    cons = db.query(Counselor).filter(Counselor.id == new["counselor_id"]).first()
+    registry.sync(db)
+    cons = registry.counselor(db, new["counselor_id"])
     if not cons:
         raise HTTPException(404, "상담사를 찾을 수 없습니다.")
     if check_overlap(db, counselor_id=new["counselor_id"], date=new["date"],
                      start_time=new["start_time"], end_time=new["end_time"], ignore_id=session_id):
-        raise HTTPException(400, "동일 상담사의 시간이 겹칩니다.")
+        raise slot_claims.overlap_error(db, new["counselor_id"], new["date"], new["start_time"], new["end_time"],
+                                        session_id)
     try:
         validate_branch_team(db, branch=new["branch"], team=new["team"])
         enforce_conditionals(status=new["status"],
@@ -202,42 +285,110 @@ def update_session(session_id: int, payload: SessionUpdate, db: Session = Depend
     s.student_name = new["student_name"]
     s.requested_subject_id = new["requested_subject_id"]; s.registered_subject_id = new["registered_subject_id"]
     s.mode = new["mode"]; s.status = new["status"]; s.cancel_reason = new["cancel_reason"]; s.comment = new["comment"]
-    db.commit(); db.refresh(s)
+    moved = (s.date, s.start_time, s.end_time, s.counselor_id) != old_slot
+    try:
+        if moved:
+            slot_claims.release(db, session_id)
+            slot_claims.claim(db, [(session_id, new["counselor_id"], new["date"], new["start_time"], new["end_time"])])
+        rollup.apply(db, rollup.changed([old_dims], [rollup.session_dims(s)]))
+        bump(db, SESSIONS); db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise slot_claims.conflict_error(db, e, new["counselor_id"], new["date"],
+                                         new["start_time"], new["end_time"], session_id)
+    db.refresh(s)
+    row = session_row(s)
+    hub.publish("updated", [row if all(row[k] == v for k, v in prev.items()) else {**row, "prev": prev}])
     return {"ok": True}
 
-@router.delete("/{session_id}")
-def delete_session(session_id: int, db: Session = Depends(get_db)):
+@router.put("/{session_id}")
+@query_budget(15)
+async def update_session(session_id: int, payload: SessionUpdate, db: DB = Depends(get_async_db)):
+    return await db.write(_update_session, session_id, payload)
+
+def _delete_session(db: Session, session_id: int):
     s = db.query(Sess).get(session_id)
     if not s:
         raise HTTPException(404, "세션을 찾을 수 없습니다.")
-    db.delete(s); db.commit()
+    slot_claims.release(db, session_id)
+    rollup.apply(db, rollup.changed(old=[rollup.session_dims(s)]))
+    session_changes.prune(db)
+    gone = {"id": session_id, "date": s.date.isoformat(), "counselor_id": s.counselor_id,
+            "branch": s.branch, "team": s.team}
+    db.delete(s); bump(db, SESSIONS); db.commit()
+    hub.publish("deleted", [gone])
     return {"ok": True}
 
-@router.post("/batch/update-status")
-def batch_update_status(payload: BatchUpdatePayload, db: Session = Depends(get_db)):
+@router.delete("/{session_id}")
+@query_budget(15)
+async def delete_session(session_id: int, db: DB = Depends(get_async_db)):
+    return await db.write(_delete_session, session_id)
+
+def _batch_update_status(db: Session, payload: BatchUpdatePayload):
     if not payload.ids:
         raise HTTPException(400, "ids가 비어 있습니다.")
+    if all(v is None for v in (payload.status, payload.cancel_reason, payload.comment, payload.registered_subject_id)):
+        raise HTTPException(400, "변경할 값이 없습니다.")
     if payload.status and payload.status not in STATUSES:
         raise HTTPException(400, "유효하지 않은 상태입니다.")
-    updated = 0
-    for sid in payload.ids:
-        s = db.query(Sess).get(sid)
-        if not s:
+
+    ids = list(dict.fromkeys(payload.ids))
+    targets = {}
+    for chunk in chunked(ids):
+        for row in db.query(Sess.id, Sess.date, Sess.counselor_id, Sess.branch, Sess.team, Sess.mode,
+                            Sess.status, Sess.requested_subject_id, Sess.registered_subject_id,
+                            Sess.cancel_reason).filter(Sess.id.in_(chunk)):
+            targets[row.id] = row
+
+    # 메모리 검증: 참조 과목은 한 번에 확인해 두고 registry 스냅샷에서 판정
+    registry.resolve(db, "subjects", [payload.registered_subject_id, *(t.requested_subject_id for t in targets.values()),
+                                      *(t.registered_subject_id for t in targets.values())])
+    valid, skipped, invalid = [], [], []
+    old_dims, new_dims = [], []
+    for sid in ids:
+        s = targets.get(sid)
+        if s is None:
+            skipped.append({"id": sid, "reason": "세션을 찾을 수 없습니다."})
             continue
-        new_status = payload.status or s.status
+        registered_subject_id = payload.registered_subject_id if payload.registered_subject_id is not None else s.registered_subject_id
         try:
-            enforce_conditionals(status=new_status,
-                                 registered_subject_id=(payload.registered_subject_id if payload.registered_subject_id is not None else s.registered_subject_id),
+            enforce_conditionals(status=payload.status or s.status,
+                                 registered_subject_id=registered_subject_id,
                                  cancel_reason=(payload.cancel_reason if payload.cancel_reason is not None else s.cancel_reason))
             branch_subject_guard(db, branch=s.branch,
                                  requested_subject_id=s.requested_subject_id,
-                                 registered_subject_id=(payload.registered_subject_id if payload.registered_subject_id is not None else s.registered_subject_id))
+                                 registered_subject_id=registered_subject_id)
         except ValueError as e:
-            raise HTTPException(400, f"id={sid}: {str(e)}")
-        if payload.status is not None: s.status = payload.status
-        if payload.cancel_reason is not None: s.cancel_reason = payload.cancel_reason or None
-        if payload.comment is not None: s.comment = payload.comment or None
-        if payload.registered_subject_id is not None: s.registered_subject_id = payload.registered_subject_id
-        updated += 1
-    db.commit()
-    return {"updated": updated}
+            invalid.append({"id": sid, "error": str(e)})
+            continue
+        valid.append(sid)
+        old_dims.append(rollup.session_dims(s))
+        new_dims.append(rollup.dims_of(s.date, s.branch, s.team, s.requested_subject_id, registered_subject_id,
+                                       s.mode, payload.status or s.status))
+
+    # 변경 값은 모든 대상에 동일 → 값 집합 하나당 UPDATE 한 번(IN 분할), 단일 트랜잭션
+    values = {}
+    if payload.status is not None: values[Sess.status] = payload.status
+    if payload.cancel_reason is not None: values[Sess.cancel_reason] = payload.cancel_reason or None
+    if payload.comment is not None: values[Sess.comment] = payload.comment or None
+    if payload.registered_subject_id is not None: values[Sess.registered_subject_id] = payload.registered_subject_id
+    if valid and values:
+        try:
+            for chunk in chunked(valid):
+                db.query(Sess).filter(Sess.id.in_(chunk)).update(values, synchronize_session=False)
+            rollup.apply(db, rollup.changed(old_dims, new_dims))
+            bump(db, SESSIONS)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        changes = {k.key: v for k, v in values.items()}
+        hub.publish("batch", [{"id": t.id, "date": t.date.isoformat(), "counselor_id": t.counselor_id,
+                               "branch": t.branch, "team": t.team, **changes}
+                              for t in (targets[sid] for sid in valid)])
+    return {"updated": len(valid), "skipped": skipped, "invalid": invalid}
+
+@router.post("/batch/update-status")
+@query_budget(40, max_repeats=20)  # IN 분할(500개) 단위로 조회·UPDATE 가 늘어남
+async def batch_update_status(payload: BatchUpdatePayload, db: DB = Depends(get_async_db)):
+    return await db.write(_batch_update_status, payload)
@@ -1,11 +1,17 @@
 # app/routers/stats.py
+from collections import defaultdict
 from datetime import date, timedelta
 from typing import Optional, Dict
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from app.db import get_db
-from app.models import Session as Sess, DailyDB, DailyDBTeam, Branch, Subject
+from app.db import DB, get_async_read_db
+from app.models import SessionDailyAgg as Agg, DailyDB, DailyDBTeam
+from app.services.registry import registry
+from app.services.dates import month_end
+from app.services.stats_cache import stats_cache
+from app.services.versions import snapshot, SESSIONS, DAILY_DB, META
+from app.services.query_guard import query_budget
 
 router = APIRouter()
 COUNSELING_STATUSES = {"DONE", "REGISTERED", "NOT_REGISTERED"}
@@ -16,37 +22,188 @@ def _range(from_: Optional[date], to_: Optional[date]):
         from_ = to_ - timedelta(days=30)
     return from_, to_
 
+def _scan_sessions(db: Session, from_date: date, to_date: date, branch: Optional[str], team: Optional[str]):
+    # 원본 세션 대신 일별 롤업을 합산 (과목 없음은 0 으로 저장 → None 으로 되돌림)
+    q = db.query(
+        Agg.branch, Agg.team, Agg.requested_subject_id, Agg.registered_subject_id, Agg.status,
+        func.sum(Agg.count)
+    ).filter(Agg.date >= from_date, Agg.date <= to_date)
+    if branch: q = q.filter(Agg.branch == branch)
+    if team: q = q.filter(Agg.team == team)
+    rows = q.group_by(
+        Agg.branch, Agg.team, Agg.requested_subject_id, Agg.registered_subject_id, Agg.status
+    ).all()
+    return [(b, t, req or None, reg or None, st or None, cnt) for b, t, req, reg, st, cnt in rows]
+
+def _cached(db: Session, name: str, from_date: date, to_date: date, branch: Optional[str], team: Optional[str], compute):
+    # 키: 정규화된 (기간, 지점, 팀) + 통계에 영향을 주는 데이터 버전
+    # 라벨·상담사는 registry 스냅샷에서 읽으므로, META 는 계산에 쓸 스냅샷의 버전으로 키를 잡는다
+    # (다른 워커의 변경을 아직 못 본 스냅샷이면 먼저 재적재 → 옛 라벨이 새 버전 키로 캐시되지 않음)
+    versions = snapshot(db)
+    meta_version = registry.at_least(db, versions.get(META, 0)).version
+    key = (name, from_date, to_date, branch or None, team or None,
+           versions.get(SESSIONS, 0), versions.get(DAILY_DB, 0), meta_version)
+    found, value = stats_cache.get(key)
+    if found:
+        return value
+    value = compute(db, from_date, to_date, branch or None, team or None)
+    stats_cache.put(key, value)
+    return value
+
+def _cached_overview(db: Session, from_date: Optional[date], to_date: Optional[date], branch: Optional[str], team: Optional[str]):
+    from_date, to_date = _range(from_date, to_date)
+    return _cached(db, "overview", from_date, to_date, branch, team, _overview)
+
 @router.get("/overview")
-def overview(
-    db: Session = Depends(get_db),
+@query_budget(10)
+async def overview(
+    db: DB = Depends(get_async_read_db),
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     branch: Optional[str] = Query(None),
     team: Optional[str] = Query(None)
 ):
+    return await db.run(_cached_overview, from_date, to_date, branch, team)
+
+MAX_BUCKETS = 400
+
+def _bucket_expr(col, granularity: str):
+    # SQLite 날짜 함수로 구간 키 계산: 일=YYYY-MM-DD, 주=해당 주 월요일, 월=YYYY-MM
+    if granularity == "month":
+        return func.strftime("%Y-%m", col)
+    if granularity == "week":
+        return func.date(col, "-6 days", "weekday 1")
+    return func.date(col)
+
+def _buckets(from_date: date, to_date: date, granularity: str):
+    """[(키, 구간 시작, 구간 끝)] — 조회 기간으로 잘라서 빈 구간까지 모두 생성."""
+    out = []
+    if granularity == "month":
+        d = from_date.replace(day=1)
+        while d <= to_date:
+            end = month_end(d)
+            out.append((d.strftime("%Y-%m"), max(d, from_date), min(end, to_date)))
+            d = end + timedelta(days=1)
+    else:
+        step = 7 if granularity == "week" else 1
+        d = from_date - timedelta(days=from_date.weekday()) if step == 7 else from_date
+        while d <= to_date:
+            out.append((d.isoformat(), max(d, from_date), min(d + timedelta(days=step - 1), to_date)))
+            d += timedelta(days=step)
+    return out
+
+def _timeseries(db: Session, from_date: date, to_date: date, branch: Optional[str], team: Optional[str],
+                granularity: str):
+    meta = registry.get(db)
+    branches = [b for b in meta.branches.values() if b.active]
+    branch_codes = [b.code for b in branches]
+    label_of_branch = {b.code: b.label_ko for b in branches}
+    if branch:
+        branch_codes = [branch] if branch in branch_codes else []
+
+    # 원본 테이블마다 (구간, 지점) 단위 GROUP BY 한 번씩
+    bucket = _bucket_expr(Agg.date, granularity)
+    q = db.query(bucket, Agg.branch, Agg.status, func.sum(Agg.count)).filter(
+        Agg.date >= from_date, Agg.date <= to_date, Agg.status.in_(COUNSELING_STATUSES))
+    if branch: q = q.filter(Agg.branch == branch)
+    if team: q = q.filter(Agg.team == team)
+    counseling_map: Dict[tuple, int] = defaultdict(int)
+    registered_map: Dict[tuple, int] = defaultdict(int)
+    for k, b, st, cnt in q.group_by(bucket, Agg.branch, Agg.status):
+        counseling_map[(k, b)] += cnt
+        if st == "REGISTERED":
+            registered_map[(k, b)] += cnt
+
+    bucket = _bucket_expr(DailyDB.date, granularity)
+    q = db.query(bucket, DailyDB.branch, func.coalesce(func.sum(DailyDB.db_count), 0)).filter(
+        DailyDB.date >= from_date, DailyDB.date <= to_date)
+    if branch: q = q.filter(DailyDB.branch == branch)
+    branch_db_map = {(k, b): int(n or 0) for k, b, n in q.group_by(bucket, DailyDB.branch)}
+
+    # 분모(DB 수): 팀 필터가 있으면 구간별 팀 DB 합계 (overview 와 동일 규칙)
+    team_db_map = {}
+    if team:
+        bucket = _bucket_expr(DailyDBTeam.date, granularity)
+        team_db_map = {k: int(n or 0) for k, n in db.query(bucket, func.coalesce(func.sum(DailyDBTeam.db_count), 0)).filter(
+            DailyDBTeam.date >= from_date, DailyDBTeam.date <= to_date, DailyDBTeam.team == team
+        ).group_by(bucket)}
+
+    def point(k, start, end, counseling, registered, total_db):
+        return {
+            "bucket": k, "from": start.isoformat(), "to": end.isoformat(),
+            "counseling": counseling, "registered": registered, "total_db": total_db,
+            "registration_rate": (registered / counseling) if counseling > 0 else None,
+            "counseling_rate": (counseling / total_db) if total_db > 0 else None
+        }
+
+    buckets = _buckets(from_date, to_date, granularity)
+    series = {code: [] for code in branch_codes}
+    total = []
+    for k, start, end in buckets:
+        team_db = team_db_map.get(k, 0)
+        sum_c = sum_r = sum_db = 0
+        for code in branch_codes:
+            c, r = counseling_map.get((k, code), 0), registered_map.get((k, code), 0)
+            total_db = team_db if (team and team_db > 0) else branch_db_map.get((k, code), 0)
+            series[code].append(point(k, start, end, c, r, total_db))
+            sum_c += c; sum_r += r; sum_db += total_db
+        total.append(point(k, start, end, sum_c, sum_r, team_db if team else sum_db))
+
+    return {
+        "range": {"from": from_date.isoformat(), "to": to_date.isoformat()},
+        "granularity": granularity,
+        "total": total,
+        "branches": [{"branch": code, "branch_label": label_of_branch.get(code, code), "points": series[code]}
+                     for code in branch_codes]
+    }
+
+def _cached_timeseries(db: Session, from_date: Optional[date], to_date: Optional[date], branch: Optional[str],
+                       team: Optional[str], granularity: str):
     from_date, to_date = _range(from_date, to_date)
+    if len(_buckets(from_date, to_date, granularity)) > MAX_BUCKETS:
+        raise HTTPException(400, f"구간 수는 {MAX_BUCKETS}개 이하여야 합니다. 기간을 줄이거나 단위를 키워 주세요.")
+    return _cached(db, f"timeseries:{granularity}", from_date, to_date, branch, team,
+                   lambda db, *args: _timeseries(db, *args, granularity))
+
+@router.get("/timeseries")
+@query_budget(10)
+async def timeseries(
+    db: DB = Depends(get_async_read_db),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    branch: Optional[str] = Query(None),
+    team: Optional[str] = Query(None),
+    granularity: str = Query("day", pattern="^(day|week|month)$")
+):
+    return await db.run(_cached_timeseries, from_date, to_date, branch, team, granularity)
 
+@router.get("/cache")
+def cache_stats():
+    return stats_cache.stats()
+
+def _overview(db: Session, from_date: date, to_date: date, branch: Optional[str], team: Optional[str]):
     # 지점 라벨 맵
-    branches = db.query(Branch).filter(Branch.active == True).all()
+    meta = registry.get(db)
+    branches = [b for b in meta.branches.values() if b.active]
     branch_codes = [b.code for b in branches]
     label_of_branch = {b.code: b.label_ko for b in branches}
     if branch:
         branch_codes = [branch] if branch in branch_codes else []
 
-    # 지점별 상담/등록
-    counseling_q = db.query(Sess.branch, func.count(Sess.id)).filter(
-        Sess.date >= from_date, Sess.date <= to_date, Sess.status.in_(list(COUNSELING_STATUSES))
-    )
-    if branch: counseling_q = counseling_q.filter(Sess.branch == branch)
-    if team: counseling_q = counseling_q.filter(Sess.team == team)
-    counseling_map = {r[0]: r[1] for r in counseling_q.group_by(Sess.branch).all()}
-
-    registered_q = db.query(Sess.branch, func.count(Sess.id)).filter(
-        Sess.date >= from_date, Sess.date <= to_date, Sess.status == "REGISTERED"
-    )
-    if branch: registered_q = registered_q.filter(Sess.branch == branch)
-    if team: registered_q = registered_q.filter(Sess.team == team)
-    registered_map = {r[0]: r[1] for r in registered_q.group_by(Sess.branch).all()}
+    # 단일 스캔: (지점, 팀, 신청과목, 등록과목, 상태)별 건수 → 이후 모든 지표는 파이썬에서 파생
+    counseling_map: Dict[str, int] = defaultdict(int)
+    registered_map: Dict[str, int] = defaultdict(int)
+    req_c_map: Dict[int, int] = defaultdict(int)
+    req_r_map: Dict[int, int] = defaultdict(int)
+    reg_r_map: Dict[int, int] = defaultdict(int)
+    for b, _t, req_sid, reg_sid, st, cnt in _scan_sessions(db, from_date, to_date, branch, team):
+        if st in COUNSELING_STATUSES:
+            counseling_map[b] += cnt
+            if req_sid is not None: req_c_map[req_sid] += cnt
+        if st == "REGISTERED":
+            registered_map[b] += cnt
+            if req_sid is not None: req_r_map[req_sid] += cnt
+            if reg_sid is not None: reg_r_map[reg_sid] += cnt
 
     # 분모(DB 수): 팀 필터 유/무
     team_db_sum = None
@@ -80,32 +237,12 @@ def overview(
         })
 
     # 과목별 등록률(신청 기준)
-    subj_q = db.query(Subject).filter(Subject.active == True)
-    if branch: subj_q = subj_q.filter(Subject.branch == branch)
-    subjects = subj_q.all()
+    subjects = [s for s in meta.subjects.values() if s.active and (not branch or s.branch == branch)]
     subject_ids = [s.id for s in subjects]
     subj_name = {s.id: s.name for s in subjects}
     subj_branch = {s.id: s.branch for s in subjects}
     subj_branch_label = {s.id: label_of_branch.get(s.branch, s.branch) for s in subjects}
 
-    req_c_rows = db.query(Sess.requested_subject_id, func.count(Sess.id)).filter(
-        Sess.date >= from_date, Sess.date <= to_date,
-        Sess.status.in_(list(COUNSELING_STATUSES)),
-        Sess.requested_subject_id.isnot(None)
-    )
-    if branch: req_c_rows = req_c_rows.filter(Sess.branch == branch)
-    if team: req_c_rows = req_c_rows.filter(Sess.team == team)
-    req_c_map = {r[0]: r[1] for r in req_c_rows.group_by(Sess.requested_subject_id).all() if r[0] in subject_ids}
-
-    req_r_rows = db.query(Sess.requested_subject_id, func.count(Sess.id)).filter(
-        Sess.date >= from_date, Sess.date <= to_date,
-        Sess.status == "REGISTERED",
-        Sess.requested_subject_id.isnot(None)
-    )
-    if branch: req_r_rows = req_r_rows.filter(Sess.branch == branch)
-    if team: req_r_rows = req_r_rows.filter(Sess.team == team)
-    req_r_map = {r[0]: r[1] for r in req_r_rows.group_by(Sess.requested_subject_id).all() if r[0] in subject_ids}
-
     subject_stats_request = []
     for sid in subject_ids:
         c = req_c_map.get(sid, 0)
@@ -121,15 +258,6 @@ def overview(
         })
 
     # 과목별 등록률(등록 기준 보조)
-    reg_r_rows = db.query(Sess.registered_subject_id, func.count(Sess.id)).filter(
-        Sess.date >= from_date, Sess.date <= to_date,
-        Sess.status == "REGISTERED",
-        Sess.registered_subject_id.isnot(None)
-    )
-    if branch: reg_r_rows = reg_r_rows.filter(Sess.branch == branch)
-    if team: reg_r_rows = reg_r_rows.filter(Sess.team == team)
-    reg_r_map = {r[0]: r[1] for r in reg_r_rows.group_by(Sess.registered_subject_id).all() if r[0] in subject_ids}
-
     subject_stats_registered = []
     for sid in subject_ids:
         c = req_c_map.get(sid, 0)  # 분모: 신청 과목으로 상담 수
@@ -8,9 +8,11 @@ from fastapi.templating import Jinja2Templates
 from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
-from app.db import get_db
-from app.models import Session as Sess, Counselor, Subject
+from app.db import DB, get_async_read_db
+from app.models import Session as Sess
+from app.services.registry import registry
 from app.services.labels import branch_label, team_label, mode_label
+from app.services.query_guard import query_budget
 
 router = APIRouter()
 
@@ -19,43 +21,30 @@ REPO_ROOT = APP_DIR.parent
 templates = Jinja2Templates(directory=str(APP_DIR / "templates"))
 
 @router.get("/", response_class=HTMLResponse)
-def root(request: Request):
+async def root(request: Request):
     return RedirectResponse(url="/dashboard")
 
 @router.get("/dashboard", response_class=HTMLResponse)
-def dashboard(request: Request):
-    return templates.TemplateResponse("dashboard.html", {"request": request})
+async def dashboard(request: Request):
+    return templates.TemplateResponse(request, "dashboard.html")
 
 @router.get("/calendar/weekly", response_class=HTMLResponse)
-def calendar_week(request: Request):
-    return templates.TemplateResponse("calendar_week.html", {"request": request})
+async def calendar_week(request: Request):
+    return templates.TemplateResponse(request, "calendar_week.html")
 
 @router.get("/calendar/day", response_class=HTMLResponse)
-def calendar_day(request: Request):
-    return templates.TemplateResponse("day_timeline.html", {"request": request})
+async def calendar_day(request: Request):
+    return templates.TemplateResponse(request, "day_timeline.html")
 
 @router.get("/calendar/month", response_class=HTMLResponse)
-def calendar_month(request: Request):
-    return templates.TemplateResponse("calendar_month.html", {"request": request})
+async def calendar_month(request: Request):
+    return templates.TemplateResponse(request, "calendar_month.html")
 
 @router.get("/results", response_class=HTMLResponse)
-def results_table(request: Request):
-    return templates.TemplateResponse("results_table.html", {"request": request})
-
-@router.get("/mismatch", response_class=HTMLResponse)
-def mismatch_page(
-    request: Request,
-    db: Session = Depends(get_db),
-    from_date: date | None = Query(None),
-    to_date: date | None = Query(None),
-    branch: str | None = Query(None),
-    team: str | None = Query(None),
-    mode: str | None = Query(None),
-):
-    if not from_date or not to_date:
-        to_date = date.today()
-        from_date = to_date - timedelta(days=30)
+async def results_table(request: Request):
+    return templates.TemplateResponse(request, "results_table.html")
 
+def _mismatch_items(db: Session, from_date: date, to_date: date, branch: str | None, team: str | None, mode: str | None):
     q = db.query(Sess).filter(
         and_(
             Sess.date >= from_date,
@@ -72,14 +61,16 @@ def mismatch_page(
 
     rows = q.order_by(Sess.date.desc(), Sess.start_time).all()
 
+    meta = registry.get(db)
+
     def subj_name(subj_id: int | None) -> str:
         if not subj_id: return ""
-        s = db.query(Subject).filter(Subject.id == subj_id).first()
+        s = meta.subjects.get(subj_id)
         return s.name if s else ""
 
     items = []
     for s in rows:
-        counselor = db.query(Counselor).get(s.counselor_id) if s.counselor_id else None
+        counselor = meta.counselors.get(s.counselor_id) if s.counselor_id else None
         items.append({
             "date": s.date.isoformat(),
             "time": f"{s.start_time.strftime('%H:%M')}~{s.end_time.strftime('%H:%M')}",
@@ -91,22 +82,38 @@ def mismatch_page(
             "mode": mode_label(s.mode),
             "comment": s.comment or ""
         })
+    return items
+
+@router.get("/mismatch", response_class=HTMLResponse)
+@query_budget(8)
+async def mismatch_page(
+    request: Request,
+    db: DB = Depends(get_async_read_db),
+    from_date: date | None = Query(None),
+    to_date: date | None = Query(None),
+    branch: str | None = Query(None),
+    team: str | None = Query(None),
+    mode: str | None = Query(None),
+):
+    if not from_date or not to_date:
+        to_date = date.today()
+        from_date = to_date - timedelta(days=30)
 
-    return templates.TemplateResponse("mismatch.html", {
-        "request": request,
+    items = await db.run(_mismatch_items, from_date, to_date, branch, team, mode)
+    return templates.TemplateResponse(request, "mismatch.html", {
         "from_date": from_date.isoformat(),
         "to_date": to_date.isoformat(),
         "items": items
     })
 
 @router.get("/admin/meta", response_class=HTMLResponse)
-def admin_meta(request: Request):
-    return templates.TemplateResponse("admin_meta.html", {"request": request})
+async def admin_meta(request: Request):
+    return templates.TemplateResponse(request, "admin_meta.html")
 
 @router.get("/admin/db", response_class=HTMLResponse)
-def admin_db(request: Request):
-    return templates.TemplateResponse("admin_db.html", {"request": request})
+async def admin_db(request: Request):
+    return templates.TemplateResponse(request, "admin_db.html")
 
 @router.get("/my/daily", response_class=HTMLResponse)
-def my_daily(request: Request):
-    return templates.TemplateResponse("my_daily.html", {"request": request})
+async def my_daily(request: Request):
+    return templates.TemplateResponse(request, "my_daily.html")
@@ -0,0 +1,166 @@
+# 30분 슬롯 비트맵 가용성 인덱스
+# - (상담사, 일자)마다 48비트 정수: 비트 i = [i*30분, (i+1)*30분) 점유
+# - 메모리에는 오늘 기준 창(WINDOW_PAST ~ WINDOW_FUTURE 일)만 둔다. 창 밖 날짜는 조회 때 그 기간만 DB 에서 읽음
+# - 다른 요청·워커의 쓰기는 세션 변경 로그(session_changes) 커서 이후의 행만 다시 읽어 반영
+# - 날짜가 바뀌면 다음 조회 때 창을 다시 적재
+import threading
+from datetime import date, time, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db import chunked
+from app.models import Session as Sess, SessionChange
+
+SLOT_MIN = 30
+SLOTS = 24 * 60 // SLOT_MIN
+FULL = (1 << SLOTS) - 1
+
+Key = Tuple[int, date]
+
+def slot_of(t: time) -> int:
+    return (t.hour * 60 + t.minute) // SLOT_MIN
+
+def slot_mask(start: time, end: time) -> int:
+    s, e = slot_of(start), slot_of(end)
+    return ((1 << e) - 1) ^ ((1 << s) - 1)
+
+def slot_time(i: int) -> str:
+    m = i * SLOT_MIN
+    return f"{m // 60:02d}:{m % 60:02d}" if i < SLOTS else "24:00"
+
+def free_ranges(bits: int, window: int) -> List[Tuple[int, int]]:
+    """window 안에서 비어 있는 연속 슬롯 구간 [(시작, 끝)] (슬롯 번호)."""
+    free = ~bits & window
+    out, i = [], 0
+    while free >> i:
+        if (free >> i) & 1:
+            j = i
+            while (free >> j) & 1:
+                j += 1
+            out.append((i, j))
+            i = j
+        else:
+            i += 1
+    return out
+
+WINDOW_PAST = 31
+WINDOW_FUTURE = 92      # 빈 시간 조회 최대 기간과 같게
+RELOAD_AFTER = 20_000   # 밀린 변경이 이보다 많으면 증분 대신 창 재적재
+
+def _load(db: Session, lo: date, hi: date, ids: Optional[List[int]] = None):
+    """[lo, hi] 기간 세션 (ids 지정 시 그 세션만) → (bits, owners, where)."""
+    q = db.query(Sess.id, Sess.counselor_id, Sess.date, Sess.start_time, Sess.end_time).filter(
+        Sess.date >= lo, Sess.date <= hi)
+    rows = q.all() if ids is None else [r for chunk in chunked(ids) for r in q.filter(Sess.id.in_(chunk))]
+    bits, owners, where = {}, {}, {}
+    for sid, cid, d, st, et in rows:
+        key, mask = (cid, d), slot_mask(st, et)
+        owners.setdefault(key, {})[sid] = mask
+        bits[key] = bits.get(key, 0) | mask
+        where[sid] = key
+    return bits, owners, where
+
+class SlotBitmap:
+    def __init__(self, bits=None, owners=None, where=None):
+        self._bits: Dict[Key, int] = bits or {}
+        self._owners: Dict[Key, Dict[int, int]] = owners or {}   # key → {session_id: mask}
+        self._where: Dict[int, Key] = where or {}
+
+    def bits(self, counselor_id: int, d: date, ignore_id: Optional[int] = None) -> int:
+        key = (counselor_id, d)
+        if ignore_id is None or ignore_id not in self._owners.get(key, {}):
+            return self._bits.get(key, 0)
+        bits = 0
+        for sid, m in self._owners[key].items():
+            if sid != ignore_id:
+                bits |= m
+        return bits
+
+    def overlaps(self, counselor_id: int, d: date, start: time, end: time, ignore_id: Optional[int] = None) -> bool:
+        return bool(self.bits(counselor_id, d, ignore_id) & slot_mask(start, end))
+
+    def day_bits(self, counselor_ids: List[int], d: date) -> List[int]:
+        return [self._bits.get((cid, d), 0) for cid in counselor_ids]
+
+class AvailabilityIndex(SlotBitmap):
+    def __init__(self):
+        super().__init__()
+        self._today: Optional[date] = None
+        self._cursor = 0   # 반영한 마지막 변경 로그 id
+        self._lock = threading.Lock()
+
+    def _window(self, today: date) -> Tuple[date, date]:
+        return today - timedelta(days=WINDOW_PAST), today + timedelta(days=WINDOW_FUTURE)
+
+    # --- 재적재 / 최신성 ---
+    def rebuild(self, db: Session):
+        # 커서를 먼저 읽는다: 그 뒤의 변경은 다음 sync 가 다시 반영 (행을 다시 읽으므로 중복 반영해도 같음)
+        today = date.today()
+        cursor = db.query(func.max(SessionChange.id)).scalar() or 0
+        bits, owners, where = _load(db, *self._window(today))
+        with self._lock:
+            self._bits, self._owners, self._where = bits, owners, where
+            self._today, self._cursor = today, cursor
+
+    def invalidate(self):
+        self._today = None
+
+    def sync(self, db: Session):
+        """변경 로그 커서 이후 바뀐 세션만 다시 읽어 반영 (변경이 없으면 쿼리 1개).
+        창을 매일 다시 적재하므로 커서가 툼스톤 보존 기간(30일)보다 오래될 일은 없다."""
+        if self._today is None:
+            return
+        start = self._cursor
+        log = db.query(SessionChange.id, SessionChange.session_id).filter(
+            SessionChange.id > start).order_by(SessionChange.id).limit(RELOAD_AFTER + 1).all()
+        if not log:
+            return
+        if len(log) > RELOAD_AFTER:
+            return self.rebuild(db)
+        ids = list({sid for _, sid in log})
+        _, owners, where = _load(db, *self._window(self._today), ids=ids)
+        with self._lock:
+            if self._cursor != start:   # 다른 스레드가 먼저 반영
+                return
+            for sid in ids:
+                self._remove(sid)
+            for sid, key in where.items():
+                self._add(sid, key, owners[key][sid])
+            self._cursor = log[-1].id
+
+    def fresh(self, db: Session) -> "AvailabilityIndex":
+        if self._today != date.today():
+            self.rebuild(db)
+        else:
+            self.sync(db)
+        return self
+
+    def view(self, db: Session, lo: date, hi: date) -> SlotBitmap:
+        """[lo, hi] 조회용 비트맵: 창 안이면 인덱스, 창 밖이 섞이면 그 기간만 DB 에서 적재."""
+        idx = self.fresh(db)
+        w_lo, w_hi = self._window(idx._today)
+        if w_lo <= lo and hi <= w_hi:
+            return idx
+        return SlotBitmap(*_load(db, lo, hi))
+
+    # --- 증분 반영 (self._lock 안에서) ---
+    def _add(self, sid: int, key: Key, mask: int):
+        self._owners.setdefault(key, {})[sid] = mask
+        self._bits[key] = self._bits.get(key, 0) | mask
+        self._where[sid] = key
+
+    def _remove(self, sid: int):
+        key = self._where.pop(sid, None)
+        if key is None:
+            return
+        owners = self._owners.get(key, {})
+        owners.pop(sid, None)
+        bits = 0
+        for m in owners.values():
+            bits |= m
+        if bits:
+            self._bits[key] = bits
+        else:
+            self._bits.pop(key, None); self._owners.pop(key, None)
+
+availability = AvailabilityIndex()
@@ -0,0 +1,18 @@
+# 불투명 페이지 커서 공용: JSON 배열 → URL-safe base64 (패딩 제거)
+import base64
+import json
+from typing import Callable
+
+def encode(values: list) -> str:
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode(cursor: str, *types: Callable) -> tuple:
+    """자리 수가 types 와 같고 자리마다 변환이 되어야 한다. 아니면 ValueError("잘못된 커서입니다.")."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        return tuple(t(v) for t, v in zip(types, values))
+    except (ValueError, TypeError):
+        raise ValueError("잘못된 커서입니다.")
@@ -0,0 +1,103 @@
+# 일별 DB 일괄 저장: JSON 배열 또는 CSV/TSV 붙여넣기 → 단일 트랜잭션 INSERT ... ON CONFLICT DO UPDATE
+# 붙여넣기 형식
+#   세로형: date,branch,db_count   (머리글 생략 가능, 팀은 date,team,db_count)
+#   가로형: date,KH,ATENZ,...      (월 그리드를 그대로 복사, 빈 칸은 건너뜀)
+import csv
+import json
+from datetime import date
+from typing import Dict, List, Tuple
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.db import chunked
+
+MAX_ROWS = 5000
+_HEADER_DATE = {"date", "날짜"}
+
+Row = Tuple[date, str, int]
+
+def _count(v: str) -> int:
+    n = int(v.strip().replace(",", ""))
+    if n < 0:
+        raise ValueError
+    return n
+
+def parse_text(text: str, key_name: str) -> Tuple[List[Row], List[dict]]:
+    lines = [ln for ln in text.splitlines() if ln.strip()]
+    if not lines:
+        return [], []
+    delim = "\t" if "\t" in lines[0] else ","
+    records = list(csv.reader(lines, delimiter=delim))
+    head = [c.strip() for c in records[0]]
+    has_header = bool(head) and head[0].lower() in _HEADER_DATE
+    wide = None
+    if has_header:
+        records = records[1:]
+        if [h.lower() for h in head[1:]] != [key_name, "db_count"]:
+            wide = head[1:]   # 가로형: 머리글이 지점/팀 코드
+
+    rows, errors = [], []
+    for line, rec in enumerate(records, 2 if has_header else 1):
+        try:
+            d = date.fromisoformat(rec[0].strip())
+        except (ValueError, IndexError):
+            errors.append({"line": line, "error": "날짜 형식은 YYYY-MM-DD 이어야 합니다."})
+            continue
+        cells = list(zip(wide, rec[1:])) if wide else [(rec[1] if len(rec) > 1 else "", rec[2] if len(rec) > 2 else "")]
+        for code, value in cells:
+            code = code.strip()
+            if wide and not value.strip():
+                continue
+            try:
+                if not code:
+                    raise ValueError
+                rows.append((d, code, _count(value)))
+            except ValueError:
+                errors.append({"line": line, "error": f"'{code}' 의 DB 수가 올바르지 않습니다."})
+    return rows, errors
+
+def parse_body(body: bytes, content_type: str, key_name: str) -> Tuple[List[Row], List[dict]]:
+    """JSON 배열(또는 {"items": [...]}) / 그 외는 CSV·TSV 텍스트로 해석."""
+    if "json" in content_type:
+        try:
+            items = json.loads(body or b"[]")
+        except ValueError:
+            return [], [{"line": 0, "error": "JSON 형식이 올바르지 않습니다."}]
+        if isinstance(items, dict):
+            items = items.get("items", [])
+        rows, errors = [], []
+        for i, it in enumerate(items if isinstance(items, list) else [], 1):
+            try:
+                rows.append((date.fromisoformat(str(it["date"])), str(it[key_name]).strip(), _count(str(it["db_count"]))))
+            except (KeyError, TypeError, ValueError):
+                errors.append({"line": i, "error": f"date, {key_name}, db_count(0 이상 정수)가 필요합니다."})
+        return rows, errors
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return [], [{"line": 0, "error": "UTF-8 텍스트만 지원합니다."}]
+    return parse_text(text, key_name)
+
+def bulk_upsert(db: Session, model, key_name: str, rows: List[Row]) -> Dict[str, int]:
+    """(date, 코드, db_count) 목록 반영. 같은 키가 여러 번 오면 마지막 값. 커밋은 호출 측에서."""
+    latest = {(d, k): n for d, k, n in rows}
+    if not latest:
+        return {"total": 0, "inserted": 0, "updated": 0, "unchanged": 0}
+    key_col = getattr(model, key_name)
+    dates = [d for d, _ in latest]
+    existing = {(d, k): n for d, k, n in db.query(model.date, key_col, model.db_count).filter(
+        model.date >= min(dates), model.date <= max(dates), key_col.in_({k for _, k in latest}))}
+
+    changed = [(d, k, n) for (d, k), n in latest.items() if existing.get((d, k)) != n]
+    inserted = sum(1 for d, k, _ in changed if (d, k) not in existing)
+    if changed:
+        stmt = insert(model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[model.date, key_col],
+            set_={"db_count": stmt.excluded.db_count},
+            where=model.db_count != stmt.excluded.db_count,
+        )
+        values = [{"date": d, key_name: k, "db_count": n} for d, k, n in changed]
+        for chunk in chunked(values):
+            db.execute(stmt, chunk)
+    return {"total": len(latest), "inserted": inserted, "updated": len(changed) - inserted,
+            "unchanged": len(latest) - len(changed)}
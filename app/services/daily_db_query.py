@@ -0,0 +1,78 @@
+# 일별 DB(지점 DailyDB / 팀 DailyDBTeam) 공용 조회: 기간·키 필터, 키셋 페이지, 월 그리드(피벗)
+from datetime import date, timedelta
+from typing import List, Optional
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from app.services import cursors
+from app.services.dates import month_end
+
+MAX_GRID_DAYS = 92
+
+def encode_cursor(d: date, key: str) -> str:
+    return cursors.encode([d.isoformat(), key])
+
+def decode_cursor(cursor: str) -> tuple:
+    return cursors.decode(cursor, date.fromisoformat, str)
+
+def list_rows(db: Session, model, key_name: str, from_date: Optional[date], to_date: Optional[date],
+              key: Optional[str], limit: Optional[int], cursor: Optional[str]):
+    """정렬: 날짜 내림차순, 키 오름차순. limit/cursor 없으면 기존처럼 전체 목록.
+    date 는 date 객체 그대로 (FastJSONResponse 가 직렬화)."""
+    key_col = getattr(model, key_name)
+    q = db.query(model.id, model.date, key_col, model.db_count)
+    if from_date: q = q.filter(model.date >= from_date)
+    if to_date: q = q.filter(model.date <= to_date)
+    if key: q = q.filter(key_col == key)
+    if cursor:
+        d, k = decode_cursor(cursor)
+        q = q.filter(or_(model.date < d, and_(model.date == d, key_col > k)))
+    q = q.order_by(model.date.desc(), key_col)
+
+    def item(r):
+        return {"id": r[0], "date": r[1], key_name: r[2], "db_count": r[3]}
+
+    if limit is None and cursor is None:
+        return [item(r) for r in q.all()]
+    page_size = limit or 100
+    rows = q.limit(page_size + 1).all()
+    next_cursor = encode_cursor(rows[page_size - 1][1], rows[page_size - 1][2]) if len(rows) > page_size else None
+    return {"items": [item(r) for r in rows[:page_size]], "next_cursor": next_cursor}
+
+def grid(db: Session, model, key_name: str, from_date: date, to_date: date, columns: List[str],
+         labels: dict, key: Optional[str] = None):
+    """날짜 × 지점/팀 피벗. 값이 없는 칸은 null (입력 안 함과 0 을 구분)."""
+    key_col = getattr(model, key_name)
+    q = db.query(model.date, key_col, model.db_count).filter(model.date >= from_date, model.date <= to_date)
+    if key: q = q.filter(key_col == key)
+    cells = {(d, k): n for d, k, n in q}
+
+    cols = [key] if key else list(columns)
+    cols += sorted({k for _, k in cells} - set(cols))   # 비활성/미등록 코드의 기존 값도 표시
+    dates, d = [], from_date
+    while d <= to_date:
+        dates.append(d)
+        d += timedelta(days=1)
+    values = [[cells.get((d, c)) for c in cols] for d in dates]
+    return {
+        "from": from_date.isoformat(), "to": to_date.isoformat(),
+        "dates": [d.isoformat() for d in dates],
+        "columns": [{"code": c, "label": labels.get(c, c)} for c in cols],
+        "values": values,
+        "totals": [sum(row[i] or 0 for row in values) for i in range(len(cols))],
+    }
+
+def month_range(month: Optional[str], from_date: Optional[date], to_date: Optional[date]):
+    """month=YYYY-MM 또는 from/to (최대 MAX_GRID_DAYS 일). 기본은 이번 달."""
+    if month:
+        try:
+            y, m = (int(x) for x in month.split("-"))
+            from_date = date(y, m, 1)
+        except ValueError:
+            raise ValueError("월 형식은 YYYY-MM 이어야 합니다.")
+        to_date = month_end(from_date)
+    else:
+        from_date = from_date or date.today().replace(day=1)
+        to_date = to_date or month_end(from_date)
+    if to_date < from_date or (to_date - from_date).days >= MAX_GRID_DAYS:
+        raise ValueError(f"조회 기간은 {MAX_GRID_DAYS}일 이내여야 합니다.")
+    return from_date, to_date
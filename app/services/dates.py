@@ -0,0 +1,6 @@
+# 날짜 구간 공용
+from datetime import date, timedelta
+
+def month_end(d: date) -> date:
+    """d 가 속한 달의 말일."""
+    return (d.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
@@ -0,0 +1,86 @@
+# 세션 변경 이벤트 허브 (프로세스 내 asyncio pub/sub) — SSE 스트림이 구독
+# - 구독자마다 크기 제한 큐: 가득 차면(느린 클라이언트) 큐를 비우고 연결을 끊는다
+# - 다른 워커의 쓰기는 여기로 오지 않으므로 클라이언트는 변경 피드 폴링을 함께 유지
+import asyncio
+import itertools
+from typing import List, Optional, Set
+from app.config import settings
+
+def session_row(s, **extra) -> dict:
+    """이벤트용 축약 행 (달력 렌더링에 필요한 필드만)."""
+    return {
+        "id": s.id, "date": s.date.isoformat(),
+        "start_time": s.start_time.isoformat(), "end_time": s.end_time.isoformat(),
+        "counselor_id": s.counselor_id, "branch": s.branch, "team": s.team,
+        "status": s.status, "mode": s.mode, **extra,
+    }
+
+class Subscriber:
+    def __init__(self, branch: Optional[str], team: Optional[str], counselor_id: Optional[int], maxsize: int):
+        self.branch, self.team, self.counselor_id = branch, team, counselor_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = False
+
+    def _match_one(self, row: dict) -> bool:
+        return ((not self.branch or row.get("branch") == self.branch)
+                and (not self.team or row.get("team") == self.team)
+                and (not self.counselor_id or row.get("counselor_id") == self.counselor_id))
+
+    def matches(self, row: dict) -> bool:
+        # 이동(지점/팀/상담사 변경)된 행은 이전 위치 구독자에게도 전달 → 화면에서 빼도록
+        return self._match_one(row) or ("prev" in row and self._match_one(row["prev"]))
+
+class EventHub:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._subs: Set[Subscriber] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._seq = itertools.count(1)
+        self.dropped = 0
+
+    def subscribe(self, branch: Optional[str] = None, team: Optional[str] = None,
+                  counselor_id: Optional[int] = None) -> Subscriber:
+        self._loop = asyncio.get_running_loop()
+        sub = Subscriber(branch, team, counselor_id, self.maxsize)
+        self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        self._subs.discard(sub)
+
+    def publish(self, type_: str, rows: List[dict]):
+        """쓰기 커밋 후 호출. 이벤트 루프 밖(스레드풀)에서 불려도 안전."""
+        if not self._subs or not rows:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._dispatch(type_, rows)
+        elif self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._dispatch, type_, rows)
+
+    def _dispatch(self, type_: str, rows: List[dict]):
+        seq = next(self._seq)
+        for sub in list(self._subs):
+            matched = [r for r in rows if sub.matches(r)]
+            if not matched:
+                continue
+            try:
+                sub.queue.put_nowait((seq, type_, matched))
+            except asyncio.QueueFull:
+                self._drop(sub)
+
+    def _drop(self, sub: Subscriber):
+        self._subs.discard(sub)
+        sub.dropped = True
+        self.dropped += 1
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(None)   # 스트림 종료 신호
+
+    def stats(self) -> dict:
+        return {"subscribers": len(self._subs), "dropped": self.dropped, "queue_size": self.maxsize}
+
+hub = EventHub(settings.sse_queue_size)
@@ -0,0 +1,22 @@
+# 대량 목록용 JSON 응답: orjson 이 있으면 사용(날짜·시각 직렬화 포함), 없으면 표준 json
+# 핸들러에서 FastJSONResponse(content) 를 직접 반환해야 FastAPI 의 jsonable_encoder 순회를 건너뛴다
+import json
+from datetime import date, time
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+def _default(v):
+    if isinstance(v, (date, time)):
+        return v.isoformat()
+    raise TypeError(f"{type(v).__name__} is not JSON serializable")
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+                          default=_default).encode("utf-8")
@@ -1,16 +1,16 @@
 from sqlalchemy.orm import Session
-from app.models import Branch, Team
+from app.services.registry import registry
 
 MODE_LABELS = {"REMOTE": "비", "OFFLINE": "오프"}
 
 def branch_label(db: Session, code: str) -> str:
     if not code: return ""
-    row = db.query(Branch).filter(Branch.code == code).first()
+    row = registry.get(db).branches.get(code)
     return row.label_ko if row else code
 
 def team_label(db: Session, code: str) -> str:
     if not code: return ""
-    row = db.query(Team).filter(Team.code == code).first()
+    row = registry.get(db).teams.get(code)
     return row.label_ko if row else code
 
 def mode_label(code: str) -> str:
@@ -0,0 +1,217 @@
+# 요청·SQL 계측 → Prometheus 텍스트(/metrics)
+# - RequestMetrics: 라우트 템플릿별 지연 히스토그램, 요청당 쿼리 수·SQL 시간, Server-Timing 헤더
+# - instrument_engine: 엔진 커서 실행 이벤트로 쿼리 수·시간 집계 (현재 요청 비용에도 합산)
+# - render: 위 값 + 연결 풀 / 통계 캐시 / SSE / 쓰기 레인 게이지
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.services import query_guard
+
+log = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+class RequestCost:
+    """요청 하나의 SQL 비용. 컨텍스트 변수로 스레드풀·aiosqlite 그린렛까지 전달된다."""
+    __slots__ = ("queries", "sql_seconds", "guard")
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.guard = None   # query_guard.Guard (QUERY_GUARD 켠 경우만)
+
+_current: ContextVar[Optional[RequestCost]] = ContextVar("request_cost", default=None)
+
+def current_cost() -> Optional[RequestCost]:
+    return _current.get()
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # 마지막 칸 = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, v: float):
+        for i, b in enumerate(self.buckets):
+            if v <= b:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += v
+        self.count += 1
+
+def _labels(pairs: Tuple[Tuple[str, str], ...]) -> str:
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{k}="{esc(v)}"' for k, v in pairs)
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hist: Dict[str, Dict[tuple, Histogram]] = {}
+        self.counters: Dict[str, Dict[tuple, float]] = {}
+        self.engines: List[Tuple[str, Engine]] = []
+
+    def observe(self, name: str, labels: tuple, value: float, buckets):
+        with self._lock:
+            series = self.hist.setdefault(name, {})
+            h = series.get(labels)
+            if h is None:
+                h = series[labels] = Histogram(buckets)
+            h.observe(value)
+
+    def inc(self, name: str, labels: tuple, value: float = 1):
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + value
+
+    def snapshot(self):
+        with self._lock:
+            hist = {n: {k: (h.buckets, list(h.counts), h.sum, h.count) for k, h in s.items()}
+                    for n, s in self.hist.items()}
+            return hist, {n: dict(s) for n, s in self.counters.items()}
+
+metrics = Registry()
+
+HELP = {
+    "http_request_duration_seconds": ("histogram", "요청 처리 시간 (라우트 템플릿별)"),
+    "http_request_sql_queries": ("histogram", "요청당 SQL 쿼리 수"),
+    "http_request_sql_seconds_total": ("counter", "요청에서 쓴 SQL 시간 합계"),
+    "http_requests_total": ("counter", "요청 수 (상태 코드별)"),
+    "db_query_duration_seconds": ("histogram", "SQL 실행 시간 (엔진별)"),
+}
+
+# ---- SQL 계측 ----
+def instrument_engine(engine: Engine, name: str):
+    metrics.engines.append((name, engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_t0 = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        t0 = getattr(context, "_metrics_t0", None)
+        if t0 is None:
+            return
+        elapsed = time.perf_counter() - t0
+        metrics.observe("db_query_duration_seconds", (("engine", name),), elapsed, LATENCY_BUCKETS)
+        cost = _current.get()
+        if cost is not None:
+            cost.queries += 1
+            cost.sql_seconds += elapsed
+            if cost.guard is not None:
+                cost.guard.record(statement, parameters)
+
+# ---- 요청 계측 ----
+def route_template(scope) -> str:
+    """매칭된 라우트의 전체 경로 템플릿(path_format).
+    include_router 로 붙은 라우트는 scope["route"] 가 접두사 없는 원래 라우트라서,
+    FastAPI 가 scope 에 남기는 접두사 적용 라우트(effective_route_context)를 먼저 본다."""
+    route = scope.get("fastapi", {}).get("effective_route_context") or scope.get("route")
+    return getattr(route, "path_format", None) or "<unmatched>"
+
+class RequestMetrics:
+    """ASGI 미들웨어. 라우트 템플릿(/api/sessions/{session_id})을 라벨로 써서 카디널리티를 묶는다.
+    SSE 같은 스트림 응답은 지연 히스토그램에서 제외(연결 유지 시간이라 의미 없음)."""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        cost = RequestCost()
+        if query_guard.mode() != "off":
+            cost.guard = query_guard.Guard(scope)
+        token = _current.set(cost)
+        t0 = time.perf_counter()
+        state = {"status": 500, "stream": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                state["stream"] = any(k == b"content-type" and v.startswith(b"text/event-stream") for k, v in headers)
+                headers.append((b"server-timing", (
+                    f'db;dur={cost.sql_seconds * 1000:.1f};desc="{cost.queries} queries", '
+                    f'app;dur={(time.perf_counter() - t0) * 1000:.1f}').encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - t0
+            route = route_template(scope)
+            labels = (("method", scope["method"]), ("route", route))
+            metrics.inc("http_requests_total", labels + (("status", state["status"]),))
+            if not state["stream"]:
+                metrics.observe("http_request_duration_seconds", labels, elapsed, LATENCY_BUCKETS)
+            metrics.observe("http_request_sql_queries", labels, cost.queries, QUERY_BUCKETS)
+            metrics.inc("http_request_sql_seconds_total", labels, cost.sql_seconds)
+            if cost.guard is not None:
+                cost.guard.finish(f"{scope['method']} {route}")
+            if cost.queries >= settings.slow_request_queries or (
+                    not state["stream"] and elapsed * 1000 >= settings.slow_request_ms):
+                log.warning("%s %s (%s): %d queries, sql %.0fms / total %.0fms", scope["method"],
+                            scope.get("path"), route, cost.queries, cost.sql_seconds * 1000, elapsed * 1000)
+
+# ---- 출력 ----
+def _gauges() -> List[Tuple[str, str, tuple, float]]:
+    from app.db import write_lane
+    from app.services.events import hub
+    from app.services.stats_cache import stats_cache
+    out = []
+    for name, engine in metrics.engines:
+        pool, lb = engine.pool, (("engine", name),)
+        for metric, attr in (("db_pool_checked_out", "checkedout"), ("db_pool_size", "size"),
+                             ("db_pool_overflow", "overflow")):
+            fn = getattr(pool, attr, None)
+            if fn is not None:
+                out.append((metric, "gauge", lb, fn()))
+    c = stats_cache.stats()
+    out += [("stats_cache_hits_total", "counter", (), c["hits"]), ("stats_cache_misses_total", "counter", (), c["misses"]),
+            ("stats_cache_entries", "gauge", (), c["size"]), ("stats_cache_max_entries", "gauge", (), c["maxsize"])]
+    h = hub.stats()
+    out += [("sse_subscribers", "gauge", (), h["subscribers"]), ("sse_dropped_total", "counter", (), h["dropped"]),
+            ("write_lane_waiting", "gauge", (), write_lane.waiting)]
+    return out
+
+def render() -> str:
+    hist, counters = metrics.snapshot()
+    lines = []
+
+    def head(name, kind):
+        lines.append(f"# HELP {name} {HELP.get(name, (kind, name))[1]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    for name, series in sorted(hist.items()):
+        head(name, "histogram")
+        for labels, (buckets, counts, total, n) in sorted(series.items()):
+            base, acc = _labels(labels), 0
+            sep = "," if base else ""
+            for b, cnt in zip(list(buckets) + ["+Inf"], counts):
+                acc += cnt
+                lines.append(f'{name}_bucket{{{base}{sep}le="{b}"}} {acc}')
+            lines.append(f"{name}_sum{{{base}}} {total:.6f}")
+            lines.append(f"{name}_count{{{base}}} {n}")
+    for name, series in sorted(counters.items()):
+        head(name, "counter")
+        for labels, v in sorted(series.items()):
+            lines.append(f"{name}{{{_labels(labels)}}} {v:g}")
+    seen = set()
+    for name, kind, labels, v in sorted(_gauges(), key=lambda g: g[0]):   # 같은 이름끼리 모아서
+        if name not in seen:
+            seen.add(name)
+            head(name, kind)
+        lines.append(f"{name}{{{_labels(labels)}}} {v}" if labels else f"{name} {v}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,132 @@
+# 쿼리 예산 / N+1 감지 (개발·테스트용, QUERY_GUARD=warn|raise 로 켬)
+# - 요청마다 실행된 SQL 을 '모양'(파라미터·IN 목록 길이 무시)별로 세고
+#   같은 모양이 서로 다른 파라미터로 max_repeats 회를 넘으면 N+1 로 본다
+# - 라우트 예산은 @query_budget(...) 으로 선언, 없으면 기본값(QUERY_BUDGET_DEFAULT / QUERY_BUDGET_REPEATS)
+#   예산에는 메타 레지스트리 재적재(쿼리 5개) 여유를 포함해 둔다
+# - warn: 요청 끝에 경고 로그, raise: 초과하는 순간 QueryBudgetExceeded (트랜잭션은 커밋 전이라 롤백됨)
+import logging
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+@dataclass(frozen=True)
+class Budget:
+    max_queries: int
+    max_repeats: int
+
+def query_budget(max_queries: int, max_repeats: Optional[int] = None):
+    """라우트 함수에 쿼리 예산 선언. 함수는 그대로 돌려주므로 @router.get 위/아래 어디든 가능."""
+    def deco(fn):
+        fn.__query_budget__ = Budget(max_queries, max_repeats if max_repeats is not None else settings.query_budget_repeats)
+        return fn
+    return deco
+
+def default_budget() -> Budget:
+    return Budget(settings.query_budget_default, settings.query_budget_repeats)
+
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+@lru_cache(maxsize=1024)
+def shape(statement: str) -> str:
+    # 같은 쿼리의 IN (?, ?, ...) 길이 차이는 하나로 본다
+    return _IN_LIST.sub("(?…)", _SPACES.sub(" ", statement).strip())
+
+@dataclass
+class Violation:
+    route: str
+    message: str
+
+    def __str__(self):
+        return f"{self.route}: {self.message}"
+
+# 테스트 픽스처가 켜는 수집 모드 (설정보다 우선, 스레드 간 공유)
+_override: Dict[str, object] = {"mode": None, "sink": None}
+_sink_lock = threading.Lock()
+
+def mode() -> str:
+    return _override["mode"] or settings.query_guard
+
+class Guard:
+    """요청 하나의 SQL 기록. 예산은 첫 쿼리 때 라우팅 결과(scope['endpoint'])에서 찾는다."""
+    def __init__(self, scope: Optional[dict] = None, budget: Optional[Budget] = None, route: str = "",
+                 mode_: Optional[str] = None):
+        self.scope = scope
+        self.budget = budget
+        self.route = route
+        self.mode = mode_ or mode()
+        self.queries = 0
+        self.shapes: Dict[str, set] = {}
+        self.flagged = False
+
+    def _budget(self) -> Budget:
+        if self.budget is None:
+            endpoint = (self.scope or {}).get("endpoint")
+            self.budget = getattr(endpoint, "__query_budget__", None) or default_budget()
+        return self.budget
+
+    def record(self, statement: str, parameters):
+        self.queries += 1
+        params = self.shapes.setdefault(shape(statement), set())
+        params.add(repr(parameters)[:200])
+        if self.mode == "raise":
+            b = self._budget()
+            if self.queries > b.max_queries or len(params) > b.max_repeats:
+                self.flagged = True
+                raise QueryBudgetExceeded("; ".join(self.messages()))
+
+    def messages(self) -> List[str]:
+        b = self._budget()
+        out = []
+        if self.queries > b.max_queries:
+            out.append(f"{self.queries} queries (budget {b.max_queries})")
+        for s, params in self.shapes.items():
+            if len(params) > b.max_repeats:
+                out.append(f"N+1: {len(params)}x [{s[:160]}]")
+        return out
+
+    def finish(self, route: str = ""):
+        route = route or self.route
+        found = [] if self.flagged else self.messages()
+        for m in found:
+            log.warning("query budget exceeded %s: %s", route, m)
+        sink = _override["sink"]
+        if sink is not None and (found or self.flagged):
+            with _sink_lock:
+                sink.extend(Violation(route, m) for m in (found or self.messages()))
+
+@contextmanager
+def collect():
+    """예산 초과를 예외 대신 목록으로 모은다 (pytest 픽스처용). 중첩하지 않는다."""
+    found: List[Violation] = []
+    prev = dict(_override)
+    _override.update(mode="collect", sink=found)
+    try:
+        yield found
+    finally:
+        _override.update(prev)
+
+@contextmanager
+def limit(max_queries: int, max_repeats: Optional[int] = None, label: str = "block"):
+    """요청 밖(서비스 함수 직접 호출 등) 코드 블록에 예산 적용. 블록을 벗어날 때 초과면 예외."""
+    from app.services.metrics import RequestCost, _current
+    cost = RequestCost()
+    cost.guard = Guard(budget=Budget(max_queries, max_repeats if max_repeats is not None else settings.query_budget_repeats),
+                       route=label, mode_="collect")
+    token = _current.set(cost)
+    try:
+        yield cost.guard
+    finally:
+        _current.reset(token)
+    found = cost.guard.messages()
+    if found:
+        raise QueryBudgetExceeded(f"{label}: " + "; ".join(found))
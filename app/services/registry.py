@@ -0,0 +1,135 @@
+# 기준정보(지점/팀/과목/상담사) 메모리 스냅샷
+# - 한 번 적재 후 라벨/유효성 조회를 메모리에서 처리
+# - meta 쓰기 시 새 스냅샷으로 통째 교체(원자적), 다른 워커는 meta 버전을 주기적으로 확인
+# - 스냅샷에 없는 키(지점·팀은 비활성 포함)는 meta 버전을 확인해 재적재하거나 DB 에서 한 번에 확인하고,
+#   그 결과(없음 포함)를 스냅샷별로 기억한다 → 잘못된 id 가 반복돼도 N+1 이 되지 않음
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.db import chunked
+from app.models import Branch, Team, Subject, Counselor
+from app.services.versions import current, META
+
+class MetaItem(NamedTuple):
+    code: str
+    label_ko: str
+    active: bool
+
+class SubjectItem(NamedTuple):
+    id: int
+    name: str
+    branch: str
+    active: bool
+
+class CounselorItem(NamedTuple):
+    id: int
+    name: str
+    branch: str
+    team: str
+    status: str
+
+KINDS = ("branches", "teams", "subjects", "counselors")
+
+@dataclass(frozen=True)
+class MetaSnapshot:
+    version: int
+    branches: Dict[str, MetaItem]
+    teams: Dict[str, MetaItem]
+    subjects: Dict[int, SubjectItem]
+    counselors: Dict[int, CounselorItem]
+    # 스냅샷 밖에서 DB 로 확인한 결과 (없으면 None). 스냅샷이 바뀌면 함께 버려진다
+    checked: Dict[str, dict] = field(default_factory=lambda: {k: {} for k in KINDS}, compare=False)
+
+    def find(self, kind: str, key):
+        checked = self.checked[kind]
+        return checked[key] if key in checked else getattr(self, kind).get(key)
+
+# 종류별 (모델, 키 컬럼, 행 → 항목). id 순 적재: 기존 .all() 조회와 동일한 순서를 유지
+_SOURCES = {
+    "branches": (Branch, Branch.code, lambda r: MetaItem(r.code, r.label_ko, bool(r.active))),
+    "teams": (Team, Team.code, lambda r: MetaItem(r.code, r.label_ko, bool(r.active))),
+    "subjects": (Subject, Subject.id, lambda r: SubjectItem(r.id, r.name, r.branch, bool(r.active))),
+    "counselors": (Counselor, Counselor.id, lambda r: CounselorItem(r.id, r.name, r.branch, r.team, r.status)),
+}
+
+def _meta_version(db: Session) -> int:
+    return current(db, META)
+
+def _load(db: Session) -> MetaSnapshot:
+    items = {}
+    for kind, (model, key, build) in _SOURCES.items():
+        items[kind] = {getattr(r, key.key): build(r) for r in db.query(model).order_by(model.id)}
+    return MetaSnapshot(version=_meta_version(db), **items)
+
+def _needs_check(kind: str, item) -> bool:
+    # 없는 키, 또는 다른 워커에서 방금 다시 켰을 수 있는 비활성 지점·팀
+    return item is None or (kind in ("branches", "teams") and not item.active)
+
+class MetaRegistry:
+    def __init__(self, check_interval: float = 30.0):
+        self.check_interval = check_interval
+        self._snap: Optional[MetaSnapshot] = None
+        self._checked_at = 0.0
+
+    def get(self, db: Session) -> MetaSnapshot:
+        snap = self._snap
+        if snap is None:
+            return self.refresh(db)
+        if time.monotonic() - self._checked_at > self.check_interval:
+            self._checked_at = time.monotonic()
+            if _meta_version(db) != snap.version:
+                return self.refresh(db)
+        return snap
+
+    def refresh(self, db: Session) -> MetaSnapshot:
+        # 락 없이 새 스냅샷을 만든 뒤 참조만 교체 (run_sync 중 I/O 대기 시에도 안전)
+        snap = _load(db)
+        self._snap = snap
+        self._checked_at = time.monotonic()
+        return snap
+
+    def at_least(self, db: Session, version: int) -> MetaSnapshot:
+        """이미 읽은 META 버전보다 오래된 스냅샷이면 주기 점검을 기다리지 않고 재적재."""
+        snap = self.get(db)
+        return snap if snap.version >= version else self.refresh(db)
+
+    def sync(self, db: Session) -> MetaSnapshot:
+        """쓰기 검증 전에 호출: 주기 점검을 기다리지 않고 meta 버전을 지금 확인 (다른 워커의 비활성화 반영)."""
+        return self.at_least(db, _meta_version(db))
+
+    def invalidate(self):
+        self._snap = None
+
+    def resolve(self, db: Session, kind: str, keys: Iterable) -> MetaSnapshot:
+        """스냅샷에 없는 키를 확인: meta 버전이 바뀌었으면 재적재, 아니면 IN 조회 한 번.
+        과목/상담사는 meta 라우터 밖(시드·외부 적재)에서도 추가되므로 버전이 같아도 DB 를 본다."""
+        snap = self.get(db)
+        todo = [k for k in set(keys) if k is not None and k not in snap.checked[kind]
+                and _needs_check(kind, getattr(snap, kind).get(k))]
+        if not todo:
+            return snap
+        if _meta_version(db) != snap.version:
+            snap = self.refresh(db)
+            found = getattr(snap, kind)   # 방금 적재한 스냅샷이 최신
+        else:
+            model, key, build = _SOURCES[kind]
+            found = {getattr(r, key.key): build(r) for chunk in chunked(todo) for r in db.query(model).filter(key.in_(chunk))}
+        for k in todo:
+            snap.checked[kind][k] = found.get(k)
+        return snap
+
+    def branch(self, db: Session, code: str) -> Optional[MetaItem]:
+        return self.resolve(db, "branches", [code]).find("branches", code)
+
+    def team(self, db: Session, code: str) -> Optional[MetaItem]:
+        return self.resolve(db, "teams", [code]).find("teams", code)
+
+    def subject(self, db: Session, subject_id: int) -> Optional[SubjectItem]:
+        return self.resolve(db, "subjects", [subject_id]).find("subjects", subject_id)
+
+    def counselor(self, db: Session, counselor_id: int) -> Optional[CounselorItem]:
+        return self.resolve(db, "counselors", [counselor_id]).find("counselors", counselor_id)
+
+registry = MetaRegistry(check_interval=settings.meta_check_interval)
@@ -0,0 +1,91 @@
+# 세션 일별 집계(session_daily_agg) 증분 유지 / 재구성 / 검증
+#   python -m app.services.rollup rebuild   # 원본에서 다시 만들기
+#   python -m app.services.rollup verify    # 원본과 비교 (불일치 시 종료코드 1)
+import argparse
+import sys
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy import bindparam, delete, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.db import chunked
+from app.models import Session as Sess, SessionDailyAgg as Agg
+
+# (date, branch, team, requested_subject_id, registered_subject_id, mode, status)
+Dims = Tuple
+DIM_COLUMNS = ("date", "branch", "team", "requested_subject_id", "registered_subject_id", "mode", "status")
+
+def dims_of(date, branch, team, requested_subject_id, registered_subject_id, mode, status) -> Dims:
+    return (date, branch, team, requested_subject_id or 0, registered_subject_id or 0, mode or "", status or "")
+
+def session_dims(s) -> Dims:
+    return dims_of(s.date, s.branch, s.team, s.requested_subject_id, s.registered_subject_id, s.mode, s.status)
+
+def apply(db: Session, deltas: Dict[Dims, int]):
+    """세션 쓰기와 같은 트랜잭션에서 호출: 옛 행 -1, 새 행 +1."""
+    values = [dict(zip(DIM_COLUMNS, k), count=v) for k, v in deltas.items() if v]
+    if not values:
+        return
+    stmt = insert(Agg)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[getattr(Agg, c) for c in DIM_COLUMNS],
+        set_={"count": Agg.count + stmt.excluded.count},
+    )
+    for chunk in chunked(values):
+        db.execute(stmt, chunk)
+    # 감소한 키만 확인해서 0 이 된 행 삭제 (고유 인덱스 조회, 전체 스캔 없음)
+    emptied = [{f"k_{c}": v for c, v in zip(DIM_COLUMNS, k)} for k, v in deltas.items() if v < 0]
+    if emptied:
+        t = Agg.__table__   # executemany DELETE 는 Core 문장으로
+        stmt = delete(t).where(*[t.c[c] == bindparam(f"k_{c}") for c in DIM_COLUMNS], t.c.count <= 0)
+        for chunk in chunked(emptied):
+            db.connection().execute(stmt, chunk)
+
+def changed(old: Iterable[Dims] = (), new: Iterable[Dims] = ()) -> Dict[Dims, int]:
+    c = Counter()
+    for k in old: c[k] -= 1
+    for k in new: c[k] += 1
+    return c
+
+def _source(db: Session):
+    dims = [Sess.date, Sess.branch, Sess.team,
+            func.coalesce(Sess.requested_subject_id, 0), func.coalesce(Sess.registered_subject_id, 0),
+            func.coalesce(Sess.mode, ""), func.coalesce(Sess.status, "")]
+    return db.query(*dims, func.count(Sess.id)).group_by(*dims)
+
+def rebuild(db: Session) -> int:
+    db.query(Agg).delete(synchronize_session=False)
+    db.execute(insert(Agg).from_select([*DIM_COLUMNS, "count"], _source(db).statement))
+    return db.query(func.count(Agg.id)).scalar()
+
+def verify(db: Session) -> List[tuple]:
+    """(dims, 원본 건수, 롤업 건수) 불일치 목록."""
+    source = {tuple(r[:7]): r[7] for r in _source(db)}
+    rolled = {tuple(r[:7]): r[7] for r in db.query(*[getattr(Agg, c) for c in DIM_COLUMNS], Agg.count)}
+    diffs = []
+    for k in source.keys() | rolled.keys():
+        a, b = source.get(k, 0), rolled.get(k, 0)
+        if a != b:
+            diffs.append((k, a, b))
+    return sorted(diffs, key=str)
+
+def main(argv=None):
+    from app.db import Base, SessionLocal, engine
+    parser = argparse.ArgumentParser(prog="python -m app.services.rollup")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    args = parser.parse_args(argv)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        if args.command == "rebuild":
+            n = rebuild(db)
+            db.commit()
+            print(f"rebuilt session_daily_agg: {n} rows")
+            return 0
+        diffs = verify(db)
+        for k, a, b in diffs[:50]:
+            print(f"mismatch {k}: sessions={a} rollup={b}")
+        print("ok" if not diffs else f"{len(diffs)} mismatched groups")
+        return 0 if not diffs else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# 세션 변경 피드: 변경 로그(session_changes) id 이후의 바뀐 행 + 삭제 툼스톤
+# - 로그는 sessions 트리거가 채우고, id 는 커밋 순서대로 증가 (SQLite 단일 쓰기 잠금)
+#   → 늦게 커밋된 트랜잭션도 자기 id 가 커서보다 뒤에 오므로 건너뛰지 않는다 (벽시계 시각 비교 없음)
+# - 커서 = 마지막으로 전달한 로그 id, 불투명 문자열로 전달
+# - 로그와 세션을 따로 읽으므로 같은 행이 두 번 올 수는 있어도 빠지지는 않는다 (클라이언트는 id 로 덮어씀)
+from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.models import Session as Sess, SessionChange, DataVersion
+from app.services import cursors
+from app.services.session_query import projection, to_dicts
+from app.services.versions import current
+
+RETENTION_DAYS = 30
+PRUNED = "session_changes_pruned"   # data_versions: 정리로 지운 툼스톤의 최대 로그 id
+
+def encode_cursor(seq: int) -> str:
+    return cursors.encode([seq])
+
+def decode_cursor(cursor: str) -> int:
+    (seq,) = cursors.decode(cursor, int)
+    return seq
+
+def prune(db: Session):
+    """삭제와 같은 트랜잭션에서 호출. 보존 기간이 지난 툼스톤을 지우고, 그 이전 커서는 reset 되도록 기록."""
+    old = db.query(SessionChange).filter(
+        SessionChange.deleted == True,
+        SessionChange.changed_at < func.datetime("now", f"-{RETENTION_DAYS} days"),
+    )
+    upto = old.with_entities(func.max(SessionChange.id)).scalar()
+    if upto is None:
+        return
+    old.delete(synchronize_session=False)
+    stmt = insert(DataVersion).values(name=PRUNED, version=upto)
+    db.execute(stmt.on_conflict_do_update(index_elements=[DataVersion.name], set_={"version": upto}))
+
+def feed(db: Session, cursor: Optional[str], limit: int, fields: List[str]) -> dict:
+    if cursor is None:
+        # 시작 커서만 발급: 클라이언트는 이걸 받은 뒤 자기 창을 전체 조회
+        last = db.query(func.max(SessionChange.id)).scalar() or 0
+        return {"changes": [], "deleted": [], "cursor": encode_cursor(last), "has_more": False, "reset": False}
+    after = decode_cursor(cursor)
+    if after < current(db, PRUNED):
+        # 툼스톤이 이미 정리된 구간: 창 전체를 다시 받아야 함
+        return {"changes": [], "deleted": [], "cursor": None, "has_more": False, "reset": True}
+
+    log = db.query(SessionChange.id, SessionChange.session_id, SessionChange.deleted).filter(
+        SessionChange.id > after
+    ).order_by(SessionChange.id).limit(limit + 1).all()
+    has_more = len(log) > limit
+    log = log[:limit]
+    if log:
+        after = log[-1].id
+
+    changed = [r.session_id for r in log if not r.deleted]
+    cols, pos = projection(fields)
+    rows = {}
+    if changed:
+        id_pos = pos["id"]
+        rows = {r[id_pos]: r for r in db.query(*cols).filter(Sess.id.in_(changed))}
+    return {
+        # 로그 순서 유지. 그 사이 삭제된 행은 빠지고 다음 호출에서 툼스톤으로 온다
+        "changes": to_dicts([rows[i] for i in changed if i in rows], fields, pos),
+        "deleted": [r.session_id for r in log if r.deleted],
+        "cursor": encode_cursor(after),
+        "has_more": has_more,
+        "reset": False
+    }
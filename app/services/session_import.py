@@ -0,0 +1,166 @@
+# 세션 일괄 적재(CSV / NDJSON)
+# - 업로드(임시 파일로 받은 것)를 줄 단위로 읽어 CHUNK 행씩 검증 → 적재 후 다음 청크 (단건 API 와 동일 규칙)
+#   파일 전체를 모델로 들고 있지 않는다. 남는 것은 오류 목록, 채택 행의 (시작, 종료, 행), 삽입 결과 튜플
+# - 중복 시간은 (상담사, 일자)별 정렬 후 스윕으로 판정: 기존 행 + 앞 청크에서 채택한 행 + 청크 내부
+# - 모든 청크가 한 트랜잭션 (커밋은 호출 측)
+import csv
+import io
+import json
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, tuple_
+from sqlalchemy.orm import Session
+from app.db import chunked
+from app.models import Session as Sess, STATUSES, MODES
+from app.services.registry import registry
+from app.services.validators import (
+    is_30min_grid, enforce_conditionals, branch_subject_guard, validate_branch_team
+)
+
+CHUNK = 1000   # 한 번에 검증·적재하는 행 수
+
+FIELDS = [
+    "date", "start_time", "end_time", "counselor_id", "branch", "team", "student_name",
+    "requested_subject_id", "registered_subject_id", "mode", "status", "cancel_reason", "comment",
+]
+
+def iter_records(fileobj, fmt: str) -> Iterator[Tuple[int, dict]]:
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for rec in reader:
+            # CSV 빈 칸은 값 없음으로 취급
+            yield reader.line_num, {k: (v if v != "" else None) for k, v in rec.items() if k}
+    else:
+        for line_no, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError:
+                yield line_no, None
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in (content_type or "") or "jsonl" in (content_type or ""):
+        return "ndjson"
+    return "csv"
+
+def _validate(db: Session, row: BaseModel):
+    if row.status not in STATUSES:
+        raise ValueError("유효하지 않은 상태입니다.")
+    if row.mode not in MODES:
+        raise ValueError("유효하지 않은 비대면/오프라인 값입니다.")
+    if not is_30min_grid(row.start_time) or not is_30min_grid(row.end_time):
+        raise ValueError("시작/종료 시각은 30분 단위여야 합니다.")
+    if row.end_time <= row.start_time:
+        raise ValueError("종료 시각은 시작 시각보다 커야 합니다.")
+    if not registry.counselor(db, row.counselor_id):
+        raise ValueError("상담사를 찾을 수 없습니다.")
+    validate_branch_team(db, branch=row.branch, team=row.team)
+    enforce_conditionals(status=row.status, registered_subject_id=row.registered_subject_id,
+                         cancel_reason=row.cancel_reason)
+    branch_subject_guard(db, branch=row.branch, requested_subject_id=row.requested_subject_id,
+                         registered_subject_id=row.registered_subject_id)
+
+def _existing_intervals(db: Session, keys: List[tuple]):
+    # 영향받는 (상담사, 일자)만 한 번씩 적재
+    out = defaultdict(list)
+    for chunk in chunked(keys):
+        q = db.query(Sess.id, Sess.counselor_id, Sess.date, Sess.start_time, Sess.end_time).filter(
+            tuple_(Sess.counselor_id, Sess.date).in_(chunk)
+        )
+        for sid, cid, d, st, et in q:
+            out[(cid, d)].append((st, et, sid))
+    return out
+
+def sweep_overlaps(batch: dict, existing: dict, accepted: Optional[dict] = None) -> dict:
+    """(상담사, 일자)별로 batch[(cid, d)] = [(start, end, line)] 을 검사해 {line: 충돌 설명} 반환.
+
+    기존 세션과 겹치는 행은 시작 순서와 관계없이 모두 충돌(기존 세션이 우선).
+    accepted 는 앞 청크에서 채택한 행 [(start, end, line)]: 기존 세션 다음으로 우선하고,
+    이번 청크에서 채택한 행이 여기에 더해진다.
+    청크 내 충돌은 시작 시각 순으로 채택해 먼저 시작하는 행이 남는다.
+    """
+    conflicts = {}
+    accepted = {} if accepted is None else accepted
+    for key, rows in batch.items():
+        sessions = existing.get(key, [])
+        earlier = accepted.setdefault(key, [])
+        kept = []
+        for st, et, line in sorted(rows, key=lambda r: (r[0], r[2])):
+            hit = next((sid for s_st, s_et, sid in sessions if s_st < et and st < s_et), None)
+            prev = next((ln for a_st, a_et, ln in earlier if a_st < et and st < a_et), None)
+            if hit is not None:
+                conflicts[line] = f"동일 상담사의 시간이 겹칩니다. (세션 #{hit})"
+            elif prev is not None:
+                conflicts[line] = f"동일 상담사의 시간이 겹칩니다. ({prev}행)"
+            elif kept and st < kept[-1][1]:
+                conflicts[line] = f"동일 상담사의 시간이 겹칩니다. ({kept[-1][2]}행)"
+            else:
+                kept.append((st, et, line))
+        earlier.extend(kept)
+    return conflicts
+
+def parse_records(records: Iterator[Tuple[int, dict]], model) -> Iterator[Tuple[int, List[dict], List[Tuple[int, BaseModel]]]]:
+    """업로드 해석 + 스키마 검증. CHUNK 행마다 (행 수, 오류, [(행, 모델)]) 를 내보낸다."""
+    count, errors, rows = 0, [], []
+    for line, rec in records:
+        count += 1
+        if not isinstance(rec, dict):
+            errors.append({"line": line, "error": "행 형식을 해석할 수 없습니다."})
+        else:
+            try:
+                rows.append((line, model.model_validate({k: rec.get(k) for k in FIELDS if rec.get(k) is not None})))
+            except ValidationError as e:
+                err = e.errors()[0]
+                errors.append({"line": line, "error": f"{'.'.join(str(x) for x in err['loc'])}: {err['msg']}"})
+        if count == CHUNK:
+            yield count, errors, rows
+            count, errors, rows = 0, [], []
+    if count:
+        yield count, errors, rows
+
+_RETURNING = (Sess.id, Sess.counselor_id, Sess.date, Sess.start_time, Sess.end_time,
+              Sess.branch, Sess.team, Sess.requested_subject_id, Sess.registered_subject_id, Sess.mode, Sess.status)
+
+def import_sessions(db: Session, chunks: Iterator[tuple], *, dry_run: bool = False):
+    """parse_records 청크를 차례로 기준정보·겹침 검증 후 적재.
+    (보고서, 삽입된 (id, 상담사, 일자, 시작, 종료, 지점, 팀, 신청, 등록, mode, status) 목록) 반환."""
+    total, valid_count, errors, inserted = 0, 0, [], []
+    existing: Dict[tuple, list] = {}   # 이미 읽은 (상담사, 일자)의 기존 세션 (앞 청크에서 넣은 행은 accepted 쪽)
+    accepted: Dict[tuple, list] = {}
+    stmt = insert(Sess).returning(*_RETURNING)
+    # meta 버전은 적재 시작 때 한 번, 참조 id 는 청크마다 한 번에 확인 (행마다 미스 조회 없음)
+    registry.sync(db)
+    for count, chunk_errors, rows in chunks:
+        total += count
+        errors += chunk_errors
+        registry.resolve(db, "counselors", [row.counselor_id for _, row in rows])
+        registry.resolve(db, "subjects", [sid for _, row in rows for sid in (row.requested_subject_id, row.registered_subject_id)])
+        parsed = {}
+        batch = defaultdict(list)
+        for line, row in rows:
+            try:
+                _validate(db, row)
+            except ValueError as e:
+                errors.append({"line": line, "error": str(e)})
+                continue
+            parsed[line] = row
+            batch[(row.counselor_id, row.date)].append((row.start_time, row.end_time, line))
+
+        new_keys = [k for k in batch if k not in existing]
+        loaded = _existing_intervals(db, new_keys)
+        existing.update((k, loaded.get(k, [])) for k in new_keys)
+        conflicts = sweep_overlaps(batch, existing, accepted)
+        errors += [{"line": line, "error": msg} for line, msg in conflicts.items()]
+        valid = [row.model_dump(include=set(FIELDS)) for line, row in parsed.items() if line not in conflicts]
+        valid_count += len(valid)
+        # 커밋은 호출 측에서 (실패 시 세션 종료와 함께 전체 롤백)
+        if valid and not dry_run:
+            for part in chunked(valid):
+                inserted += [tuple(r) for r in db.execute(stmt, part)]
+    errors.sort(key=lambda e: e["line"])
+    report = {"total": total, "valid": valid_count, "inserted": len(inserted), "dry_run": dry_run, "errors": errors}
+    return report, inserted
@@ -0,0 +1,82 @@
+# 세션 조회 공용: 필터 / 키셋(date, start_time, id) 페이지·청크 / 컬럼 투영
+from datetime import date, time
+from typing import Iterator, List, Optional
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query, Session
+from app.models import Session as Sess
+from app.services import cursors
+
+# API 로 노출하는 세션 필드 (응답 dict 키 순서)
+SESSION_FIELDS = [
+    "id", "date", "start_time", "end_time", "counselor_id", "branch", "team", "student_name",
+    "requested_subject_id", "registered_subject_id", "mode", "status", "cancel_reason", "comment",
+]
+_ISO_FIELDS = {"date", "start_time", "end_time"}
+KEY_FIELDS = ["date", "start_time", "id"]
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return list(SESSION_FIELDS)
+    out = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in out if f not in SESSION_FIELDS]
+    if unknown:
+        raise ValueError(f"알 수 없는 필드: {', '.join(unknown)}")
+    return out
+
+def projection(fields: List[str]):
+    """요청 필드 + (없으면) 정렬 키 컬럼. (컬럼 목록, 필드→위치) 반환."""
+    names = fields + [k for k in KEY_FIELDS if k not in fields]
+    return [getattr(Sess, n) for n in names], {n: i for i, n in enumerate(names)}
+
+def to_dicts(rows, fields: List[str], pos: dict, iso: bool = True) -> List[dict]:
+    """세션 응답 dict 의 유일한 생성 지점. iso=False 면 날짜·시각 객체를 그대로 두고
+    직렬화를 FastJSONResponse 에 맡긴다 (projection 이 요청 필드를 앞에 두므로 zip 으로 충분)."""
+    if not iso:
+        return [dict(zip(fields, r)) for r in rows]
+    plan = [(f, pos[f], f in _ISO_FIELDS) for f in fields]
+    return [{f: (r[i].isoformat() if conv and r[i] is not None else r[i]) for f, i, conv in plan} for r in rows]
+
+def encode_cursor(d: date, t: time, sid: int) -> str:
+    return cursors.encode([d.isoformat(), t.isoformat(), sid])
+
+def decode_cursor(cursor: str) -> tuple:
+    return cursors.decode(cursor, date.fromisoformat, time.fromisoformat, int)
+
+def filter_sessions(
+    q: Query,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    branch: Optional[str] = None,
+    team: Optional[str] = None,
+    counselor_id: Optional[int] = None,
+    status: Optional[str] = None,
+    mode: Optional[str] = None,
+) -> Query:
+    if from_date: q = q.filter(Sess.date >= from_date)
+    if to_date: q = q.filter(Sess.date <= to_date)
+    if branch: q = q.filter(Sess.branch == branch)
+    if team: q = q.filter(Sess.team == team)
+    if counselor_id: q = q.filter(Sess.counselor_id == counselor_id)
+    if status: q = q.filter(Sess.status == status)
+    if mode: q = q.filter(Sess.mode == mode)
+    return q
+
+def after_key(q: Query, key: Optional[tuple]) -> Query:
+    # 정렬 키 (date, start_time, id) 기준 다음 위치부터
+    if key is None:
+        return q
+    return q.filter(tuple_(Sess.date, Sess.start_time, Sess.id) > tuple_(*key))
+
+def iter_chunks(db: Session, columns, filters: dict, chunk: int = 1000) -> Iterator[list]:
+    """고정 크기 청크로 끊어 읽는다. 각 청크는 독립 쿼리라 장시간 읽기 트랜잭션을 잡지 않는다."""
+    key = None
+    while True:
+        q = filter_sessions(db.query(*columns, Sess.date, Sess.start_time, Sess.id), **filters)
+        rows = after_key(q, key).order_by(Sess.date, Sess.start_time, Sess.id).limit(chunk).all()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1]
+        key = (last[-3], last[-2], last[-1])
+        if len(rows) < chunk:
+            return
@@ -0,0 +1,60 @@
+# 세션 슬롯 점유 행 관리 (세션 쓰기와 같은 트랜잭션에서 호출)
+from datetime import date, time
+from typing import Iterable, List, Optional
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.db import chunked
+from app.models import Session as Sess, SessionSlot
+from app.services.availability import SLOT_MIN
+
+
+def slots_of(start: time, end: time) -> range:
+    s = (start.hour * 60 + start.minute) // SLOT_MIN
+    e = -(-(end.hour * 60 + end.minute) // SLOT_MIN)  # 올림
+    return range(s, e)
+
+def claim_rows(session_id: int, counselor_id: int, d: date, start: time, end: time) -> List[dict]:
+    return [{"counselor_id": counselor_id, "date": d, "slot": i, "session_id": session_id}
+            for i in slots_of(start, end)]
+
+def claim(db: Session, rows: Iterable[tuple]):
+    """rows: (session_id, counselor_id, date, start, end). 충돌 시 IntegrityError."""
+    values = [r for row in rows for r in claim_rows(*row)]
+    for chunk in chunked(values):
+        db.execute(insert(SessionSlot), chunk)
+
+def release(db: Session, session_id: int):
+    db.query(SessionSlot).filter(SessionSlot.session_id == session_id).delete(synchronize_session=False)
+
+def is_claim_conflict(exc: IntegrityError) -> bool:
+    return "session_slots" in str(exc.orig)
+
+def overlap_detail(db: Session, counselor_id: int, d: date, start: time, end: time,
+                   ignore_id: Optional[int] = None) -> str:
+    q = db.query(Sess.id, Sess.start_time, Sess.end_time).join(
+        SessionSlot, SessionSlot.session_id == Sess.id
+    ).filter(
+        SessionSlot.counselor_id == counselor_id, SessionSlot.date == d,
+        SessionSlot.slot.in_(list(slots_of(start, end)))
+    )
+    if ignore_id:
+        q = q.filter(Sess.id != ignore_id)
+    other = q.first()
+    if not other:
+        return "동일 상담사의 시간이 겹칩니다."
+    return (f"동일 상담사의 시간이 겹칩니다. (세션 #{other.id} "
+            f"{other.start_time.strftime('%H:%M')}~{other.end_time.strftime('%H:%M')})")
+
+def overlap_error(db: Session, counselor_id: int, d: date, start: time, end: time,
+                  ignore_id: Optional[int] = None) -> HTTPException:
+    """겹침은 사전 검사에서 걸리든 슬롯 점유 경합에서 지든 같은 409."""
+    return HTTPException(409, overlap_detail(db, counselor_id, d, start, end, ignore_id))
+
+def conflict_error(db: Session, exc: IntegrityError, counselor_id: int, d: date, start: time, end: time,
+                   ignore_id: Optional[int] = None) -> HTTPException:
+    """롤백 후 호출. 슬롯 충돌이면 상대 세션을 밝힌 409, 그 외 무결성 오류는 400."""
+    if is_claim_conflict(exc):
+        return overlap_error(db, counselor_id, d, start, end, ignore_id)
+    return HTTPException(400, "데이터 무결성 오류로 저장하지 못했습니다.")
@@ -0,0 +1,73 @@
+# 콜드 스타트 계측 / 워밍업
+# - boot: app.main 임포트 시작 시각, 기동 완료·첫 응답까지의 시간(ms) 기록 → /health, 로그
+# - warm_up: 서빙 시작 후 백그라운드에서 템플릿·메타·가용성 인덱스를 미리 적재
+import logging
+import os
+import time
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+def _process_age_ms() -> Optional[float]:
+    # 인터프리터 기동부터의 경과(리눅스 /proc 기준, 없으면 None)
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return (uptime - start_ticks / os.sysconf("SC_CLK_TCK")) * 1000
+    except (OSError, ValueError, IndexError):
+        return None
+
+class BootTimer:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.before_import_ms = _process_age_ms()   # 인터프리터 시작 ~ app 임포트 시작
+        self.timings = {}
+
+    def mark(self, name: str) -> float:
+        ms = round((time.perf_counter() - self.t0) * 1000, 1)
+        self.timings[name] = ms
+        return ms
+
+    def stats(self) -> dict:
+        out = dict(self.timings)
+        if self.before_import_ms is not None:
+            out["before_import_ms"] = round(self.before_import_ms, 1)
+        return out
+
+boot = BootTimer()
+
+class FirstResponseTimer:
+    """첫 HTTP 응답 시작 시각을 기록하는 ASGI 미들웨어 (이후에는 그대로 통과)."""
+    def __init__(self, app):
+        self.app = app
+        self.done = False
+
+    async def __call__(self, scope, receive, send):
+        if self.done or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if not self.done and message["type"] == "http.response.start":
+                self.done = True
+                log.info("first response after %.0fms (%s %s)", boot.mark("first_response_ms"),
+                         scope.get("method"), scope.get("path"))
+            await send(message)
+        return await self.app(scope, receive, send_wrapper)
+
+def warm_up():
+    """서빙과 병행(스레드풀)해서 실행. 실패해도 요청 경로에서 지연 적재되므로 로그만 남긴다."""
+    from app.db import SessionLocal
+    from app.routers.views import templates
+    from app.services.availability import availability
+    from app.services.registry import registry
+    try:
+        for name in templates.env.list_templates():
+            templates.env.get_template(name)
+        with SessionLocal() as db:
+            registry.refresh(db)
+            availability.rebuild(db)
+        log.info("warm-up done at %.0fms", boot.mark("warm_ms"))
+    except Exception:
+        log.exception("warm-up failed")
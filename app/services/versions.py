@@ -0,0 +1,25 @@
+from typing import Dict
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.sqlite import insert
+from app.models import DataVersion
+
+SESSIONS = "sessions"
+DAILY_DB = "daily_db"
+META = "meta"
+
+def bump(db: Session, *names: str):
+    # 쓰기와 같은 트랜잭션에서 호출 → 커밋 시점에 함께 반영
+    for name in names:
+        stmt = insert(DataVersion).values(name=name, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DataVersion.name],
+            set_={"version": DataVersion.version + 1},
+        )
+        db.execute(stmt)
+
+def snapshot(db: Session) -> Dict[str, int]:
+    return {name: version for name, version in db.query(DataVersion.name, DataVersion.version).all()}
+
+def current(db: Session, name: str) -> int:
+    v = db.query(DataVersion.version).filter(DataVersion.name == name).scalar()
+    return int(v or 0)
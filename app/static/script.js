@@ -20,6 +20,34 @@ async function fetchJSON(url, opt) {
   }
   return r.json();
 }
+// 기간/필터 창 단위 세션 보관: 처음 한 번 전체 조회 후 변경 피드(/api/sessions/changes)로만 갱신
+class SessionWindow {
+  constructor() { this.rows = new Map(); this.cursor = null; this.match = () => true; }
+  async load(params, match) {
+    this.match = match;
+    const head = await fetchJSON("/api/sessions/changes").catch(() => null); // 조회 전에 커서 발급
+    const list = await fetchJSON("/api/sessions?" + params.toString()).catch(() => []);
+    this.rows = new Map(list.map(s => [s.id, s]));
+    this.cursor = head?.cursor || null;
+  }
+  put(s) { if (this.match(s)) this.rows.set(s.id, s); else this.rows.delete(s.id); }
+  // 변경분 반영. false 면 커서가 만료된 것이므로 다시 load 해야 함
+  async sync() {
+    if (!this.cursor) return false;
+    for (;;) {
+      const r = await fetchJSON("/api/sessions/changes?cursor=" + encodeURIComponent(this.cursor)).catch(() => null);
+      if (!r) return true; // 일시 오류: 다음 주기에 재시도
+      if (r.reset) return false;
+      for (const id of r.deleted) this.rows.delete(id);
+      for (const s of r.changes) this.put(s);
+      this.cursor = r.cursor;
+      if (!r.has_more) return true;
+    }
+  }
+  list() { return Array.from(this.rows.values()); }
+}
+let weekSync = null; // 주간 캘린더: 저장/삭제 후 전체 새로고침 대신 변경분만 반영
+
 async function loadMetaCommon() {
   Meta.branches = await fetchJSON("/api/meta/branches").catch(() => []);
   Meta.teams = await fetchJSON("/api/meta/teams").catch(() => []);
@@ -67,6 +95,7 @@ function statusColor(status) {
     default: return { bg: "#e5e7eb", border: "#d1d5db" };
   }
 }
+const STATUS_LABEL = { PENDING: "예정", DONE: "상담완료", REGISTERED: "등록", NOT_REGISTERED: "미등록", CANCELED: "상담취소" };
 function posTopPx(hhmm) {
   const [h, mm] = hhmm.split(":").map(Number);
   const min = (h * 60 + mm) - DAY_START;
@@ -231,10 +260,11 @@ async function onSaveSession() {
       alert("저장 실패: " + txt);
       return;
     }
+    const saved = await res.json().catch(() => ({}));
     hideModal();
     // 뷰 별 갱신
     if ($("#my-daily")) loadMyDay();
-    if ($("#calendar")) location.reload();
+    if ($("#calendar")) weekSync?.({ id: id || saved.id });
     if ($("#day-board")) loadDayAndRender();
     if ($("#res-table")) loadResults();
     if ($("#tbl-branch")) $("#dash-apply")?.click();
@@ -255,7 +285,7 @@ async function onDeleteSession() {
     }
     hideModal();
     if ($("#my-daily")) loadMyDay();
-    if ($("#calendar")) location.reload();
+    if ($("#calendar")) weekSync?.({ deleted: +id });
     if ($("#day-board")) loadDayAndRender();
     if ($("#res-table")) loadResults();
     if ($("#tbl-branch")) $("#dash-apply")?.click();
@@ -416,6 +446,42 @@ function initWeeklyCalendar() {
   });
 
   buildSessionModalCommon();
+  const win = new SessionWindow();
+  weekSync = async (own = {}) => {
+    // 자기 저장분은 즉시 단건 조회로, 다른 사람의 변경은 피드로
+    if (own.deleted) win.rows.delete(own.deleted);
+    if (own.id) { const s = await fetchJSON(`/api/sessions/${own.id}`).catch(() => null); if (s) win.put(s); }
+    if (!(await win.sync())) return loadAndRenderWeek();
+    renderWeek(win.list());
+  };
+  setInterval(() => weekSync(), 30000);
+
+  // 실시간 반영: 다른 사용자의 저장을 SSE 로 받아 창에 합침 (끊겼다 붙으면 변경 피드로 따라잡기)
+  let es = null;
+  function connectEvents() {
+    es?.close();
+    const p = new URLSearchParams();
+    if (selBranch.value) p.append("branch", selBranch.value);
+    if (selTeam.value) p.append("team", selTeam.value);
+    if (selCounselor.value) p.append("counselor_id", selCounselor.value);
+    es = new EventSource("/api/events/sessions?" + p.toString());
+    const apply = async (e, kind) => {
+      for (const row of JSON.parse(e.data)) {
+        const { prev, ...r } = row;
+        const cur = win.rows.get(r.id);
+        if (kind === "deleted") win.rows.delete(r.id);
+        else if (cur) win.put({ ...cur, ...r });
+        else if (kind !== "batch" && win.match(r)) {
+          const s = await fetchJSON(`/api/sessions/${r.id}`).catch(() => null);
+          if (s) win.put(s);
+        }
+      }
+      renderWeek(win.list());
+    };
+    ["created", "updated", "batch", "deleted"].forEach(k => es.addEventListener(k, e => apply(e, k)));
+    es.addEventListener("dropped", () => { es.close(); setTimeout(() => { connectEvents(); }, 3000); });
+    es.onopen = () => weekSync();
+  }
   loadAndRenderWeek();
 
   async function loadAndRenderWeek() {
@@ -434,7 +500,16 @@ function initWeeklyCalendar() {
     if (selCounselor.value) params.append("counselor_id", selCounselor.value);
     if (selMode.value) params.append("mode", selMode.value);
 
-    const sessions = await fetchJSON("/api/sessions?" + params.toString()).catch(() => []);
+    const from = params.get("from_date"), to = params.get("to_date");
+    const f = { branch: selBranch.value, team: selTeam.value, counselor_id: selCounselor.value, mode: selMode.value };
+    await win.load(params, s => s.date >= from && s.date <= to
+      && (!f.branch || s.branch === f.branch) && (!f.team || s.team === f.team)
+      && (!f.counselor_id || s.counselor_id === +f.counselor_id) && (!f.mode || s.mode === f.mode));
+    renderWeek(win.list());
+    connectEvents();
+  }
+
+  function renderWeek(sessions) {
     // 초기화
     $$("#calendar .cal-body .day-col.body").forEach(col => { col.innerHTML = ""; col.style.position = "relative"; col.style.height = ((DAY_END - DAY_START) / SLOT_MIN) * SLOT_HEIGHT + "px"; });
 
@@ -544,13 +619,17 @@ async function onBatchApply() {
     cancel_reason: $("#batch-cancel").value || null,
     comment: $("#batch-comment").value || null
   };
+  if (["status", "registered_subject_id", "cancel_reason", "comment"].every(k => payload[k] === null)) {
+    alert("변경할 값이 없습니다."); return;
+  }
   try {
     const r = await fetchJSON("/api/sessions/batch/update-status", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify(payload)
     });
-    alert(`일괄 변경 완료: ${r.updated}건`);
+    const failed = (r.invalid || []).map(x => `#${x.id}: ${x.error}`);
+    alert(`일괄 변경 완료: ${r.updated}건` + (failed.length ? `\n제외 ${failed.length}건\n` + failed.join("\n") : ""));
     await loadResults();
   } catch (e) {
     alert("일괄 변경 실패: " + e.message);
@@ -655,7 +734,7 @@ function initAdminDB() {
         body: JSON.stringify({ date: dateB.value, branch: selB.value, db_count: parseInt(cntB.value || "0", 10) })
       });
       alert("지점 DB 저장 완료");
-      await loadBranchList();
+      await Promise.all([loadBranchList(), loadGrid("branch")]);
     } catch (e) { alert("지점 DB 저장 실패: " + e.message); }
   });
 
@@ -666,34 +745,72 @@ function initAdminDB() {
         body: JSON.stringify({ date: dateT.value, team: selT.value, db_count: parseInt(cntT.value || "0", 10) })
       });
       alert("팀 DB 저장 완료");
-      await loadTeamList();
+      await Promise.all([loadTeamList(), loadGrid("team")]);
     } catch (e) { alert("팀 DB 저장 실패: " + e.message); }
   });
 
   btnLB?.addEventListener("click", loadBranchList);
   btnLT?.addEventListener("click", loadTeamList);
+  for (const kind of ["branch", "team"]) {
+    const monthEl = $(`#db-month-${kind}`);
+    if (!monthEl) continue;
+    monthEl.value = toMonthInput(today);
+    monthEl.addEventListener("change", () => loadGrid(kind));
+    $(`#db-grid-save-${kind}`)?.addEventListener("click", () => saveGrid(kind));
+    $(`#db-paste-save-${kind}`)?.addEventListener("click", () => savePaste(kind));
+    loadGrid(kind);
+  }
 
   loadBranchList();
   loadTeamList();
 
+  // 기간/지점·팀 필터는 서버에서 (정렬: 날짜 내림차순, 코드 오름차순)
+  function listParams(fromEl, toEl, key, value) {
+    const params = new URLSearchParams({ from_date: fromEl.value, to_date: toEl.value });
+    if (value) params.append(key, value);
+    return params.toString();
+  }
+  // 월 그리드: 날짜 × 지점/팀 (빈 칸 = 미입력)
+  async function loadGrid(kind) {
+    const table = $(`#db-grid-${kind}`), month = $(`#db-month-${kind}`)?.value;
+    if (!table || !month) return;
+    const g = await fetchJSON(`/api/${kind === "branch" ? "daily-db" : "daily-db-team"}/grid?month=${month}`).catch(() => null);
+    if (!g) { table.innerHTML = ""; return; }
+    table.innerHTML = `<thead><tr><th>날짜</th>${g.columns.map(c => `<th>${c.label}</th>`).join("")}</tr></thead>`
+      + `<tbody>${g.dates.map((d, i) => `<tr><td>${d}</td>${g.values[i].map((v, j) =>
+        `<td><input type="number" min="0" class="grid-cell" data-date="${d}" data-code="${g.columns[j].code}" data-orig="${v ?? ""}" value="${v ?? ""}"></td>`).join("")}</tr>`).join("")}</tbody>`
+      + `<tfoot><tr><th>합계</th>${g.totals.map(t => `<th>${t}</th>`).join("")}</tr></tfoot>`;
+  }
+  // 일괄 저장: 바뀐 칸만 모아 한 번에 (서버는 단일 트랜잭션 upsert)
+  async function postBulk(kind, body, contentType) {
+    try {
+      const r = await fetchJSON(`/api/${kind === "branch" ? "daily-db" : "daily-db-team"}/bulk`, {
+        method: "POST", headers: { "Content-Type": contentType }, body
+      });
+      alert(`저장 완료: 추가 ${r.inserted} / 변경 ${r.updated} / 동일 ${r.unchanged}`);
+      await Promise.all([kind === "branch" ? loadBranchList() : loadTeamList(), loadGrid(kind)]);
+      return true;
+    } catch (e) { alert("일괄 저장 실패: " + e.message); return false; }
+  }
+  async function saveGrid(kind) {
+    const items = $$(`#db-grid-${kind} .grid-cell`).filter(el => el.value !== "" && el.value !== el.dataset.orig)
+      .map(el => ({ date: el.dataset.date, [kind]: el.dataset.code, db_count: parseInt(el.value, 10) }));
+    if (!items.length) return alert("변경된 칸이 없습니다.");
+    await postBulk(kind, JSON.stringify(items), "application/json");
+  }
+  async function savePaste(kind) {
+    const ta = $(`#db-paste-${kind}`);
+    if (!ta?.value.trim()) return;
+    if (await postBulk(kind, ta.value, "text/csv")) ta.value = "";
+  }
   async function loadBranchList() {
     if (!tbodyB) return;
-    const all = await fetchJSON("/api/daily-db").catch(() => []);
-    const fromV = fromDateInput(fromB.value), toV = fromDateInput(toB.value), fb = fSelB.value;
-    const rows = all.filter(r => {
-      const d = fromDateInput(r.date);
-      return d >= fromV && d <= toV && (!fb || r.branch === fb);
-    }).sort((a, b) => (a.date === b.date ? a.branch.localeCompare(b.branch) : b.date.localeCompare(a.date)));
+    const rows = await fetchJSON("/api/daily-db?" + listParams(fromB, toB, "branch", fSelB.value)).catch(() => []);
     tbodyB.innerHTML = rows.map(r => `<tr><td>${r.date}</td><td>${r.branch}</td><td>${r.db_count}</td></tr>`).join("") || `<tr><td colspan="3">데이터 없음</td></tr>`;
   }
   async function loadTeamList() {
     if (!tbodyT) return;
-    const all = await fetchJSON("/api/daily-db-team").catch(() => []);
-    const fromV = fromDateInput(fromT.value), toV = fromDateInput(toT.value), ft = fSelT.value;
-    const rows = all.filter(r => {
-      const d = fromDateInput(r.date);
-      return d >= fromV && d <= toV && (!ft || r.team === ft);
-    }).sort((a, b) => (a.date === b.date ? a.team.localeCompare(b.team) : b.date.localeCompare(a.date)));
+    const rows = await fetchJSON("/api/daily-db-team?" + listParams(fromT, toT, "team", fSelT.value)).catch(() => []);
     tbodyT.innerHTML = rows.map(r => `<tr><td>${r.date}</td><td>${r.team}</td><td>${r.db_count}</td></tr>`).join("") || `<tr><td colspan="3">데이터 없음</td></tr>`;
   }
 }
@@ -804,20 +921,55 @@ async function loadAndRenderMonth() {
   const [y, m] = ym.split("-").map(Number);
   const first = new Date(y, m - 1, 1);
   const last = new Date(y, m, 0);
-  const from = toDateInput(first), to = toDateInput(last);
+  // 월 전체는 일자별 건수 요약만 받고, 상세는 날짜를 눌렀을 때 그 날만 조회
+  const params = monthParams(toDateInput(first), toDateInput(last));
+  const summary = await fetchJSON("/api/calendar/summary?" + params.toString()).catch(() => ({ days: {} }));
+  renderMonthGrid(summary.days, y, m - 1);
+}
 
+function monthParams(from, to) {
   const b = $("#mon-branch")?.value, t = $("#mon-team")?.value, c = $("#mon-counselor")?.value, mode = $("#mon-mode")?.value;
   const params = new URLSearchParams({ from_date: from, to_date: to });
   if (b) params.append("branch", b);
   if (t) params.append("team", t);
   if (c) params.append("counselor_id", c);
   if (mode) params.append("mode", mode);
+  return params;
+}
 
-  const list = await fetchJSON("/api/sessions?" + params.toString()).catch(() => []);
-  renderMonthGrid(list, y, m - 1);
+function renderMonthSummary(body, day, dateStr) {
+  body.innerHTML = "";
+  for (const [status, cnt] of Object.entries(day.status)) {
+    const item = document.createElement("div");
+    const col = statusColor(status);
+    item.className = "month-item";
+    item.style.background = col.bg;
+    item.style.borderColor = col.border;
+    item.textContent = `${STATUS_LABEL[status] || status} ${cnt}`;
+    item.title = "눌러서 일정 보기";
+    item.addEventListener("click", (e) => { e.stopPropagation(); loadMonthDay(body, dateStr); });
+    body.appendChild(item);
+  }
+}
+
+async function loadMonthDay(body, dateStr) {
+  const sessions = await fetchJSON("/api/sessions?" + monthParams(dateStr, dateStr).toString()).catch(() => []);
+  body.innerHTML = "";
+  const list = sessions.slice().sort((a, b) => a.start_time.localeCompare(b.start_time));
+  for (const ev of list) {
+    const item = document.createElement("div");
+    const col = statusColor(ev.status);
+    item.className = "month-item";
+    item.style.background = col.bg;
+    item.style.borderColor = col.border;
+    item.title = `#${ev.counselor_id} ${ev.start_time.slice(0, 5)}~${ev.end_time.slice(0, 5)} (${ev.status})`;
+    item.textContent = `${ev.start_time.slice(0, 5)} ${ev.status}`;
+    item.addEventListener("click", (e) => { e.stopPropagation(); openSessionModal(ev, "edit"); });
+    body.appendChild(item);
+  }
 }
 
-function renderMonthGrid(sessions, year, month) {
+function renderMonthGrid(days, year, month) {
   const grid = $("#month-grid");
   if (!grid) return;
   grid.innerHTML = "";
@@ -826,12 +978,6 @@ function renderMonthGrid(sessions, year, month) {
   const dim = daysInMonth(year, month);
   const totalCells = Math.ceil((fd + dim) / 7) * 7;
 
-  const byDate = new Map();
-  for (const s of sessions) {
-    if (!byDate.has(s.date)) byDate.set(s.date, []);
-    byDate.get(s.date).push(s);
-  }
-
   for (let i = 0; i < totalCells; i++) {
     const cell = document.createElement("div");
     cell.className = "month-cell";
@@ -848,18 +994,7 @@ function renderMonthGrid(sessions, year, month) {
     const body = document.createElement("div");
     body.className = "month-cell-body";
 
-    const list = (byDate.get(dateStr) || []).slice().sort((a, b) => a.start_time.localeCompare(b.start_time));
-    for (const ev of list) {
-      const item = document.createElement("div");
-      const col = statusColor(ev.status);
-      item.className = "month-item";
-      item.style.background = col.bg;
-      item.style.borderColor = col.border;
-      item.title = `#${ev.counselor_id} ${ev.start_time.slice(0, 5)}~${ev.end_time.slice(0, 5)} (${ev.status})`;
-      item.textContent = `${ev.start_time.slice(0, 5)} ${ev.status}`;
-      item.addEventListener("click", (e) => { e.stopPropagation(); openSessionModal(ev, "edit"); });
-      body.appendChild(item);
-    }
+    if (days[dateStr]) renderMonthSummary(body, days[dateStr], dateStr);
 
     cell.appendChild(header);
     cell.appendChild(body);
@@ -0,0 +1,197 @@
+# 엔드포인트 벤치마크 (프로세스 내 ASGI 호출, 네트워크 없음)
+#   pip install -r requirements-dev.txt                              # httpx (개발 전용 의존성)
+#   python -m app.tools.synth --db sqlite:///./bench.db --reset     # 먼저 데이터 생성
+#   python -m app.tools.bench --db sqlite:///./bench.db --out bench.json [--compare old.json]
+# 시나리오마다 지연 p50/p95/평균(ms)과 처리량(req/s)을 JSON 으로 남겨 실행 간 비교한다.
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+def _percentile(values: List[float], p: float) -> float:
+    s = sorted(values)
+    k = (len(s) - 1) * p
+    lo, hi = int(k), min(int(k) + 1, len(s) - 1)
+    return s[lo] + (s[hi] - s[lo]) * (k - lo)
+
+def _summary(lat: List[float], wall: float, errors: int) -> dict:
+    return {
+        "n": len(lat), "errors": errors,
+        "p50_ms": round(_percentile(lat, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(lat, 0.95) * 1000, 2),
+        "mean_ms": round(sum(lat) / len(lat) * 1000, 2),
+        "throughput_rps": round(len(lat) / wall, 1) if wall > 0 else None,
+    }
+
+async def _measure(client, make: Callable, iterations: int, warmup: int, concurrency: int, expect=(200,)) -> dict:
+    """make(i) → (method, url, kwargs). concurrency 개의 작업자가 iterations 를 나눠 수행."""
+    for i in range(warmup):
+        method, url, kw = make(-1 - i)
+        await client.request(method, url, **kw)
+    lat, errors = [], 0
+    counter = iter(range(iterations))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            method, url, kw = make(i)
+            t = time.perf_counter()
+            r = await client.request(method, url, **kw)
+            lat.append(time.perf_counter() - t)
+            if r.status_code not in expect:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return _summary(lat, time.perf_counter() - t0, errors)
+
+def _data_range():
+    from sqlalchemy import func
+    from app.db import SessionLocal
+    from app.models import Session as Sess, Counselor
+    with SessionLocal() as db:
+        lo, hi, n = db.query(func.min(Sess.date), func.max(Sess.date), func.count(Sess.id)).one()
+        counselors = db.query(Counselor.id, Counselor.branch, Counselor.team).filter(
+            Counselor.status == "ACTIVE").order_by(Counselor.id).all()
+    return lo, hi, n, counselors
+
+async def run(args) -> dict:
+    import httpx
+    from app.main import app, on_startup
+    from app.services.stats_cache import stats_cache
+
+    on_startup()
+    lo, hi, n_sessions, counselors = _data_range()
+    if not n_sessions:
+        raise SystemExit("세션이 없습니다. 먼저 python -m app.tools.synth 로 데이터를 만드세요.")
+    rng = random.Random(args.seed)
+    mid = lo + (hi - lo) // 2
+    it, wu, cc = args.iterations, args.warmup, args.concurrency
+
+    def day(i):   # 반복마다 다른 날짜 (캐시·페이지 캐시 편향 완화)
+        return mid + timedelta(days=(i * 7) % max(1, (hi - mid).days - 40))
+
+    results: Dict[str, dict] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        # --- 세션 목록: 기간별 ---
+        for name, span in (("list_sessions_day", 0), ("list_sessions_week", 6), ("list_sessions_month", 30)):
+            results[name] = await _measure(c, lambda i, s=span: (
+                "GET", "/api/sessions/", {"params": {"from_date": day(i).isoformat(),
+                                                   "to_date": (day(i) + timedelta(days=s)).isoformat()}}), it, wu, cc)
+        results["list_sessions_month_page100"] = await _measure(c, lambda i: (
+            "GET", "/api/sessions/", {"params": {"from_date": day(i).isoformat(),
+                                               "to_date": (day(i) + timedelta(days=30)).isoformat(), "limit": 100}}),
+            it, wu, cc)
+        results["get_session"] = await _measure(c, lambda i: (
+            "GET", f"/api/sessions/{rng.randint(1, n_sessions)}", {}), it, wu, cc)
+        results["list_counselors"] = await _measure(c, lambda i: ("GET", "/api/counselors/", {}), it, wu, cc)
+        results["list_daily_db_year"] = await _measure(c, lambda i: (
+            "GET", "/api/daily-db/", {"params": {"from_date": (hi - timedelta(days=365)).isoformat(),
+                                                 "to_date": hi.isoformat()}}), it, wu, cc)
+
+        # --- 통계: 캐시 미적중(매번 비움) / 적중 ---
+        for name, span in (("overview_30d", 30), ("overview_365d", 365)):
+            def make(i, s=span):
+                stats_cache.clear()
+                return "GET", "/api/stats/overview", {"params": {"from_date": (hi - timedelta(days=s)).isoformat(),
+                                                                 "to_date": hi.isoformat()}}
+            results[name + "_cold"] = await _measure(c, make, it, wu, 1)
+        results["overview_30d_cached"] = await _measure(c, lambda i: (
+            "GET", "/api/stats/overview", {"params": {"from_date": (hi - timedelta(days=30)).isoformat(),
+                                                      "to_date": hi.isoformat()}}), it, wu, cc)
+
+        # --- 불일치 페이지(HTML) ---
+        results["mismatch_30d"] = await _measure(c, lambda i: (
+            "GET", "/mismatch", {"params": {"from_date": (day(i) - timedelta(days=30)).isoformat(),
+                                            "to_date": day(i).isoformat()}}), max(1, it // 2), wu, cc)
+
+        # --- 일괄 상태 변경: 200건, DONE ↔ NOT_REGISTERED 번갈아 ---
+        r = await c.get("/api/sessions/", params={"from_date": (lo + timedelta(days=7)).isoformat(),
+                                                  "to_date": (lo + timedelta(days=60)).isoformat(),
+                                                  "status": "DONE", "fields": "id", "limit": 200})
+        batch_ids = [x["id"] for x in r.json()["items"]]
+        results["batch_update_status_200"] = await _measure(c, lambda i: (
+            "POST", "/api/sessions/batch/update-status",
+            {"json": {"ids": batch_ids, "status": "NOT_REGISTERED" if i % 2 == 0 else "DONE"}}), it, wu, 1)
+
+        # --- 세션 생성(중복 검사 포함): 빈 미래 날짜에 생성 후 측정 밖에서 삭제 ---
+        base = hi + timedelta(days=30)
+
+        def make_create(i):
+            # k 마다 서로 다른 (상담사, 일자, 1시간 칸): 상담사를 돌고, 한 바퀴마다 다음 칸(09~21시, 하루 12칸)
+            k = i if i >= 0 else 100_000 - i
+            cid, branch, team = counselors[k % len(counselors)]
+            slot = k // len(counselors)
+            return "POST", "/api/sessions/", {"json": {
+                "date": (base + timedelta(days=slot // 12)).isoformat(),
+                "start_time": f"{9 + slot % 12:02d}:00", "end_time": f"{10 + slot % 12:02d}:00",
+                "counselor_id": cid, "branch": branch, "team": team}}
+        results["create_session"] = await _measure(c, make_create, it, 0, 1)
+        # 같은 칸에 다시 → 겹침으로 거절되는 경로 (409)
+        results["create_session_overlap"] = await _measure(c, make_create, it, 0, 1, expect=(409,))
+        r = await c.get("/api/sessions/", params={"from_date": base.isoformat(), "fields": "id"})
+        created = [x["id"] for x in r.json()]
+        for sid in created:
+            await c.delete(f"/api/sessions/{sid}")
+
+    return results
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__)).stdout.strip()
+    except OSError:
+        return ""
+
+def _compare(current: dict, path: str):
+    with open(path, encoding="utf-8") as f:
+        old = json.load(f)["results"]
+    print(f"{'scenario':34} {'p50 old':>9} {'p50 new':>9} {'Δ%':>7} {'p95 old':>9} {'p95 new':>9}")
+    for name, r in current.items():
+        o = old.get(name)
+        if not o:
+            continue
+        delta = (r["p50_ms"] - o["p50_ms"]) / o["p50_ms"] * 100 if o["p50_ms"] else 0
+        print(f"{name:34} {o['p50_ms']:9.2f} {r['p50_ms']:9.2f} {delta:+7.1f} {o['p95_ms']:9.2f} {r['p95_ms']:9.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.tools.bench")
+    parser.add_argument("--db", default="sqlite:///./bench.db")
+    parser.add_argument("--out", default="bench.json")
+    parser.add_argument("--compare", help="이전 결과 JSON 과 p50/p95 비교 출력")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=1, help="읽기 시나리오 동시 작업자 수")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    os.environ["DATABASE_URL"] = args.db   # 앱 임포트 전에 지정
+    results = asyncio.run(run(args))
+    from app.db import DB_ASYNC
+    doc = {
+        "meta": {
+            "git": _git_rev(), "at": time.strftime("%Y-%m-%dT%H:%M:%S"), "db": args.db,
+            "db_async": DB_ASYNC, "python": platform.python_version(),
+            "iterations": args.iterations, "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, indent=2)
+    for name, r in results.items():
+        print(f"{name:34} p50 {r['p50_ms']:8.2f}ms  p95 {r['p95_ms']:8.2f}ms  {r['throughput_rps']:8.1f} req/s"
+              + (f"  errors {r['errors']}" if r["errors"] else ""))
+    if args.compare:
+        _compare(results, args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+# pytest 플러그인: 라우트에 선언한 쿼리 예산(@query_budget)과 N+1 을 테스트에서 검사
+#   pip install -r requirements-dev.txt   (pytest, TestClient 용 httpx)
+#   conftest.py:  pytest_plugins = ["app.tools.query_budget_plugin"]
+#
+#   def test_week(client, query_budget):
+#       client.get("/api/sessions/", params={...})      # 테스트 끝에 초과/N+1 이 있으면 실패
+#
+#   def test_mismatch_items(db, query_budget):
+#       with query_budget.limit(2):                     # 요청 밖 코드 블록에 직접 예산
+#           _mismatch_items(db, ...)
+#
+#   pytest --query-budget   → 모든 테스트에 자동 적용
+import pytest
+from app.services import query_guard
+
+class QueryBudgetChecker:
+    limit = staticmethod(query_guard.limit)
+
+    def __init__(self, violations):
+        self.violations = violations
+
+    def clear(self):
+        del self.violations[:]
+
+def pytest_addoption(parser):
+    parser.addoption("--query-budget", action="store_true", help="모든 테스트에 쿼리 예산/N+1 검사 적용")
+
+@pytest.fixture
+def query_budget():
+    with query_guard.collect() as found:
+        yield QueryBudgetChecker(found)
+    if found:
+        pytest.fail("쿼리 예산 초과:\n" + "\n".join(f"  {v}" for v in found), pytrace=False)
+
+@pytest.fixture(autouse=True)
+def _query_budget_everywhere(request):
+    if request.config.getoption("--query-budget") and "query_budget" not in request.fixturenames:
+        request.getfixturevalue("query_budget")
+    yield
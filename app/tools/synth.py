@@ -0,0 +1,163 @@
+# 합성 데이터 생성기 (결정적: 같은 시드·규모 → 같은 데이터)
+#   python -m app.tools.synth --db sqlite:///./bench.db --reset --counselors 30 --years 2 --seed 42
+# 실제 models.py 스키마에 적재하고, 앱 불변식(30분 격자, 상담사 시간 비중복, 상태별 필수값,
+# 지점-과목 일치)과 파생 테이블(슬롯 점유, 일별 롤업, 데이터 버전)까지 맞춘다.
+import argparse
+import os
+import random
+import sys
+import time as _time
+from datetime import date, time, timedelta
+from typing import Dict, List
+
+CHUNK = 2000
+
+# 과거 일정의 상태 분포 / 모드 분포
+PAST_STATUS = [("DONE", 25), ("REGISTERED", 20), ("NOT_REGISTERED", 30), ("CANCELED", 15), ("PENDING", 10)]
+FUTURE_STATUS = [("PENDING", 90), ("CANCELED", 10)]
+MODE_MIX = [("OFFLINE", 70), ("REMOTE", 30)]
+CANCEL_MIX = [("PERSONAL", 40), ("OTHER_INSTITUTE", 25), ("NO_ANSWER", 25), ("RESCHEDULE", 10)]
+DURATIONS = [(2, 70), (1, 20), (3, 10)]   # 슬롯 수(30분 단위)
+DAY_SLOTS = (18, 42)                       # 09:00 ~ 21:00
+NAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+
+def _pick(rng: random.Random, mix):
+    return rng.choices([v for v, _ in mix], weights=[w for _, w in mix])[0]
+
+def _slot_time(i: int) -> time:
+    return time(i // 2, 30 * (i % 2))
+
+def generate(engine, counselors: int = 30, years: float = 2.0, sessions_per_day: float = 4.0,
+             seed: int = 42, end: date = None) -> Dict[str, int]:
+    from sqlalchemy import insert
+    from sqlalchemy.orm import Session
+    from app.models import Branch, Team, Subject, Counselor, Session as Sess, SessionSlot, DailyDB, DailyDBTeam
+    from app.db import chunked
+    from app.services import rollup
+    from app.services.slot_claims import claim_rows
+    from app.services.versions import bump, SESSIONS, DAILY_DB, META
+
+    rng = random.Random(seed)
+    end = end or date(2026, 12, 31)
+    start = end - timedelta(days=int(365 * years))
+    today = end - timedelta(days=60)   # 마지막 두 달은 '미래' 일정
+
+    with Session(bind=engine) as db:
+        branches = [b.code for b in db.query(Branch).filter(Branch.active == True).order_by(Branch.id)]
+        teams = [t.code for t in db.query(Team).filter(Team.active == True).order_by(Team.id)]
+        subjects: Dict[str, List[int]] = {}
+        for sid, br in db.query(Subject.id, Subject.branch).filter(Subject.active == True).order_by(Subject.id):
+            subjects.setdefault(br, []).append(sid)
+
+        # 상담사: 지점·팀 라운드로빈
+        first_cid = (db.query(Counselor.id).order_by(Counselor.id.desc()).limit(1).scalar() or 0) + 1
+        cons = [{"id": first_cid + i, "name": f"{NAMES[i % len(NAMES)]}상담{i + 1:03d}",
+                 "branch": branches[i % len(branches)], "team": teams[i % len(teams)], "status": "ACTIVE"}
+                for i in range(counselors)]
+        db.execute(insert(Counselor), cons)
+
+        next_id = (db.query(Sess.id).order_by(Sess.id.desc()).limit(1).scalar() or 0) + 1
+        sessions, claims = [], []
+        n_sessions = 0
+
+        def flush():
+            nonlocal sessions, claims
+            for chunk in chunked(sessions, CHUNK):
+                db.execute(insert(Sess), chunk)
+            for chunk in chunked(claims, CHUNK):
+                db.execute(insert(SessionSlot), chunk)
+            sessions, claims = [], []
+
+        d = start
+        while d <= end:
+            weekday = d.weekday()
+            for c in cons:
+                if weekday == 6 or (weekday == 5 and rng.random() > 0.3):
+                    continue
+                n = max(0, round(rng.gauss(sessions_per_day, 1.2)))
+                cursor = DAY_SLOTS[0] + rng.randrange(0, 3)
+                for _ in range(n):
+                    cursor += rng.choice((0, 0, 1, 2))      # 사이 빈 시간
+                    dur = _pick(rng, DURATIONS)
+                    if cursor + dur > DAY_SLOTS[1]:
+                        break
+                    st, et = _slot_time(cursor), _slot_time(cursor + dur)
+                    cursor += dur
+                    status = _pick(rng, PAST_STATUS if d < today else FUTURE_STATUS)
+                    pool = subjects.get(c["branch"], [])
+                    req = rng.choice(pool) if pool and rng.random() < 0.85 else None
+                    reg = None
+                    if status == "REGISTERED" and pool:
+                        reg = req if req and rng.random() < 0.8 else rng.choice(pool)
+                    elif status == "REGISTERED":
+                        status = "DONE"
+                    sessions.append({
+                        "id": next_id, "date": d, "start_time": st, "end_time": et,
+                        "counselor_id": c["id"], "branch": c["branch"], "team": c["team"],
+                        "student_name": f"학생{next_id}",
+                        "requested_subject_id": req, "registered_subject_id": reg,
+                        "mode": _pick(rng, MODE_MIX), "status": status,
+                        "cancel_reason": _pick(rng, CANCEL_MIX) if status == "CANCELED" else None,
+                        "comment": None,
+                    })
+                    claims += claim_rows(next_id, c["id"], d, st, et)
+                    next_id += 1
+                    n_sessions += 1
+            if len(sessions) >= CHUNK * 5:
+                flush()
+            d += timedelta(days=1)
+        flush()
+
+        # 일별 DB: 모든 날짜 × 지점/팀 (주말은 적게)
+        daily, daily_team = [], []
+        d = start
+        while d <= end:
+            scale = 0.3 if d.weekday() >= 5 else 1.0
+            daily += [{"date": d, "branch": b, "db_count": int(rng.gauss(12, 4) * scale) if d < today else 0}
+                      for b in branches]
+            daily_team += [{"date": d, "team": t, "db_count": int(rng.gauss(8, 3) * scale) if d < today else 0}
+                           for t in teams]
+            d += timedelta(days=1)
+        for rows, model in ((daily, DailyDB), (daily_team, DailyDBTeam)):
+            for r in rows:
+                r["db_count"] = max(0, r["db_count"])
+            for chunk in chunked(rows, CHUNK):
+                db.execute(insert(model).prefix_with("OR REPLACE"), chunk)
+
+        agg_rows = rollup.rebuild(db)
+        bump(db, SESSIONS, DAILY_DB, META)
+        db.commit()
+    return {"counselors": counselors, "sessions": n_sessions, "daily_db": len(daily),
+            "daily_db_team": len(daily_team), "rollup_rows": agg_rows,
+            "from": start.isoformat(), "to": end.isoformat()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.tools.synth")
+    parser.add_argument("--db", default="sqlite:///./bench.db", help="대상 DATABASE_URL")
+    parser.add_argument("--reset", action="store_true", help="대상 SQLite 파일을 지우고 새로 생성")
+    parser.add_argument("--counselors", type=int, default=30)
+    parser.add_argument("--years", type=float, default=2.0)
+    parser.add_argument("--sessions-per-day", type=float, default=4.0, help="상담사 1인 근무일 평균")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=date.fromisoformat, default=date(2026, 12, 31), help="마지막 날짜")
+    args = parser.parse_args(argv)
+
+    if args.reset and args.db.startswith("sqlite:///") and ":memory:" not in args.db:
+        path = args.db[len("sqlite:///"):]
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    # 앱 엔진이 이 DB 를 쓰도록 임포트 전에 지정 → 스키마/마이그레이션/시드는 앱 기동 경로 그대로
+    os.environ["DATABASE_URL"] = args.db
+    from app.db import engine
+    from app.main import on_startup
+    on_startup()
+
+    t0 = _time.perf_counter()
+    result = generate(engine, args.counselors, args.years, args.sessions_per_day, args.seed, args.end)
+    result["seconds"] = round(_time.perf_counter() - t0, 2)
+    print(result)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+# 테스트 DB: 앱(설정·엔진)을 임포트하기 전에 임시 파일로 지정
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="schedule-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+
+pytest_plugins = ["app.tools.query_budget_plugin"]
@@ -0,0 +1,35 @@
+from datetime import date, time, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from app.db import SessionLocal
+from app.main import app
+from app.models import Session as Sess
+from app.services.availability import availability, WINDOW_FUTURE
+
+@pytest.fixture(scope="module")
+def db():
+    with TestClient(app), SessionLocal() as db:
+        yield db
+
+def _add(db, d, start, end, counselor_id=2):
+    s = Sess(date=d, start_time=start, end_time=end, counselor_id=counselor_id, branch="ATENZ", team="GANGNAM1")
+    db.add(s); db.commit()
+    return s
+
+def test_writes_outside_the_index_are_applied_from_the_change_log(db):
+    d = date.today() + timedelta(days=3)
+    availability.fresh(db)
+    s = _add(db, d, time(10, 0), time(11, 0))   # 인덱스를 거치지 않은 쓰기 (다른 워커)
+    assert availability.view(db, d, d).overlaps(2, d, time(10, 30), time(11, 0))
+    s.start_time, s.end_time = time(14, 0), time(15, 0); db.commit()
+    idx = availability.view(db, d, d)
+    assert not idx.overlaps(2, d, time(10, 30), time(11, 0))
+    assert idx.overlaps(2, d, time(14, 0), time(14, 30))
+    db.delete(s); db.commit()
+    assert not availability.view(db, d, d).overlaps(2, d, time(14, 0), time(14, 30))
+
+def test_dates_outside_the_window_are_read_from_the_db(db):
+    d = date.today() + timedelta(days=WINDOW_FUTURE + 30)
+    s = _add(db, d, time(9, 0), time(10, 0))
+    assert s.id not in availability.fresh(db)._where   # 창 밖은 메모리에 두지 않음
+    assert availability.view(db, d, d).overlaps(2, d, time(9, 30), time(10, 0))
@@ -0,0 +1,56 @@
+# 달력 요약: 일별 상태·모드 건수 (롤업 경로와 상담사별 원본 경로가 같은 수를 내는지)
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+ROWS = [  # (날짜, 시작, 상담사, 지점, 팀, 상태, 모드)
+    ("2028-05-02", "09:00", 1, "KH", "JONGNO", "DONE", "OFFLINE"),
+    ("2028-05-02", "10:00", 1, "KH", "JONGNO", "PENDING", "REMOTE"),
+    ("2028-05-02", "09:00", 2, "ATENZ", "GANGNAM1", "DONE", "OFFLINE"),
+    ("2028-05-31", "09:00", 2, "ATENZ", "GANGNAM1", "CANCELED", "OFFLINE"),
+]
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        for d, start, cid, branch, team, status, mode in ROWS:
+            r = c.post("/api/sessions/", json={"date": d, "start_time": start, "end_time": start[:2] + ":30",
+                                                "counselor_id": cid, "branch": branch, "team": team,
+                                                "status": status, "mode": mode, "cancel_reason": "변경"})
+            assert r.status_code == 200, r.text
+        yield c
+
+def _days(client, **params):
+    r = client.get("/api/calendar/summary", params={"from_date": "2028-05-01", **params})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+def test_month_counts(client):
+    body = _days(client)
+    assert body["to"] == "2028-05-31"   # 시작일만 주면 그 달 말일까지
+    assert body["days"] == {
+        "2028-05-02": {"total": 3, "status": {"DONE": 2, "PENDING": 1}, "mode": {"OFFLINE": 2, "REMOTE": 1}},
+        "2028-05-31": {"total": 1, "status": {"CANCELED": 1}, "mode": {"OFFLINE": 1}},
+    }
+
+def test_filters(client):
+    assert _days(client, branch="KH")["days"] == {
+        "2028-05-02": {"total": 2, "status": {"DONE": 1, "PENDING": 1}, "mode": {"OFFLINE": 1, "REMOTE": 1}}}
+    assert _days(client, status="DONE")["days"]["2028-05-02"]["total"] == 2
+    assert _days(client, counselor_id=2)["days"] == {
+        "2028-05-02": {"total": 1, "status": {"DONE": 1}, "mode": {"OFFLINE": 1}},
+        "2028-05-31": {"total": 1, "status": {"CANCELED": 1}, "mode": {"OFFLINE": 1}},
+    }
+
+def test_by_counselor_matches_rollup(client):
+    plain, split = _days(client)["days"], _days(client, by_counselor=True)["days"]
+    counselors = {d: day.pop("counselors") for d, day in split.items()}
+    assert split == plain
+    assert counselors["2028-05-02"] == {
+        "1": {"total": 2, "status": {"DONE": 1, "PENDING": 1}, "mode": {"OFFLINE": 1, "REMOTE": 1}},
+        "2": {"total": 1, "status": {"DONE": 1}, "mode": {"OFFLINE": 1}},
+    }
+
+def test_range_limit(client):
+    r = client.get("/api/calendar/summary", params={"from_date": "2028-01-01", "to_date": "2028-05-31"})
+    assert r.status_code == 400
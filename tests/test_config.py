@@ -0,0 +1,18 @@
+# PRAGMA 문·엔진 URL 에 그대로 들어가는 설정은 기동 시 바로 거부
+import pytest
+from app.config import Settings
+
+@pytest.mark.parametrize("value", ["NORMAL; PRAGMA foreign_keys=OFF", "2", ""])
+def test_bad_synchronous_fails_fast(value):
+    with pytest.raises(ValueError, match="SQLITE_SYNCHRONOUS"):
+        Settings(sqlite_synchronous=value)
+
+def test_non_sqlite_url_fails_fast():
+    with pytest.raises(ValueError, match="READ_DATABASE_URL"):
+        Settings(read_database_url="postgresql://db/app")
+
+def test_bad_int_pragma_fails_fast(monkeypatch):
+    from app.config import _int
+    monkeypatch.setenv("SQLITE_CACHE_SIZE", "-2000; PRAGMA x")
+    with pytest.raises(ValueError, match="SQLITE_CACHE_SIZE"):
+        _int("SQLITE_CACHE_SIZE", -20000)
@@ -0,0 +1,53 @@
+# 일별 DB 목록(키셋 페이지)과 월 그리드
+import base64
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+RANGE = {"from_date": "2028-06-01", "to_date": "2028-06-05"}
+CODES = ["KH", "ATENZ", "VIDEO"]
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        items = [{"date": f"2028-06-0{d}", "branch": b, "db_count": d * 10 + i}
+                 for d in range(1, 6) for i, b in enumerate(CODES) if (d, b) != (3, "ATENZ")]
+        r = c.post("/api/daily-db/bulk", json=items)
+        assert r.status_code == 200 and r.json()["inserted"] == 14, r.text
+        yield c
+
+@pytest.mark.parametrize("page_size", [1, 2, 4, 14, 100])
+def test_pages_equal_full_listing(client, page_size):
+    full = client.get("/api/daily-db/", params=RANGE).json()
+    assert [(r["date"], r["branch"]) for r in full[:4]] == [
+        ("2028-06-05", "ATENZ"), ("2028-06-05", "KH"), ("2028-06-05", "VIDEO"), ("2028-06-04", "ATENZ")]
+    assert len(full) == 14
+    items, cursor = [], None
+    while True:
+        body = client.get("/api/daily-db/", params={**RANGE, "limit": page_size,
+                                                    **({"cursor": cursor} if cursor else {})}).json()
+        items += body["items"]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert items == full
+
+def test_bad_cursor_is_400(client):
+    cursor = base64.urlsafe_b64encode(b'["2028-06-01"]').decode()
+    r = client.get("/api/daily-db/", params={**RANGE, "cursor": cursor})
+    assert r.status_code == 400 and r.json()["detail"] == "잘못된 커서입니다."
+
+def test_month_grid(client):
+    body = client.get("/api/daily-db/grid", params={"month": "2028-06"}).json()
+    assert (body["from"], body["to"], len(body["dates"])) == ("2028-06-01", "2028-06-30", 30)
+    col = {c["code"]: i for i, c in enumerate(body["columns"])}
+    assert [body["values"][2][col[b]] for b in CODES] == [30, None, 32]   # 입력 안 한 칸은 null
+    assert body["values"][5] == [None] * len(col)
+    assert [body["totals"][col[b]] for b in CODES] == [150, 124, 160]
+
+def test_grid_filter_and_range(client):
+    body = client.get("/api/daily-db/grid", params={**RANGE, "branch": "ATENZ"}).json()
+    assert [c["code"] for c in body["columns"]] == ["ATENZ"]
+    assert body["values"] == [[11], [21], [None], [41], [51]] and body["totals"] == [124]
+    assert client.get("/api/daily-db/grid", params={"month": "2028-13"}).status_code == 400
+    assert client.get("/api/daily-db/grid", params={"from_date": "2028-01-01", "to_date": "2028-06-30"}).status_code == 400
@@ -0,0 +1,57 @@
+# 일별 DB 일괄 저장: 신규/변경/동일 건수, 같은 키 중복은 마지막 값, 변경 없으면 버전 그대로
+import pytest
+from fastapi.testclient import TestClient
+from app.db import SessionLocal
+from app.main import app
+from app.services.versions import current, DAILY_DB
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+def _bulk(client, url, **kw):
+    r = client.post(url, **kw)
+    assert r.status_code == 200, r.text
+    return {k: r.json()[k] for k in ("total", "inserted", "updated", "unchanged")}
+
+def _version():
+    with SessionLocal() as db:
+        return current(db, DAILY_DB)
+
+def _stored(client, url, **params):
+    return {(r["date"], r.get("branch") or r.get("team")): r["db_count"] for r in client.get(url, params=params).json()}
+
+def test_counts_and_last_value_wins(client):
+    url = "/api/daily-db-team/bulk"
+    first = [{"date": "2028-07-01", "team": t, "db_count": 5} for t in ("JONGNO", "DANGSAN", "GANGNAM1")]
+    assert _bulk(client, url, json=first) == {"total": 3, "inserted": 3, "updated": 0, "unchanged": 0}
+
+    v = _version()
+    assert _bulk(client, url, json=first) == {"total": 3, "inserted": 0, "updated": 0, "unchanged": 3}
+    assert _version() == v   # 바뀐 게 없으면 통계 캐시도 그대로
+
+    again = [{"date": "2028-07-01", "team": "JONGNO", "db_count": 6},
+             {"date": "2028-07-01", "team": "JONGNO", "db_count": 7},     # 같은 키: 마지막 값
+             {"date": "2028-07-01", "team": "DANGSAN", "db_count": 5},
+             {"date": "2028-07-02", "team": "GANGNAM2", "db_count": 0}]
+    assert _bulk(client, url, json=again) == {"total": 3, "inserted": 1, "updated": 1, "unchanged": 1}
+    assert _version() > v
+    assert _stored(client, "/api/daily-db-team/", from_date="2028-07-01", to_date="2028-07-02") == {
+        ("2028-07-01", "JONGNO"): 7, ("2028-07-01", "DANGSAN"): 5, ("2028-07-01", "GANGNAM1"): 5,
+        ("2028-07-02", "GANGNAM2"): 0}
+
+def test_wide_paste(client):
+    text = "date\tKH\tATENZ\n2028-07-03\t1,200\t\n2028-07-04\t3\t4\n"
+    counts = _bulk(client, "/api/daily-db/bulk", content=text.encode(), headers={"content-type": "text/plain"})
+    assert counts == {"total": 3, "inserted": 3, "updated": 0, "unchanged": 0}   # 빈 칸은 건너뜀
+    assert _stored(client, "/api/daily-db/", from_date="2028-07-03", to_date="2028-07-04") == {
+        ("2028-07-03", "KH"): 1200, ("2028-07-04", "KH"): 3, ("2028-07-04", "ATENZ"): 4}
+
+def test_rejects_whole_batch(client):
+    r = client.post("/api/daily-db/bulk", json=[{"date": "2028-07-05", "branch": "KH", "db_count": 1},
+                                                {"date": "2028-07-05", "branch": "NOPE", "db_count": 1}])
+    assert r.status_code == 400 and "NOPE" in r.json()["detail"]
+    r = client.post("/api/daily-db/bulk", json=[{"date": "2028-07-05", "branch": "KH", "db_count": -1}])
+    assert r.status_code == 400 and r.json()["detail"]["errors"][0]["line"] == 1
+    assert _stored(client, "/api/daily-db/", from_date="2028-07-05", to_date="2028-07-05") == {}
@@ -0,0 +1,13 @@
+# /metrics 라우트 라벨: 접두사까지 포함한 템플릿 (같은 하위 경로를 가진 라우터끼리 섞이지 않게)
+from fastapi.testclient import TestClient
+from app.main import app
+
+def test_route_labels_are_full_templates():
+    with TestClient(app) as c:
+        for url in ("/api/daily-db/grid", "/api/daily-db-team/grid", "/api/sessions/999999999", "/health", "/nope"):
+            c.get(url)
+        text = c.get("/metrics").text
+    for label in ('route="/api/daily-db/grid"', 'route="/api/daily-db-team/grid"',
+                  'route="/api/sessions/{session_id}"', 'route="/health"', 'route="<unmatched>"'):
+        assert f'http_requests_total{{method="GET",{label}' in text
+    assert 'route="/grid"' not in text
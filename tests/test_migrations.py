@@ -0,0 +1,40 @@
+from datetime import date
+import pytest
+from sqlalchemy import create_engine, text
+from app.migrations import DuplicateKeysError, dedupe, migrate
+
+@pytest.fixture
+def legacy(tmp_path):
+    # 유니크 인덱스 이전의 daily_db: 같은 (날짜, 지점)이 여러 행
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE daily_db (id INTEGER PRIMARY KEY, date DATE NOT NULL, "
+                          "branch VARCHAR NOT NULL, db_count INTEGER NOT NULL)"))
+        conn.execute(text("INSERT INTO daily_db (date, branch, db_count) VALUES "
+                          "('2026-03-02', 'KH', 3), ('2026-03-02', 'KH', 4), ('2026-03-02', 'ATENZ', 5)"))
+    return engine
+
+def _rows(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT id, date, branch, db_count FROM daily_db ORDER BY id")).all()
+
+def test_startup_refuses_duplicates_without_touching_data(legacy):
+    before = _rows(legacy)
+    with pytest.raises(DuplicateKeysError, match="date=2026-03-02, branch=KH: 2행"):
+        migrate(legacy)
+    assert _rows(legacy) == before
+
+def test_dedupe_reports_then_merges(legacy):
+    before = _rows(legacy)
+    changes = dedupe(legacy, "sum")
+    assert changes == [{"table": "daily_db", "key": {"date": date(2026, 3, 2), "branch": "KH"}, "ids": [1, 2],
+                        "values": [3, 4], "kept_id": 2, "value": 7}]
+    assert _rows(legacy) == before   # --apply 없이는 그대로
+
+    dedupe(legacy, "sum", apply=True)
+    assert _rows(legacy) == [(2, "2026-03-02", "KH", 7), (3, "2026-03-02", "ATENZ", 5)]
+    migrate(legacy)   # 이제 인덱스 생성 가능
+
+def test_dedupe_latest_keeps_newest_value(legacy):
+    dedupe(legacy, "latest", apply=True)
+    assert _rows(legacy)[0] == (2, "2026-03-02", "KH", 4)
@@ -0,0 +1,48 @@
+# 다른 워커(같은 DB, 별도 프로세스)의 기준정보 변경이 주기 점검(30초)을 기다리지 않고 반영되는지
+import pytest
+from fastapi.testclient import TestClient
+from app.db import SessionLocal
+from app.main import app
+from app.models import Branch
+from app.services.query_guard import limit
+from app.services.registry import registry
+from app.services.validators import validate_branch_team
+from app.services.versions import bump, META
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+def _other_worker(fn):
+    # 라우터를 거치지 않은 meta 쓰기: 이 프로세스의 registry 는 모른다
+    with SessionLocal() as db:
+        fn(db)
+        bump(db, META)
+        db.commit()
+
+def test_branch_added_elsewhere_is_accepted(client):
+    with SessionLocal() as db:
+        registry.refresh(db)
+        _other_worker(lambda w: w.add(Branch(code="PANGYO", label_ko="판교", active=True)))
+        validate_branch_team(db, branch="PANGYO", team="JONGNO")
+
+def test_branch_deactivated_elsewhere_is_rejected(client):
+    with SessionLocal() as db:
+        registry.refresh(db)
+    _other_worker(lambda w: w.query(Branch).filter(Branch.code == "VIDEO").update({"active": False}))
+    try:
+        r = client.post("/api/sessions/", json={"date": "2027-03-02", "start_time": "10:00", "end_time": "11:00",
+                                                "counselor_id": 3, "branch": "VIDEO", "team": "DANGSAN"})
+        assert r.status_code == 400 and "지점" in r.json()["detail"]
+    finally:
+        _other_worker(lambda w: w.query(Branch).filter(Branch.code == "VIDEO").update({"active": True}))
+
+def test_unknown_ids_are_checked_once_per_snapshot(client):
+    with SessionLocal() as db:
+        registry.refresh(db)
+        with limit(2):   # 버전 확인 + IN 조회 한 번
+            assert registry.resolve(db, "subjects", [10 ** 9, 10 ** 9 + 1]).find("subjects", 10 ** 9) is None
+        with limit(0):   # 같은 스냅샷에서 다시 물으면 쿼리 없음
+            assert registry.subject(db, 10 ** 9 + 1) is None
+            assert registry.subject(db, 10 ** 9) is None
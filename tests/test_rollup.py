@@ -0,0 +1,52 @@
+# 세션 쓰기 경로마다 일별 롤업이 원본 재집계(rollup.verify)와 일치하는지
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from app.db import SessionLocal
+from app.main import app
+from app.models import SessionDailyAgg as Agg
+from app.services import rollup
+
+DAY = "2028-03-06"
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+def _create(client, start, end, **kw):
+    r = client.post("/api/sessions/", json={"date": DAY, "start_time": start, "end_time": end,
+                                            "counselor_id": 1, "branch": "KH", "team": "JONGNO", **kw})
+    assert r.status_code == 200, r.text
+    return r.json()["id"]
+
+def _check(expected_total):
+    with SessionLocal() as db:
+        assert rollup.verify(db) == []
+        total = db.query(func.coalesce(func.sum(Agg.count), 0)).filter(Agg.date == DAY).scalar()
+        assert total == expected_total
+
+def test_rollup_tracks_every_write_path(client):
+    a = _create(client, "09:00", "10:00")
+    b = _create(client, "10:00", "11:00", status="DONE")
+    c = _create(client, "11:00", "12:00", mode="REMOTE")
+    _check(3)
+
+    assert client.put(f"/api/sessions/{a}", json={"status": "REGISTERED", "registered_subject_id": 1}).status_code == 200
+    assert client.put(f"/api/sessions/{c}", json={"mode": "OFFLINE", "start_time": "15:00", "end_time": "16:00"}).status_code == 200
+    _check(3)
+
+    r = client.post("/api/sessions/batch/update-status", json={"ids": [a, b], "status": "CANCELED",
+                                                                "cancel_reason": "일괄"})
+    assert r.status_code == 200, r.text
+    _check(3)
+
+    csv_data = (f"date,start_time,end_time,counselor_id,branch,team,status\n"
+                f"{DAY},13:00,14:00,1,KH,JONGNO,DONE\n{DAY},14:00,15:00,1,KH,JONGNO,PENDING\n")
+    r = client.post("/api/sessions/import", files={"file": ("a.csv", csv_data.encode(), "text/csv")})
+    assert r.json()["inserted"] == 2, r.text
+    _check(5)
+
+    for sid in (a, c):
+        assert client.delete(f"/api/sessions/{sid}").status_code == 200
+    _check(3)
@@ -0,0 +1,45 @@
+from datetime import date, time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.main import app
+from app.migrations import ensure_schema
+from app.models import Session as Sess, SessionChange
+
+FINGERPRINT = 1
+
+def _log(engine):
+    with Session(engine) as db:
+        return [(r.session_id, r.deleted) for r in db.query(SessionChange).order_by(SessionChange.id)]
+
+def _write_through_orm(engine):
+    with Session(engine) as db:
+        s = Sess(date=date(2027, 5, 3), start_time=time(10, 0), end_time=time(11, 0), counselor_id=1,
+                 branch="KH", team="JONGNO")
+        db.add(s); db.commit()
+        sid = s.id
+        assert _log(engine)[-1] == (sid, False)
+        s.comment = "수정"; db.commit()
+        assert _log(engine)[-1] == (sid, False)
+        db.delete(s); db.commit()
+        assert _log(engine)[-1] == (sid, True)   # 세션당 최신 1건: 삭제 툼스톤만 남음
+        assert [r for r in _log(engine) if r[0] == sid] == [(sid, True)]
+
+def test_triggers_on_fresh_and_warm_started_db(tmp_path):
+    url = f"sqlite:///{tmp_path / 'feed.db'}"
+    fresh = create_engine(url)
+    assert ensure_schema(fresh, FINGERPRINT) == "migrated"
+    _write_through_orm(fresh)
+    fresh.dispose()
+
+    warm = create_engine(url)   # 재기동: 스탬프 일치로 migrate 생략
+    assert ensure_schema(warm, FINGERPRINT) == "current"
+    _write_through_orm(warm)
+
+@pytest.mark.parametrize("cursor", ["bad",
+                                    # 세션 목록 커서(3요소)는 피드 커서가 아니다
+                                    "WyIyMDI2LTAxLTAxIiwgIjEwOjAwOjAwIiwgMV0"])
+def test_foreign_cursor_is_rejected(cursor):
+    with TestClient(app) as c:
+        assert c.get("/api/sessions/changes", params={"cursor": cursor}).status_code == 400
@@ -0,0 +1,52 @@
+from datetime import date, time
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import session_import
+from app.services.session_import import sweep_overlaps
+
+KEY = (1, date(2026, 3, 2))
+
+def test_import_row_starting_before_existing_session():
+    conflicts = sweep_overlaps({KEY: [(time(10, 0), time(11, 0), 2)]}, {KEY: [(time(10, 30), time(11, 30), 99)]})
+    assert conflicts == {2: "동일 상담사의 시간이 겹칩니다. (세션 #99)"}
+
+def test_import_row_starting_inside_existing_session():
+    conflicts = sweep_overlaps({KEY: [(time(10, 30), time(11, 30), 2)]}, {KEY: [(time(10, 0), time(11, 0), 99)]})
+    assert conflicts == {2: "동일 상담사의 시간이 겹칩니다. (세션 #99)"}
+
+def test_rows_rejected_only_by_a_rejected_row_are_kept():
+    # 3행은 세션과 겹쳐 빠지므로 3행과만 겹치는 4행은 유효
+    batch = {KEY: [(time(9, 0), time(10, 0), 3), (time(9, 30), time(10, 0), 4)]}
+    existing = {KEY: [(time(8, 30), time(9, 30), 99)]}
+    assert sweep_overlaps(batch, existing) == {3: "동일 상담사의 시간이 겹칩니다. (세션 #99)"}
+
+def test_overlap_within_batch_keeps_earlier_row():
+    batch = {KEY: [(time(9, 30), time(10, 30), 5), (time(9, 0), time(10, 0), 6), (time(10, 0), time(11, 0), 7)]}
+    assert sweep_overlaps(batch, {}) == {5: "동일 상담사의 시간이 겹칩니다. (6행)"}
+
+def test_row_overlapping_a_row_accepted_in_an_earlier_chunk():
+    accepted = {}
+    assert sweep_overlaps({KEY: [(time(10, 0), time(11, 0), 2)]}, {}, accepted) == {}
+    # 다음 청크: 2행과 겹치면 먼저 시작하더라도 이미 채택(적재)된 2행이 남는다
+    later = {KEY: [(time(9, 30), time(10, 30), 3), (time(11, 0), time(12, 0), 4)]}
+    assert sweep_overlaps(later, {}, accepted) == {3: "동일 상담사의 시간이 겹칩니다. (2행)"}
+    assert accepted == {KEY: [(time(10, 0), time(11, 0), 2), (time(11, 0), time(12, 0), 4)]}
+
+def test_chunked_import_reports_like_a_single_chunk(monkeypatch):
+    lines = ["date,start_time,end_time,counselor_id,branch,team,status"]
+    lines += [f"2028-08-0{d},{h}:00,{h + 1}:00,1,KH,JONGNO,PENDING" for d in (1, 2) for h in (10, 11, 12)]
+    lines += ["2028-08-01,10:30,11:30,1,KH,JONGNO,PENDING", "2028-08-02,12:00,12:45,1,KH,JONGNO,PENDING",
+              "2028-08-01,13:00,14:00,9,KH,JONGNO,PENDING"]
+    body = ("\n".join(lines) + "\n").encode()
+
+    def run():
+        r = client.post("/api/sessions/import", params={"dry_run": True}, files={"file": ("a.csv", body, "text/csv")})
+        assert r.status_code == 200, r.text
+        return r.json()
+
+    with TestClient(app) as client:
+        whole = run()
+        monkeypatch.setattr(session_import, "CHUNK", 2)
+        assert run() == whole
+    assert (whole["total"], whole["valid"]) == (9, 6)
+    assert [e["line"] for e in whole["errors"]] == [8, 9, 10]
@@ -0,0 +1,40 @@
+# 같은 겹침은 사전 검사(비트맵)에서 걸리든, 사전 검사를 통과하고 슬롯 점유에서 지든 같은 409
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.routers import sessions
+
+DAY = "2027-04-05"
+
+def _create(client, start, end):
+    return client.post("/api/sessions/", json={"date": DAY, "start_time": start, "end_time": end,
+                                               "counselor_id": 1, "branch": "KH", "team": "JONGNO"})
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        r = _create(c, "10:00", "11:00")
+        assert r.status_code == 200, r.text
+        c.existing = r.json()["id"]
+        yield c
+
+@pytest.fixture(params=["pre_check", "race_loser"])
+def path(request, monkeypatch):
+    if request.param == "race_loser":
+        # 동시 요청이 사전 검사를 함께 통과한 경우: DB 슬롯 점유 충돌로만 걸린다
+        monkeypatch.setattr(sessions, "check_overlap", lambda *a, **kw: False)
+    return request.param
+
+def test_create_overlap_is_409(client, path):
+    r = _create(client, "10:30", "11:30")
+    assert r.status_code == 409
+    assert r.json()["detail"] == f"동일 상담사의 시간이 겹칩니다. (세션 #{client.existing} 10:00~11:00)"
+
+def test_update_overlap_is_409(client, path):
+    other = _create(client, "13:00", "14:00").json()["id"]
+    try:
+        r = client.put(f"/api/sessions/{other}", json={"start_time": "10:00", "end_time": "11:00"})
+        assert r.status_code == 409
+        assert f"세션 #{client.existing}" in r.json()["detail"]
+    finally:
+        client.delete(f"/api/sessions/{other}")
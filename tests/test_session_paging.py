@@ -0,0 +1,51 @@
+# 키셋 페이지: 커서로 끝까지 넘긴 결과 = 페이지 없는 전체 목록 (같은 날짜·시각은 id 로 구분)
+import base64
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+RANGE = {"from_date": "2028-02-01", "to_date": "2028-02-05"}
+STAFF = [(1, "KH", "JONGNO"), (2, "ATENZ", "GANGNAM1"), (3, "VIDEO", "DANGSAN")]
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        for day in range(5, 0, -1):   # 삽입 순서 ≠ 정렬 순서
+            for start, end in (("14:00", "15:00"), ("10:00", "11:00")):
+                for cid, branch, team in STAFF:
+                    r = c.post("/api/sessions/", json={"date": f"2028-02-0{day}", "start_time": start, "end_time": end,
+                                                       "counselor_id": cid, "branch": branch, "team": team})
+                    assert r.status_code == 200, r.text
+        yield c
+
+@pytest.mark.parametrize("page_size", [1, 4, 7, 30, 100])
+def test_pages_equal_full_listing(client, page_size):
+    full = client.get("/api/sessions/", params=RANGE).json()
+    assert len(full) == 30
+    items, cursor = [], None
+    while True:
+        body = client.get("/api/sessions/", params={**RANGE, "limit": page_size,
+                                                    **({"cursor": cursor} if cursor else {})}).json()
+        assert len(body["items"]) <= page_size
+        items += body["items"]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert items == full
+
+def test_pages_with_projection_and_filter(client):
+    params = {**RANGE, "counselor_id": 2, "fields": "id,status"}
+    full = client.get("/api/sessions/", params=params).json()
+    first = client.get("/api/sessions/", params={**params, "limit": 6}).json()
+    rest = client.get("/api/sessions/", params={**params, "cursor": first["next_cursor"]}).json()
+    assert first["items"] + rest["items"] == full and len(full) == 10
+    assert set(full[0]) == {"id", "status"}
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+@pytest.mark.parametrize("cursor", ["!!!", _b64(b"not json"), _b64(b"[1]"), _b64(b'["2028-02-01", "10:00"]'),
+                                    _b64(b'["2028-13-01", "10:00", 1]')])
+def test_bad_cursor_is_400(client, cursor):
+    r = client.get("/api/sessions/", params={**RANGE, "limit": 5, "cursor": cursor})
+    assert r.status_code == 400 and r.json()["detail"] == "잘못된 커서입니다."
@@ -0,0 +1,39 @@
+# 통계 캐시: 같은 조회는 캐시에서, 세션·DB 수 쓰기 뒤에는 새로 계산
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.stats_cache import stats_cache
+
+RANGE = {"from_date": "2028-01-01", "to_date": "2028-01-31", "branch": "KH"}
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+def _kh(client):
+    before = stats_cache.stats()
+    r = client.get("/api/stats/overview", params=RANGE)
+    assert r.status_code == 200
+    after = stats_cache.stats()
+    (row,) = r.json()["branch_stats"]
+    return row, after["hits"] - before["hits"]
+
+def test_write_invalidates_cached_overview(client):
+    _kh(client)
+    row, hit = _kh(client)
+    assert hit == 1 and row["counseling"] == 0 and row["total_db"] == 0
+
+    r = client.post("/api/sessions/", json={"date": "2028-01-10", "start_time": "10:00", "end_time": "11:00",
+                                            "counselor_id": 1, "branch": "KH", "team": "JONGNO", "status": "DONE"})
+    assert r.status_code == 200, r.text
+    row, hit = _kh(client)
+    assert hit == 0 and row["counseling"] == 1
+
+    assert client.post("/api/daily-db/", json={"date": "2028-01-10", "branch": "KH", "db_count": 4}).status_code == 200
+    row, hit = _kh(client)
+    assert hit == 0 and row["total_db"] == 4 and row["counseling_rate"] == 0.25
+
+    assert client.delete(f"/api/sessions/{r.json()['id']}").status_code == 200
+    row, hit = _kh(client)
+    assert hit == 0 and row["counseling"] == 0
@@ -0,0 +1,52 @@
+# 시계열 구간 경계: SQL 구간 키(strftime/weekday)와 파이썬 구간 목록이 같은 날짜를 같은 칸에 넣는지
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.routers.stats import MAX_BUCKETS
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        # 일요일/월요일 (주 경계), 윤년 2월 말일/3월 1일 (월 경계)
+        for day, start in (("2028-04-09", "09:00"), ("2028-04-10", "09:00"), ("2028-04-10", "11:00"),
+                           ("2028-02-29", "09:00"), ("2028-03-01", "09:00")):
+            r = c.post("/api/sessions/", json={"date": day, "start_time": start, "end_time": start[:2] + ":30",
+                                                "counselor_id": 1, "branch": "KH", "team": "JONGNO", "status": "DONE"})
+            assert r.status_code == 200, r.text
+        yield c
+
+def _total(client, **params):
+    r = client.get("/api/stats/timeseries", params={"branch": "KH", **params})
+    assert r.status_code == 200, r.text
+    return [(p["bucket"], p["from"], p["to"], p["counseling"]) for p in r.json()["total"]]
+
+def test_week_buckets_start_on_monday_and_clip_to_range(client):
+    assert _total(client, from_date="2028-04-05", to_date="2028-04-18", granularity="week") == [
+        ("2028-04-03", "2028-04-05", "2028-04-09", 1),
+        ("2028-04-10", "2028-04-10", "2028-04-16", 2),
+        ("2028-04-17", "2028-04-17", "2028-04-18", 0),
+    ]
+
+def test_month_buckets_end_on_last_day(client):
+    assert _total(client, from_date="2028-01-31", to_date="2028-03-01", granularity="month") == [
+        ("2028-01", "2028-01-31", "2028-01-31", 0),
+        ("2028-02", "2028-02-01", "2028-02-29", 1),
+        ("2028-03", "2028-03-01", "2028-03-01", 1),
+    ]
+
+def test_day_buckets_include_empty_days(client):
+    assert _total(client, from_date="2028-04-08", to_date="2028-04-11") == [
+        ("2028-04-08", "2028-04-08", "2028-04-08", 0),
+        ("2028-04-09", "2028-04-09", "2028-04-09", 1),
+        ("2028-04-10", "2028-04-10", "2028-04-10", 2),
+        ("2028-04-11", "2028-04-11", "2028-04-11", 0),
+    ]
+
+def test_bucket_limit(client):
+    ok = client.get("/api/stats/timeseries", params={"from_date": "2027-01-01", "to_date": "2028-02-04"})
+    assert ok.status_code == 200 and len(ok.json()["total"]) == MAX_BUCKETS
+    r = client.get("/api/stats/timeseries", params={"from_date": "2027-01-01", "to_date": "2028-02-05"})
+    assert r.status_code == 400 and str(MAX_BUCKETS) in r.json()["detail"]
+    r = client.get("/api/stats/timeseries", params={"from_date": "2020-01-01", "to_date": "2028-02-05",
+                                                    "granularity": "month"})
+    assert r.status_code == 200